@@ -6,7 +6,9 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from firebase_admin import auth as firebase_auth
 from pydantic import ValidationError
 
-from ..core.firebase import verify_id_token, db
+from ..core.firebase import async_db
+from ..core.token_cache import verify_id_token_cached
+from ..core.user_cache import user_cache
 from ..core.analytics import track_event, Events
 from ..models.user import UserInDB, UserProfile
 
@@ -16,6 +18,71 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
+async def _load_user(uid: str, email: str | None) -> UserInDB:
+    """Read and parse `users/{uid}`, caching the result."""
+    user_ref = async_db.collection("users").document(uid)
+    user_doc = await user_ref.get()
+
+    if not user_doc.exists:
+        logger.warning(f"User profile not found in Firestore: uid={uid}, email={email}")
+        track_event(
+            user_id=uid,
+            event_name=Events.AUTH_USER_NOT_FOUND,
+            properties={"email": email},
+            email=email,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Perfil de usuário não encontrado",
+        )
+
+    user_data = user_doc.to_dict()
+    email = user_data.get("email", email)  # Update email from Firestore if available
+
+    # Parse user data with Pydantic (with validation error handling)
+    try:
+        # Handle nested profile object
+        profile_data = user_data.pop("profile", {}) or {}
+        profile = UserProfile(**profile_data)
+
+        # Remove uid from user_data if it exists (we pass it explicitly)
+        user_data.pop("uid", None)
+
+        user = UserInDB(uid=uid, profile=profile, **user_data)
+    except ValidationError as e:
+        # Log detailed validation errors for debugging
+        error_details = []
+        for error in e.errors():
+            error_details.append({
+                "field": ".".join(str(loc) for loc in error["loc"]),
+                "type": error["type"],
+                "message": error["msg"],
+                "input": str(error.get("input", ""))[:100],  # Truncate long values
+            })
+
+        logger.error(
+            f"User data validation failed: uid={uid}, email={email}, errors={error_details}"
+        )
+        track_event(
+            user_id=uid,
+            event_name=Events.USER_VALIDATION_ERROR,
+            properties={
+                "email": email,
+                "error_count": len(error_details),
+                "errors": error_details,
+                "raw_fields": list(user_data.keys()),
+            },
+            email=email,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro nos dados do usuário. Por favor, contate o suporte.",
+        )
+
+    user_cache.put(user)
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> UserInDB:
@@ -35,7 +102,7 @@ async def get_current_user(
 
     # Phase 1: Token verification
     try:
-        decoded_token = verify_id_token(token)
+        decoded_token = await verify_id_token_cached(token)
         uid = decoded_token["uid"]
         email = decoded_token.get("email")
     except firebase_auth.InvalidIdTokenError as e:
@@ -84,67 +151,14 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Phase 2: Fetch user from Firestore
-    user_ref = db.collection("users").document(uid)
-    user_doc = user_ref.get()
-
-    if not user_doc.exists:
-        logger.warning(f"User profile not found in Firestore: uid={uid}, email={email}")
-        track_event(
-            user_id=uid,
-            event_name=Events.AUTH_USER_NOT_FOUND,
-            properties={"email": email},
-            email=email,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de usuário não encontrado",
-        )
-
-    user_data = user_doc.to_dict()
-    email = user_data.get("email", email)  # Update email from Firestore if available
-
-    # Phase 3: Parse user data with Pydantic (with validation error handling)
-    try:
-        # Handle nested profile object
-        profile_data = user_data.pop("profile", {}) or {}
-        profile = UserProfile(**profile_data)
-
-        # Remove uid from user_data if it exists (we pass it explicitly)
-        user_data.pop("uid", None)
-
-        user = UserInDB(uid=uid, profile=profile, **user_data)
-    except ValidationError as e:
-        # Log detailed validation errors for debugging
-        error_details = []
-        for error in e.errors():
-            error_details.append({
-                "field": ".".join(str(loc) for loc in error["loc"]),
-                "type": error["type"],
-                "message": error["msg"],
-                "input": str(error.get("input", ""))[:100],  # Truncate long values
-            })
+    # Phase 2: Fetch user from the profile cache or Firestore
+    user = user_cache.get(uid)
+    if user is None:
+        user = await _load_user(uid, email)
 
-        logger.error(
-            f"User data validation failed: uid={uid}, email={email}, errors={error_details}"
-        )
-        track_event(
-            user_id=uid,
-            event_name=Events.USER_VALIDATION_ERROR,
-            properties={
-                "email": email,
-                "error_count": len(error_details),
-                "errors": error_details,
-                "raw_fields": list(user_data.keys()),
-            },
-            email=email,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Erro nos dados do usuário. Por favor, contate o suporte.",
-        )
+    email = user.email  # Prefer the email stored in Firestore
 
-    # Phase 4: Check user status
+    # Phase 3: Check user status
     if user.status == "pending":
         track_event(
             user_id=uid,
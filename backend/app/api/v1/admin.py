@@ -1,19 +1,21 @@
 """Admin endpoints for user management and feedback viewing."""
 
-import csv
-import io
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Literal, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from firebase_admin import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
 
 from ..deps import get_current_admin
-from ...core.firebase import db
+from ...core.firebase import async_db
 from ...core.analytics import track_event, Events
-from ...core.email import email_service
 from ...core.config import settings
+from ...core.pagination import encode_cursor, decode_cursor
+from ...core.projection import fetch_selected
+from ...core.token_cache import token_cache
+from ...core.user_cache import user_cache
 from ...core.verification import (
     create_verification_token,
     get_verification_url,
@@ -21,11 +23,31 @@ from ...core.verification import (
 )
 from ...models.user import UserInDB
 from ...models.mentor import MentorProfile
+from ...models.export import ExportJobCreate, ExportJobResponse
 from ...models.feedback import (
-    FeedbackResponse,
+    MentorRatingsResponse,
     SessionFeedbackSummary,
     SessionFeedbackListResponse,
 )
+from ...services.email_outbox import add_email_to_batch, email_outbox_worker, enqueue_email
+from ...services.export_jobs import create_export_job, export_job_response, get_export_job
+from ...services.exports import (
+    MENTOR_EXPORT_COLUMNS,
+    SESSION_EXPORT_COLUMNS,
+    USER_EXPORT_COLUMNS,
+    delta_columns,
+    mentor_export_rows,
+    session_export_rows,
+    stream_csv,
+    user_export_rows,
+)
+from ...services.feedback_lookup import (
+    FEEDBACK_BATCH_SIZE,
+    build_feedback_summary,
+    get_feedback_documents,
+)
+from ...services.mentor_catalog import mentor_catalog
+from ...services.mentor_ratings import rating_ref, ratings_response
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -59,10 +81,11 @@ class PendingUserResponse(BaseModel):
 
 
 class UserListResponse(BaseModel):
-    """Response model for list of pending users."""
+    """Response model for a page of pending users."""
 
     users: list[PendingUserResponse]
-    total: int
+    total: int  # Number of users matching the filters, across all pages
+    next_cursor: Optional[str] = None
 
 
 class ApprovalResponse(BaseModel):
@@ -74,6 +97,81 @@ class ApprovalResponse(BaseModel):
     new_status: str
 
 
+# Page sizes for paginated admin listings
+ADMIN_PAGE_SIZE = 50
+ADMIN_MAX_PAGE_SIZE = 200
+
+
+def _decode_cursor_or_400(cursor: str, order_fields: dict[str, type]) -> dict:
+    """Decode a pagination cursor, rejecting malformed ones (or ones for another query) with 400."""
+    try:
+        return decode_cursor(cursor, order_fields)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido",
+        )
+
+
+async def _count(query) -> int:
+    """Number of documents matching a query, from a count aggregation."""
+    result = await query.count().get()
+    return int(result[0][0].value)
+
+
+async def _documents_missing_sort_key(
+    query, sort_field: str, total: int, fields: list[str], label: str
+) -> list[tuple[str, dict]]:
+    """
+    Documents matching `query` that lack `sort_field`, sorted by id.
+
+    Ordered queries leave out documents without the field they order by, so
+    users created before displayNameLower/createdAt were written would never
+    be listed. The listings append them after their last page until
+    scripts/backfill_display_name_lower.py has run; `total` is the count of
+    `query`, and once it matches the ordered count this costs nothing more
+    than that one count aggregation.
+    """
+    if total == await _count(query.order_by(sort_field)):
+        return []
+    docs = await fetch_selected(query, fields, label)
+    return sorted(
+        ((doc_id, data) for doc_id, data in docs if sort_field not in data),
+        key=lambda doc: doc[0],
+    )
+
+
+# Field masks for list queries (see core.projection)
+PENDING_USER_FIELDS = [
+    "email",
+    "displayName",
+    "photoURL",
+    "role",
+    "status",
+    "createdAt",
+    "profile.course",
+    "profile.ra",
+    "profile.phone",
+    "profile.emailAlternativo",
+    "curso",
+    "company",
+    "title",
+    "linkedin",
+]
+
+MENTOR_ADMIN_FIELDS = [
+    "email",
+    "displayName",
+    "displayNameLower",
+    "photoURL",
+    "mentorProfile.photoURL",
+    "mentorProfile.title",
+    "mentorProfile.company",
+    "mentorProfile.isActive",
+    "mentorProfile.isProfileComplete",
+]
+
+
 # Add new event constants for admin actions
 class AdminEvents:
     USER_APPROVED = "Admin: User Approved"
@@ -82,10 +180,17 @@ class AdminEvents:
 
 @router.get("/users/pending", response_model=UserListResponse)
 async def get_pending_users(
+    limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    role: Optional[Literal["estudante", "mentor"]] = Query(None, description="Only users with this role"),
+    pending_status: Optional[Literal["pending", "pending_verification"]] = Query(
+        None, alias="status", description="Only users with this status"
+    ),
     admin: UserInDB = Depends(get_current_admin),
 ):
     """
-    List all users with pending or pending_verification status.
+    List a page of users with pending or pending_verification status,
+    newest first, optionally narrowed to one role or status.
 
     Requires admin privileges.
 
@@ -94,7 +199,7 @@ async def get_pending_users(
     - Email verification (status: "pending_verification")
     """
     try:
-        users_ref = db.collection("users")
+        users_ref = async_db.collection("users")
         pending_users = []
 
         # Helper to build profile from data
@@ -109,39 +214,42 @@ async def get_pending_users(
                 emailAlternativo=profile_data.get("emailAlternativo"),
             )
 
-        # Query for "pending" status (needs admin approval)
-        pending_query = users_ref.where("status", "==", "pending")
-        for doc in pending_query.stream():
-            data = doc.to_dict()
-            pending_users.append(
-                PendingUserResponse(
-                    uid=doc.id,
-                    email=data.get("email", ""),
-                    displayName=data.get("displayName", ""),
-                    photoURL=data.get("photoURL"),
-                    role=data.get("role", "estudante"),
-                    status=data.get("status", "pending"),
-                    createdAt=data.get("createdAt"),
-                    profile=build_profile(data),
-                    curso=data.get("curso"),
-                    company=data.get("company"),
-                    title=data.get("title"),
-                    linkedin=data.get("linkedin"),
-                )
+        # Both statuses in one query, sorted by creation date (newest first).
+        # Served by the (status, createdAt DESC) and (role, status, createdAt
+        # DESC) composite indexes.
+        statuses = [pending_status] if pending_status else ["pending", "pending_verification"]
+        filtered = users_ref.where(filter=FieldFilter("status", "in", statuses))
+        if role:
+            filtered = filtered.where(filter=FieldFilter("role", "==", role))
+        query = (
+            filtered
+            .order_by("createdAt", direction=firestore.Query.DESCENDING)
+            .order_by("__name__", direction=firestore.Query.DESCENDING)
+        )
+        if cursor:
+            query = query.start_after(_decode_cursor_or_400(cursor, {"createdAt": datetime, "__name__": str}))
+
+        docs = await fetch_selected(
+            query.limit(limit + 1), PENDING_USER_FIELDS, "admin.get_pending_users"
+        )
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+
+        total = await _count(filtered)
+        if not has_more:
+            docs += await _documents_missing_sort_key(
+                filtered, "createdAt", total, PENDING_USER_FIELDS, "admin.get_pending_users"
             )
 
-        # Query for "pending_verification" status (needs email verification)
-        verification_query = users_ref.where("status", "==", "pending_verification")
-        for doc in verification_query.stream():
-            data = doc.to_dict()
+        for doc_id, data in docs:
             pending_users.append(
                 PendingUserResponse(
-                    uid=doc.id,
+                    uid=doc_id,
                     email=data.get("email", ""),
                     displayName=data.get("displayName", ""),
                     photoURL=data.get("photoURL"),
                     role=data.get("role", "estudante"),
-                    status=data.get("status", "pending_verification"),
+                    status=data.get("status", "pending"),
                     createdAt=data.get("createdAt"),
                     profile=build_profile(data),
                     curso=data.get("curso"),
@@ -151,14 +259,22 @@ async def get_pending_users(
                 )
             )
 
-        # Sort by creation date (newest first)
-        pending_users.sort(
-            key=lambda u: u.createdAt or datetime.min,
-            reverse=True,
+        next_cursor = None
+        if has_more:
+            last_id, last_data = docs[-1]
+            next_cursor = encode_cursor({
+                "createdAt": last_data.get("createdAt"),
+                "__name__": last_id,
+            })
+
+        return UserListResponse(
+            users=pending_users,
+            total=total,
+            next_cursor=next_cursor,
         )
 
-        return UserListResponse(users=pending_users, total=len(pending_users))
-
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -177,8 +293,8 @@ async def approve_user(
     Requires admin privileges.
     """
     try:
-        user_ref = db.collection("users").document(uid)
-        user_doc = user_ref.get()
+        user_ref = async_db.collection("users").document(uid)
+        user_doc = await user_ref.get()
 
         if not user_doc.exists:
             raise HTTPException(
@@ -194,8 +310,36 @@ async def approve_user(
                 detail=f"Usuário não está pendente (status atual: {user_data.get('status')})",
             )
 
-        # Update status to active
-        user_ref.update({"status": "active"})
+        # Activate the user and queue the approval confirmation email
+        login_url = f"{settings.FRONTEND_URL}/auth"
+        analytics_properties = {
+            "user_uid": uid,
+            "user_email": user_data.get("email"),
+            "user_role": user_data.get("role"),
+        }
+        batch = async_db.batch()
+        batch.update(user_ref, {"status": "active", "updatedAt": datetime.utcnow()})
+        add_email_to_batch(
+            batch,
+            "send_approval_confirmation_email",
+            {
+                "user_name": user_data.get("displayName", ""),
+                "user_email": user_data.get("email", ""),
+                "role": user_data.get("role", "estudante"),
+                "login_url": login_url,
+            },
+            analytics={
+                "user_id": admin.uid,
+                "sent_event": Events.EMAIL_APPROVAL_CONFIRMATION_SENT,
+                "failed_event": Events.EMAIL_APPROVAL_CONFIRMATION_FAILED,
+                "properties": analytics_properties,
+            },
+        )
+        await batch.commit()
+        email_outbox_worker.wake()
+        user_cache.invalidate(uid)
+        if user_data.get("role") == "mentor":
+            mentor_catalog.invalidate()
 
         # Track event in Mixpanel
         track_event(
@@ -208,37 +352,6 @@ async def approve_user(
             },
         )
 
-        # Send approval confirmation email (non-blocking)
-        login_url = f"{settings.FRONTEND_URL}/auth"
-        email_result = email_service.send_approval_confirmation_email(
-            user_name=user_data.get("displayName", ""),
-            user_email=user_data.get("email", ""),
-            role=user_data.get("role", "estudante"),
-            login_url=login_url,
-        )
-
-        if email_result.get("success"):
-            track_event(
-                admin.uid,
-                Events.EMAIL_APPROVAL_CONFIRMATION_SENT,
-                {
-                    "user_uid": uid,
-                    "user_email": user_data.get("email"),
-                    "user_role": user_data.get("role"),
-                },
-            )
-        else:
-            track_event(
-                admin.uid,
-                Events.EMAIL_APPROVAL_CONFIRMATION_FAILED,
-                {
-                    "user_uid": uid,
-                    "user_email": user_data.get("email"),
-                    "user_role": user_data.get("role"),
-                    "error": email_result.get("error"),
-                },
-            )
-
         return ApprovalResponse(
             success=True,
             message="Usuário aprovado com sucesso",
@@ -266,8 +379,8 @@ async def reject_user(
     Requires admin privileges.
     """
     try:
-        user_ref = db.collection("users").document(uid)
-        user_doc = user_ref.get()
+        user_ref = async_db.collection("users").document(uid)
+        user_doc = await user_ref.get()
 
         if not user_doc.exists:
             raise HTTPException(
@@ -284,7 +397,9 @@ async def reject_user(
             )
 
         # Update status to suspended
-        user_ref.update({"status": "suspended"})
+        await user_ref.update({"status": "suspended", "updatedAt": datetime.utcnow()})
+        user_cache.invalidate(uid)
+        token_cache.invalidate_user(uid)
 
         # Track event in Mixpanel
         track_event(
@@ -332,8 +447,8 @@ async def resend_verification_email(
     Requires admin privileges.
     """
     try:
-        user_ref = db.collection("users").document(uid)
-        user_doc = user_ref.get()
+        user_ref = async_db.collection("users").document(uid)
+        user_doc = await user_ref.get()
 
         if not user_doc.exists:
             raise HTTPException(
@@ -359,20 +474,17 @@ async def resend_verification_email(
             role=user_data["role"],
         )
 
-        # Send verification email
+        # Queue verification email
         verification_url = get_verification_url(verification_token)
-        result = email_service.send_verification_email(
-            user_name=user_data.get("displayName", user_data["email"].split("@")[0]),
-            user_email=user_data["email"],
-            verification_url=verification_url,
+        await enqueue_email(
+            "send_verification_email",
+            {
+                "user_name": user_data.get("displayName", user_data["email"].split("@")[0]),
+                "user_email": user_data["email"],
+                "verification_url": verification_url,
+            },
         )
 
-        if not result.get("success"):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Erro ao enviar email de verificação",
-            )
-
         # Track event
         track_event(
             admin.uid,
@@ -412,76 +524,27 @@ async def list_sessions_with_feedback(
     """
     try:
         # Get all sessions ordered by creation date
-        sessions_ref = db.collection("sessions")
+        sessions_ref = async_db.collection("sessions")
         sessions_query = sessions_ref.order_by("created_at", direction=firestore.Query.DESCENDING)
-        session_docs = list(sessions_query.stream())
 
         results = []
-        for session_doc in session_docs:
-            session_data = session_doc.to_dict()
-            session_id = session_data["id"]
-
-            # Get feedback requests for this session
-            student_request = db.collection("feedback_requests").document(f"{session_id}_student").get()
-            mentor_request = db.collection("feedback_requests").document(f"{session_id}_mentor").get()
-
-            student_feedback_sent = False
-            mentor_feedback_sent = False
-
-            if student_request.exists:
-                student_feedback_sent = student_request.to_dict().get("email_sent", False)
-            if mentor_request.exists:
-                mentor_feedback_sent = mentor_request.to_dict().get("email_sent", False)
-
-            # Get actual feedback responses
-            student_feedback = None
-            mentor_feedback = None
-
-            student_feedback_doc = db.collection("session_feedback").document(f"{session_id}_student").get()
-            mentor_feedback_doc = db.collection("session_feedback").document(f"{session_id}_mentor").get()
-
-            if student_feedback_doc.exists:
-                sf_data = student_feedback_doc.to_dict()
-                student_feedback = FeedbackResponse(
-                    id=sf_data["id"],
-                    session_id=sf_data["session_id"],
-                    respondent_type=sf_data["respondent_type"],
-                    respondent_name=sf_data["respondent_name"],
-                    meeting_status=sf_data["meeting_status"],
-                    no_meeting_reason=sf_data.get("no_meeting_reason"),
-                    rating=sf_data.get("rating"),
-                    additional_feedback=sf_data.get("additional_feedback"),
-                    submitted_at=sf_data.get("submitted_at"),
-                )
-
-            if mentor_feedback_doc.exists:
-                mf_data = mentor_feedback_doc.to_dict()
-                mentor_feedback = FeedbackResponse(
-                    id=mf_data["id"],
-                    session_id=mf_data["session_id"],
-                    respondent_type=mf_data["respondent_type"],
-                    respondent_name=mf_data["respondent_name"],
-                    meeting_status=mf_data["meeting_status"],
-                    no_meeting_reason=mf_data.get("no_meeting_reason"),
-                    rating=mf_data.get("rating"),
-                    additional_feedback=mf_data.get("additional_feedback"),
-                    submitted_at=mf_data.get("submitted_at"),
+        page = []
+
+        async def flush_page():
+            # One batched lookup for all feedback documents of the page
+            feedback_docs = await get_feedback_documents([s["id"] for s in page])
+            for session_data in page:
+                results.append(
+                    build_feedback_summary(session_data, feedback_docs[session_data["id"]])
                 )
+            page.clear()
 
-            results.append(
-                SessionFeedbackSummary(
-                    session_id=session_id,
-                    student_name=session_data["student_name"],
-                    student_email=session_data["student_email"],
-                    mentor_name=session_data["mentor_name"],
-                    mentor_email=session_data["mentor_email"],
-                    session_created_at=session_data.get("created_at"),
-                    student_feedback_sent=student_feedback_sent,
-                    mentor_feedback_sent=mentor_feedback_sent,
-                    student_feedback=student_feedback,
-                    mentor_feedback=mentor_feedback,
-                )
-            )
+        async for session_doc in sessions_query.stream():
+            page.append(session_doc.to_dict())
+            if len(page) >= FEEDBACK_BATCH_SIZE:
+                await flush_page()
+        if page:
+            await flush_page()
 
         return SessionFeedbackListResponse(sessions=results, total=len(results))
 
@@ -503,7 +566,7 @@ async def get_session_feedback(
     """
     try:
         # Get session data
-        session_doc = db.collection("sessions").document(session_id).get()
+        session_doc = await async_db.collection("sessions").document(session_id).get()
         if not session_doc.exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -512,65 +575,10 @@ async def get_session_feedback(
 
         session_data = session_doc.to_dict()
 
-        # Get feedback requests
-        student_request = db.collection("feedback_requests").document(f"{session_id}_student").get()
-        mentor_request = db.collection("feedback_requests").document(f"{session_id}_mentor").get()
-
-        student_feedback_sent = False
-        mentor_feedback_sent = False
-
-        if student_request.exists:
-            student_feedback_sent = student_request.to_dict().get("email_sent", False)
-        if mentor_request.exists:
-            mentor_feedback_sent = mentor_request.to_dict().get("email_sent", False)
-
-        # Get actual feedback responses
-        student_feedback = None
-        mentor_feedback = None
-
-        student_feedback_doc = db.collection("session_feedback").document(f"{session_id}_student").get()
-        mentor_feedback_doc = db.collection("session_feedback").document(f"{session_id}_mentor").get()
-
-        if student_feedback_doc.exists:
-            sf_data = student_feedback_doc.to_dict()
-            student_feedback = FeedbackResponse(
-                id=sf_data["id"],
-                session_id=sf_data["session_id"],
-                respondent_type=sf_data["respondent_type"],
-                respondent_name=sf_data["respondent_name"],
-                meeting_status=sf_data["meeting_status"],
-                no_meeting_reason=sf_data.get("no_meeting_reason"),
-                rating=sf_data.get("rating"),
-                additional_feedback=sf_data.get("additional_feedback"),
-                submitted_at=sf_data.get("submitted_at"),
-            )
-
-        if mentor_feedback_doc.exists:
-            mf_data = mentor_feedback_doc.to_dict()
-            mentor_feedback = FeedbackResponse(
-                id=mf_data["id"],
-                session_id=mf_data["session_id"],
-                respondent_type=mf_data["respondent_type"],
-                respondent_name=mf_data["respondent_name"],
-                meeting_status=mf_data["meeting_status"],
-                no_meeting_reason=mf_data.get("no_meeting_reason"),
-                rating=mf_data.get("rating"),
-                additional_feedback=mf_data.get("additional_feedback"),
-                submitted_at=mf_data.get("submitted_at"),
-            )
+        # Get feedback requests and responses in a single batched read
+        feedback_docs = await get_feedback_documents([session_id])
 
-        return SessionFeedbackSummary(
-            session_id=session_id,
-            student_name=session_data["student_name"],
-            student_email=session_data["student_email"],
-            mentor_name=session_data["mentor_name"],
-            mentor_email=session_data["mentor_email"],
-            session_created_at=session_data.get("created_at"),
-            student_feedback_sent=student_feedback_sent,
-            mentor_feedback_sent=mentor_feedback_sent,
-            student_feedback=student_feedback,
-            mentor_feedback=mentor_feedback,
-        )
+        return build_feedback_summary(session_data, feedback_docs[session_id])
 
     except HTTPException:
         raise
@@ -598,10 +606,13 @@ class MentorAdminResponse(BaseModel):
 
 
 class MentorListAdminResponse(BaseModel):
-    """Response model for list of mentors in admin."""
+    """Response model for a page of mentors in admin."""
 
     mentors: list[MentorAdminResponse]
-    total: int
+    total: int  # Number of mentors matching the search and filter, across all pages
+    visible_total: int = 0  # Visible mentors matching the search
+    hidden_total: int = 0  # Hidden mentors matching the search
+    next_cursor: Optional[str] = None
 
 
 class MentorVisibilityUpdate(BaseModel):
@@ -612,25 +623,85 @@ class MentorVisibilityUpdate(BaseModel):
 
 @router.get("/mentors", response_model=MentorListAdminResponse)
 async def list_all_mentors(
+    limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    search: Optional[str] = Query(
+        None, max_length=100, description="Name prefix, or email prefix if it contains '@'"
+    ),
+    visibility: Literal["all", "visible", "hidden"] = Query("all"),
     admin: UserInDB = Depends(get_current_admin),
 ):
     """
-    List all mentors for admin management.
-    Includes both visible and hidden mentors.
+    List a page of mentors for admin management, sorted by name (by email
+    when searching by email). Includes both visible and hidden mentors
+    unless `visibility` narrows it.
     Requires admin privileges.
     """
     try:
-        users_ref = db.collection("users")
-        query = users_ref.where("role", "==", "mentor")
+        mentors_ref = async_db.collection("users").where(filter=FieldFilter("role", "==", "mentor"))
+        hidden_ref = mentors_ref.where(filter=FieldFilter("mentorProfile.isActive", "==", False))
+
+        term = (search or "").strip().lower()
+        sort_field = "email" if "@" in term else "displayNameLower"
+
+        def matching(query):
+            if not term:
+                return query
+            return (
+                query
+                .where(filter=FieldFilter(sort_field, ">=", term))
+                .where(filter=FieldFilter(sort_field, "<", term + "\uf8ff"))
+            )
+
+        # Sorted on the stored lowercase name (or email), served by the
+        # (role, [mentorProfile.isActive,] displayNameLower|email) indexes.
+        # Mentors without isActive are visible, which no equality filter can
+        # match, so the visible listing skips hidden ones while paging instead.
+        filtered = matching(hidden_ref if visibility == "hidden" else mentors_ref)
+        query = filtered.order_by(sort_field).order_by("__name__")
+
+        def listed(data: dict) -> bool:
+            if visibility != "visible":
+                return True
+            return (data.get("mentorProfile", {}) or {}).get("isActive", True) is not False
+
+        docs = []
+        start = _decode_cursor_or_400(cursor, {sort_field: str, "__name__": str}) if cursor else None
+        while True:
+            page_query = query.start_after(start) if start else query
+            page = await fetch_selected(
+                page_query.limit(limit + 1), MENTOR_ADMIN_FIELDS, "admin.list_all_mentors"
+            )
+            docs += [(doc_id, data) for doc_id, data in page if listed(data)]
+            if len(docs) > limit or len(page) <= limit:
+                break
+            last_id, last_data = page[-1]
+            start = {sort_field: last_data.get(sort_field), "__name__": last_id}
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+
+        matching_total = await _count(matching(mentors_ref))
+        hidden_total = await _count(matching(hidden_ref))
+        visible_total = matching_total - hidden_total
+        total = {"all": matching_total, "visible": visible_total, "hidden": hidden_total}[visibility]
+
+        if not has_more and not term:
+            unsorted_total = hidden_total if visibility == "hidden" else matching_total
+            docs += [
+                (doc_id, data)
+                for doc_id, data in await _documents_missing_sort_key(
+                    filtered, sort_field, unsorted_total, MENTOR_ADMIN_FIELDS, "admin.list_all_mentors"
+                )
+                if listed(data)
+            ]
 
         mentors = []
-        for doc in query.stream():
-            user_data = doc.to_dict()
+        for doc_id, user_data in docs:
             mentor_profile = user_data.get("mentorProfile", {}) or {}
 
             mentors.append(
                 MentorAdminResponse(
-                    uid=doc.id,
+                    uid=doc_id,
                     email=user_data.get("email", ""),
                     displayName=user_data.get("displayName", ""),
                     photoURL=mentor_profile.get("photoURL") or user_data.get("photoURL"),
@@ -641,11 +712,24 @@ async def list_all_mentors(
                 )
             )
 
-        # Sort by name
-        mentors.sort(key=lambda m: m.displayName.lower())
-
-        return MentorListAdminResponse(mentors=mentors, total=len(mentors))
+        next_cursor = None
+        if has_more:
+            last_id, last_data = docs[-1]
+            next_cursor = encode_cursor({
+                sort_field: last_data.get(sort_field),
+                "__name__": last_id,
+            })
+
+        return MentorListAdminResponse(
+            mentors=mentors,
+            total=total,
+            visible_total=visible_total,
+            hidden_total=hidden_total,
+            next_cursor=next_cursor,
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -664,8 +748,8 @@ async def update_mentor_visibility(
     Requires admin privileges.
     """
     try:
-        user_ref = db.collection("users").document(uid)
-        user_doc = user_ref.get()
+        user_ref = async_db.collection("users").document(uid)
+        user_doc = await user_ref.get()
 
         if not user_doc.exists:
             raise HTTPException(
@@ -685,10 +769,12 @@ async def update_mentor_visibility(
         mentor_profile = user_data.get("mentorProfile", {}) or {}
         mentor_profile["isActive"] = update.isActive
 
-        user_ref.update({
+        await user_ref.update({
             "mentorProfile": mentor_profile,
             "updatedAt": datetime.utcnow(),
         })
+        user_cache.invalidate(uid)
+        mentor_catalog.invalidate()
 
         # Track event
         track_event(
@@ -721,221 +807,194 @@ async def update_mentor_visibility(
         )
 
 
+@router.get("/mentors/{uid}/ratings", response_model=MentorRatingsResponse)
+async def get_mentor_ratings(
+    uid: str,
+    admin: UserInDB = Depends(get_current_admin),
+):
+    """
+    Get a mentor's rating aggregate (admin only).
+
+    Read from the aggregate document maintained on every feedback write;
+    mentors without feedback yet return zeros.
+    """
+    try:
+        doc = await rating_ref(uid).get()
+        return ratings_response(uid, doc.to_dict() if doc.exists else None)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao buscar avaliações do mentor: {str(e)}",
+        )
+
+
 # ==================== Export Endpoints ====================
 
 
-def format_datetime_for_csv(dt) -> str:
-    """Format datetime for CSV export."""
-    if dt is None:
-        return ""
-    if isinstance(dt, datetime):
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    return str(dt)
+def _csv_download(chunks, filename: str, started_at: datetime) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            # Pass as `since` to the next delta export
+            "X-Export-Started-At": started_at.isoformat(),
+        },
+    )
 
 
-def list_to_csv_string(items: list) -> str:
-    """Convert a list to a comma-separated string for CSV."""
-    if not items:
-        return ""
-    return "; ".join(str(item) for item in items)
+def _export_filename(prefix: str, since: Optional[datetime]) -> str:
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    if since is not None:
+        return f"{prefix}_delta_{timestamp}.csv"
+    return f"{prefix}_{timestamp}.csv"
 
 
 @router.get("/users/export")
 async def export_users_csv(
+    since: Optional[datetime] = Query(None, description="Only users changed after this time (ISO 8601, UTC)"),
     admin: UserInDB = Depends(get_current_admin),
 ):
     """
     Export all users to CSV file.
     Requires admin privileges.
+
+    The file is streamed while users are read from Firestore, page by page.
+    With `since`, only users whose `updatedAt` is later are exported, plus a
+    tombstone row (`deleted=True`) for each user deleted since then. The
+    `X-Export-Started-At` response header is the `since` for the next run.
     """
-    try:
-        users_ref = db.collection("users")
-        all_users = list(users_ref.stream())
-
-        # Define CSV columns
-        fieldnames = [
-            "uid",
-            "email",
-            "displayName",
-            "role",
-            "status",
-            "authProvider",
-            "isAdmin",
-            "emailNotifications",
-            "language",
-            "createdAt",
-            "updatedAt",
-            "lastLoginAt",
-            # Profile fields
-            "profile_phone",
-            "profile_linkedIn",
-            "profile_bio",
-            "profile_course",
-            "profile_graduationYear",
-            "profile_company",
-            "profile_position",
-            "profile_expertise",
-        ]
-
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for doc in all_users:
-            data = doc.to_dict()
-            profile = data.get("profile", {}) or {}
-
-            row = {
-                "uid": doc.id,
-                "email": data.get("email", ""),
-                "displayName": data.get("displayName", ""),
-                "role": data.get("role", ""),
-                "status": data.get("status", ""),
-                "authProvider": data.get("authProvider", ""),
-                "isAdmin": data.get("isAdmin", False),
-                "emailNotifications": data.get("emailNotifications", True),
-                "language": data.get("language", "pt-BR"),
-                "createdAt": format_datetime_for_csv(data.get("createdAt")),
-                "updatedAt": format_datetime_for_csv(data.get("updatedAt")),
-                "lastLoginAt": format_datetime_for_csv(data.get("lastLoginAt")),
-                # Profile fields
-                "profile_phone": profile.get("phone", ""),
-                "profile_linkedIn": profile.get("linkedIn", ""),
-                "profile_bio": profile.get("bio", ""),
-                "profile_course": profile.get("course", ""),
-                "profile_graduationYear": profile.get("graduationYear", ""),
-                "profile_company": profile.get("company", ""),
-                "profile_position": profile.get("position", ""),
-                "profile_expertise": list_to_csv_string(profile.get("expertise", [])),
-            }
-            writer.writerow(row)
+    started_at = datetime.now(timezone.utc)
 
+    def on_complete(total: int) -> None:
         # Track export event
         track_event(
             admin.uid,
             "Admin: Users Exported",
-            {"total_users": len(all_users)},
+            {"total_users": total, "delta": since is not None},
         )
 
-        # Return CSV as downloadable file
-        output.seek(0)
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"usuarios_{timestamp}.csv"
-
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erro ao exportar usuários: {str(e)}",
-        )
+    columns = USER_EXPORT_COLUMNS if since is None else delta_columns(USER_EXPORT_COLUMNS)
+    return _csv_download(
+        stream_csv(user_export_rows(since), columns, on_complete),
+        _export_filename("usuarios", since),
+        started_at,
+    )
 
 
 @router.get("/mentors/export")
 async def export_mentors_csv(
+    since: Optional[datetime] = Query(None, description="Only mentors changed after this time (ISO 8601, UTC)"),
     admin: UserInDB = Depends(get_current_admin),
 ):
     """
     Export all mentors to CSV file with full mentor profile data.
     Requires admin privileges.
+
+    The file is streamed while mentors are read from Firestore, page by page.
+    `since` works as in the user export.
     """
-    try:
-        users_ref = db.collection("users")
-        query = users_ref.where("role", "==", "mentor")
-        all_mentors = list(query.stream())
-
-        # Define CSV columns for mentors
-        fieldnames = [
-            "uid",
-            "email",
-            "displayName",
-            "status",
-            "authProvider",
-            "isAdmin",
-            "createdAt",
-            "updatedAt",
-            "lastLoginAt",
-            # Mentor profile fields
-            "title",
-            "company",
-            "bio",
-            "linkedin",
-            "photoURL",
-            "tags",
-            "expertise",
-            "course",
-            "graduationYear",
-            "isUnicampAlumni",
-            "unicampDegreeLevel",
-            "alternativeUniversity",
-            "patronosRelation",
-            "isActive",
-            "isProfileComplete",
-        ]
-
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for doc in all_mentors:
-            data = doc.to_dict()
-            mentor_profile = data.get("mentorProfile", {}) or {}
-
-            row = {
-                "uid": doc.id,
-                "email": data.get("email", ""),
-                "displayName": data.get("displayName", ""),
-                "status": data.get("status", ""),
-                "authProvider": data.get("authProvider", ""),
-                "isAdmin": data.get("isAdmin", False),
-                "createdAt": format_datetime_for_csv(data.get("createdAt")),
-                "updatedAt": format_datetime_for_csv(data.get("updatedAt")),
-                "lastLoginAt": format_datetime_for_csv(data.get("lastLoginAt")),
-                # Mentor profile fields
-                "title": mentor_profile.get("title", ""),
-                "company": mentor_profile.get("company", ""),
-                "bio": mentor_profile.get("bio", ""),
-                "linkedin": mentor_profile.get("linkedin", ""),
-                "photoURL": mentor_profile.get("photoURL") or data.get("photoURL", ""),
-                "tags": list_to_csv_string(mentor_profile.get("tags", [])),
-                "expertise": list_to_csv_string(mentor_profile.get("expertise", [])),
-                "course": mentor_profile.get("course", ""),
-                "graduationYear": mentor_profile.get("graduationYear", ""),
-                "isUnicampAlumni": mentor_profile.get("isUnicampAlumni", ""),
-                "unicampDegreeLevel": mentor_profile.get("unicampDegreeLevel", ""),
-                "alternativeUniversity": mentor_profile.get("alternativeUniversity", ""),
-                "patronosRelation": mentor_profile.get("patronosRelation", ""),
-                "isActive": mentor_profile.get("isActive", True),
-                "isProfileComplete": mentor_profile.get("isProfileComplete", False),
-            }
-            writer.writerow(row)
+    started_at = datetime.now(timezone.utc)
 
+    def on_complete(total: int) -> None:
         # Track export event
         track_event(
             admin.uid,
             "Admin: Mentors Exported",
-            {"total_mentors": len(all_mentors)},
+            {"total_mentors": total, "delta": since is not None},
         )
 
-        # Return CSV as downloadable file
-        output.seek(0)
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"mentores_{timestamp}.csv"
+    columns = MENTOR_EXPORT_COLUMNS if since is None else delta_columns(MENTOR_EXPORT_COLUMNS)
+    return _csv_download(
+        stream_csv(mentor_export_rows(since), columns, on_complete),
+        _export_filename("mentores", since),
+        started_at,
+    )
+
 
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+@router.get("/sessions/export")
+async def export_sessions_csv(
+    since: Optional[datetime] = Query(None, description="Only sessions changed after this time (ISO 8601, UTC)"),
+    admin: UserInDB = Depends(get_current_admin),
+):
+    """
+    Export all sessions to CSV file.
+    Requires admin privileges.
+
+    `since` works as in the user export, based on the session's `updated_at`.
+    """
+    started_at = datetime.now(timezone.utc)
+
+    def on_complete(total: int) -> None:
+        # Track export event
+        track_event(
+            admin.uid,
+            "Admin: Sessions Exported",
+            {"total_sessions": total, "delta": since is not None},
         )
 
+    columns = SESSION_EXPORT_COLUMNS if since is None else delta_columns(SESSION_EXPORT_COLUMNS)
+    return _csv_download(
+        stream_csv(session_export_rows(since), columns, on_complete),
+        _export_filename("sessoes", since),
+        started_at,
+    )
+
+
+@router.post("/exports", response_model=ExportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_export(
+    request: ExportJobCreate,
+    admin: UserInDB = Depends(get_current_admin),
+):
+    """
+    Start a background export of users, mentors, sessions, feedback or
+    feedback requests, as CSV or Parquet.
+    Requires admin privileges.
+
+    Poll GET /admin/exports/{job_id} for progress; the response includes a
+    signed download URL once the file is ready.
+    """
+    try:
+        job = await create_export_job(request.dataset, request.format, request.compress, admin.uid)
+
+        track_event(
+            admin.uid,
+            "Admin: Export Requested",
+            {"dataset": request.dataset, "format": request.format, "compress": request.compress},
+        )
+
+        return await export_job_response(job)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao criar exportação: {str(e)}",
+        )
+
+
+@router.get("/exports/{job_id}", response_model=ExportJobResponse)
+async def get_export(
+    job_id: str,
+    admin: UserInDB = Depends(get_current_admin),
+):
+    """
+    Get the status of an export job.
+    Requires admin privileges.
+    """
+    try:
+        job = await get_export_job(job_id)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Exportação não encontrada",
+            )
+
+        return await export_job_response(job)
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erro ao exportar mentores: {str(e)}",
+            detail=f"Erro ao buscar exportação: {str(e)}",
         )
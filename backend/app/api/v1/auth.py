@@ -1,6 +1,7 @@
 """Authentication endpoints."""
 
 import logging
+from datetime import datetime
 from typing import Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -9,7 +10,7 @@ from firebase_admin import auth as firebase_auth
 
 from ..deps import get_current_user
 from ...models.user import UserInDB
-from ...core.firebase import verify_id_token, db
+from ...core.firebase import verify_id_token, async_db
 from ...core.config import settings
 from ...core.verification import (
     create_verification_token,
@@ -17,8 +18,8 @@ from ...core.verification import (
     invalidate_user_tokens,
     get_verification_url,
 )
-from ...core.email import email_service
-from ...core.analytics import track_event
+from ...core.user_cache import user_cache
+from ...services.email_outbox import enqueue_email
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -88,8 +89,8 @@ async def request_password_reset(request: PasswordResetRequest):
             return {"message": "Se o email estiver cadastrado, você receberá um link para redefinir sua senha."}
 
         # Get user profile from Firestore for display name
-        user_ref = db.collection("users").document(user.uid)
-        user_doc = user_ref.get()
+        user_ref = async_db.collection("users").document(user.uid)
+        user_doc = await user_ref.get()
 
         if user_doc.exists:
             user_data = user_doc.to_dict()
@@ -111,21 +112,17 @@ async def request_password_reset(request: PasswordResetRequest):
             action_code_settings=action_code_settings,
         )
 
-        # Send custom email via Resend
-        result = email_service.send_password_reset_email(
-            user_name=user_name,
-            user_email=email,
-            reset_url=reset_link,
+        # Queue custom email (sent via Resend by the outbox worker)
+        await enqueue_email(
+            "send_password_reset_email",
+            {
+                "user_name": user_name,
+                "user_email": email,
+                "reset_url": reset_link,
+            },
         )
 
-        if not result.get("success"):
-            logger.error(f"Failed to send password reset email to {email}: {result.get('error')}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Erro ao enviar email de redefinição de senha",
-            )
-
-        logger.info(f"Password reset email sent to {email}")
+        logger.info(f"Password reset email queued for {email}")
         return {"message": "Se o email estiver cadastrado, você receberá um link para redefinir sua senha."}
 
     except HTTPException:
@@ -165,8 +162,8 @@ async def send_verification_email(
         )
 
     # Get user profile
-    user_ref = db.collection("users").document(uid)
-    user_doc = user_ref.get()
+    user_ref = async_db.collection("users").document(uid)
+    user_doc = await user_ref.get()
 
     if not user_doc.exists:
         raise HTTPException(
@@ -193,22 +190,18 @@ async def send_verification_email(
         role=user_data["role"],
     )
 
-    # Send verification email
+    # Queue verification email
     verification_url = get_verification_url(verification_token)
-    result = email_service.send_verification_email(
-        user_name=user_data.get("displayName", user_data["email"].split("@")[0]),
-        user_email=user_data["email"],
-        verification_url=verification_url,
+    await enqueue_email(
+        "send_verification_email",
+        {
+            "user_name": user_data.get("displayName", user_data["email"].split("@")[0]),
+            "user_email": user_data["email"],
+            "verification_url": verification_url,
+        },
     )
 
-    if not result.get("success"):
-        logger.error(f"Failed to send verification email to {user_data['email']}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Erro ao enviar email de verificação",
-        )
-
-    logger.info(f"Verification email sent to {user_data['email']}")
+    logger.info(f"Verification email queued for {user_data['email']}")
     return {"message": "Email de verificação enviado com sucesso"}
 
 
@@ -228,8 +221,8 @@ async def verify_email_token(request: VerifyTokenRequest):
         )
 
     # Update user status to active
-    user_ref = db.collection("users").document(result["uid"])
-    user_doc = user_ref.get()
+    user_ref = async_db.collection("users").document(result["uid"])
+    user_doc = await user_ref.get()
 
     if not user_doc.exists:
         raise HTTPException(
@@ -249,7 +242,8 @@ async def verify_email_token(request: VerifyTokenRequest):
         }
 
     # Activate user
-    user_ref.update({"status": "active"})
+    await user_ref.update({"status": "active", "updatedAt": datetime.utcnow()})
+    user_cache.invalidate(result["uid"])
     logger.info(f"User {result['uid']} email verified and activated")
 
     return {
@@ -283,33 +277,31 @@ async def notify_admin_pending_user(request: NotifyAdminRequest):
         frontend_url = settings.FRONTEND_URL.split(",")[0].strip()
         admin_url = f"{frontend_url}/admin/aprovacoes"
 
-        # Send notification email to admins
-        result = email_service.send_admin_pending_user_notification(
-            user_name=request.displayName,
-            user_email=request.email,
-            role=request.role,
-            admin_url=admin_url,
-            company=request.company,
-            title=request.title,
-        )
-
-        if not result.get("success"):
-            logger.error(f"Failed to send admin notification for {request.email}: {result.get('error')}")
-            # Don't fail the signup - just log the error
-            return {"success": False, "message": "Erro ao enviar notificação"}
-
-        logger.info(f"Admin notification sent for pending user: {request.email}")
-
-        # Track analytics event
-        track_event(
-            request.uid,
-            "Admin Notification: Pending User",
+        # Queue notification email to admins (once per user); the analytics
+        # event is tracked when it is actually sent
+        await enqueue_email(
+            "send_admin_pending_user_notification",
             {
+                "user_name": request.displayName,
                 "user_email": request.email,
-                "user_role": request.role,
+                "role": request.role,
+                "admin_url": admin_url,
+                "company": request.company,
+                "title": request.title,
+            },
+            key=f"pending_user_{request.uid}",
+            analytics={
+                "user_id": request.uid,
+                "sent_event": "Admin Notification: Pending User",
+                "properties": {
+                    "user_email": request.email,
+                    "user_role": request.role,
+                },
             },
         )
 
+        logger.info(f"Admin notification queued for pending user: {request.email}")
+
         return {"success": True, "message": "Notificação enviada aos administradores"}
 
     except Exception as e:
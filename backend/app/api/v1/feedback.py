@@ -1,12 +1,19 @@
 """Feedback API endpoints for post-session feedback collection."""
 
+import asyncio
+import logging
 import secrets
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, status
+from google.api_core.exceptions import FailedPrecondition
+from google.cloud.firestore_v1 import Increment
 from google.cloud.firestore_v1.base_query import FieldFilter
+from pydantic import ValidationError
 
-from ...core.firebase import db
-from ...core.email import email_service
+from ...core.firebase import async_db
+from ...core.email import RESEND_BATCH_MAX_SIZE, email_service, resend_rate_limiter
 from ...core.config import settings
 from ...core.analytics import track_event
 from ...models.feedback import (
@@ -17,15 +24,80 @@ from ...models.feedback import (
     ProcessPendingResponse,
 )
 from ...models.user import UserInDB
+from ...services.feedback_lookup import feedback_doc_id, get_feedback_documents
+from ...services.mentor_ratings import add_feedback_to_ratings
+from ...services.feedback_sweep import (
+    FEEDBACK_EMAIL_MAX_ATTEMPTS,
+    SWEEP_PAGE_SIZE,
+    SWEEP_TIME_BUDGET_SECONDS,
+    advance_feedback_sweep,
+    claim_feedback_sweep,
+    feedback_cutoff,
+    fetch_sweep_page,
+    release_feedback_sweep,
+)
 from ..deps import get_current_admin
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
+# Firestore accepts at most 500 writes per batch
+FIRESTORE_MAX_BATCH_WRITES = 500
+
+# Longest request id accepted from a token (real ids are "{session_id}_{role}")
+FEEDBACK_REQUEST_ID_MAX_LENGTH = 200
 
-def generate_token() -> str:
-    """Generate a unique 32-character token."""
-    return secrets.token_hex(16)
+
+def _is_valid_request_id(request_id: str) -> bool:
+    """Whether a token's request id can safely be used as a document id."""
+    return (
+        0 < len(request_id) <= FEEDBACK_REQUEST_ID_MAX_LENGTH
+        and "/" not in request_id
+        and request_id not in (".", "..")
+        and not (request_id.startswith("__") and request_id.endswith("__"))
+    )
+
+
+def generate_token(request_id: str) -> str:
+    """
+    Generate a feedback token for a feedback request.
+
+    The token is `{request_id}.{secret}` so it can be resolved with a single
+    document read; the 32-character secret is what authorizes the request.
+    """
+    return f"{request_id}.{secrets.token_hex(16)}"
+
+
+async def find_feedback_request_by_token(token: str):
+    """
+    Resolve a feedback token to its feedback request document.
+
+    Tokens created before the request id was embedded are plain 32-character
+    secrets; those still fall back to a query on the `token` field.
+
+    Returns:
+        The request document snapshot, or None if the token is unknown.
+    """
+    # Tokens are hex and document ids; compare_digest also rejects non-ASCII str
+    if not token.isascii():
+        return None
+
+    feedback_requests_ref = async_db.collection("feedback_requests")
+
+    request_id, separator, _ = token.rpartition(".")
+    if not separator:
+        query = feedback_requests_ref.where(filter=FieldFilter("token", "==", token)).limit(1)
+        docs = [doc async for doc in query.stream()]
+        return docs[0] if docs else None
+
+    if not _is_valid_request_id(request_id):
+        return None
+
+    doc = await feedback_requests_ref.document(request_id).get()
+    if not doc.exists or not secrets.compare_digest(doc.get("token") or "", token):
+        return None
+    return doc
 
 
 def get_feedback_url(token: str) -> str:
@@ -41,18 +113,22 @@ async def create_feedback_requests_for_session(session_data: dict) -> tuple[str,
     session_id = session_data["id"]
     now = datetime.utcnow()
 
+    student_request_id = f"{session_id}_student"
+    mentor_request_id = f"{session_id}_mentor"
+
     # Generate tokens
-    student_token = generate_token()
-    mentor_token = generate_token()
+    student_token = generate_token(student_request_id)
+    mentor_token = generate_token(mentor_request_id)
 
     # Create student feedback request
-    student_request_id = f"{session_id}_student"
     student_request = {
         "id": student_request_id,
         "session_id": session_id,
         "recipient_type": "student",
         "recipient_email": session_data["student_email"],
         "recipient_name": session_data["student_name"],
+        "other_party_name": session_data["mentor_name"],
+        "mentor_id": session_data.get("mentor_id"),
         "token": student_token,
         "created_at": now,
         "sent_at": None,
@@ -61,13 +137,14 @@ async def create_feedback_requests_for_session(session_data: dict) -> tuple[str,
     }
 
     # Create mentor feedback request
-    mentor_request_id = f"{session_id}_mentor"
     mentor_request = {
         "id": mentor_request_id,
         "session_id": session_id,
         "recipient_type": "mentor",
         "recipient_email": session_data["mentor_email"],
         "recipient_name": session_data["mentor_name"],
+        "other_party_name": session_data["student_name"],
+        "mentor_id": session_data.get("mentor_id"),
         "token": mentor_token,
         "created_at": now,
         "sent_at": None,
@@ -76,31 +153,42 @@ async def create_feedback_requests_for_session(session_data: dict) -> tuple[str,
     }
 
     # Save to Firestore
-    feedback_requests_ref = db.collection("feedback_requests")
-    feedback_requests_ref.document(student_request_id).set(student_request)
-    feedback_requests_ref.document(mentor_request_id).set(mentor_request)
+    feedback_requests_ref = async_db.collection("feedback_requests")
+    batch = async_db.batch()
+    batch.set(feedback_requests_ref.document(student_request_id), student_request)
+    batch.set(feedback_requests_ref.document(mentor_request_id), mentor_request)
+    await batch.commit()
 
     return student_token, mentor_token
 
 
-async def send_feedback_emails_for_session(session_data: dict) -> tuple[bool, bool]:
+async def send_feedback_emails_for_session(
+    session_data: dict,
+    feedback_docs: Optional[dict[str, Optional[dict]]] = None,
+) -> tuple[bool, bool]:
     """
     Send feedback request emails to both student and mentor.
+
+    `feedback_docs` are the session's entries from `get_feedback_documents`;
+    when omitted they are fetched here.
+
     Returns tuple of (student_sent, mentor_sent).
     """
     session_id = session_data["id"]
-    feedback_requests_ref = db.collection("feedback_requests")
+    feedback_requests_ref = async_db.collection("feedback_requests")
 
     # Get or create feedback requests
-    student_request_doc = feedback_requests_ref.document(f"{session_id}_student").get()
-    mentor_request_doc = feedback_requests_ref.document(f"{session_id}_mentor").get()
+    if feedback_docs is None:
+        feedback_docs = (
+            await get_feedback_documents([session_id], include_responses=False)
+        )[session_id]
+    student_data = feedback_docs.get("student_request")
+    mentor_data = feedback_docs.get("mentor_request")
 
     # If requests don't exist, create them
-    if not student_request_doc.exists or not mentor_request_doc.exists:
+    if not student_data or not mentor_data:
         student_token, mentor_token = await create_feedback_requests_for_session(session_data)
     else:
-        student_data = student_request_doc.to_dict()
-        mentor_data = mentor_request_doc.to_dict()
         student_token = student_data["token"]
         mentor_token = mentor_data["token"]
 
@@ -127,12 +215,12 @@ async def send_feedback_emails_for_session(session_data: dict) -> tuple[bool, bo
     # Update sent status in Firestore
     now = datetime.utcnow()
     if student_sent:
-        feedback_requests_ref.document(f"{session_id}_student").update({
+        await feedback_requests_ref.document(f"{session_id}_student").update({
             "email_sent": True,
             "sent_at": now,
         })
     if mentor_sent:
-        feedback_requests_ref.document(f"{session_id}_mentor").update({
+        await feedback_requests_ref.document(f"{session_id}_mentor").update({
             "email_sent": True,
             "sent_at": now,
         })
@@ -147,18 +235,15 @@ async def get_feedback_request_info(token: str):
     Returns info needed to display the feedback form.
     """
     try:
-        # Find feedback request by token
-        feedback_requests_ref = db.collection("feedback_requests")
-        query = feedback_requests_ref.where(filter=FieldFilter("token", "==", token))
-        docs = list(query.stream())
+        request_doc = await find_feedback_request_by_token(token)
 
-        if not docs:
+        if request_doc is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Token inválido ou expirado",
             )
 
-        request_data = docs[0].to_dict()
+        request_data = request_doc.to_dict()
 
         # Check if already submitted
         if request_data.get("submitted", False):
@@ -170,21 +255,24 @@ async def get_feedback_request_info(token: str):
                 already_submitted=True,
             )
 
-        # Get session data to get the other party's name
-        session_doc = db.collection("sessions").document(request_data["session_id"]).get()
-        if not session_doc.exists:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Sessão não encontrada",
-            )
+        # The other party's name is stored on the request at creation time;
+        # older requests still need the session document
+        other_party_name = request_data.get("other_party_name")
+        if other_party_name is None:
+            session_doc = await async_db.collection("sessions").document(request_data["session_id"]).get()
+            if not session_doc.exists:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Sessão não encontrada",
+                )
 
-        session_data = session_doc.to_dict()
+            session_data = session_doc.to_dict()
 
-        # Determine other party name based on recipient type
-        if request_data["recipient_type"] == "student":
-            other_party_name = session_data["mentor_name"]
-        else:
-            other_party_name = session_data["student_name"]
+            # Determine other party name based on recipient type
+            if request_data["recipient_type"] == "student":
+                other_party_name = session_data["mentor_name"]
+            else:
+                other_party_name = session_data["student_name"]
 
         return FeedbackRequestResponse(
             session_id=request_data["session_id"],
@@ -209,18 +297,14 @@ async def submit_feedback(feedback: FeedbackSubmit):
     Submit feedback via token (public endpoint).
     """
     try:
-        # Find feedback request by token
-        feedback_requests_ref = db.collection("feedback_requests")
-        query = feedback_requests_ref.where(filter=FieldFilter("token", "==", feedback.token))
-        docs = list(query.stream())
+        request_doc = await find_feedback_request_by_token(feedback.token)
 
-        if not docs:
+        if request_doc is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Token inválido ou expirado",
             )
 
-        request_doc = docs[0]
         request_data = request_doc.to_dict()
 
         # Check if already submitted
@@ -261,11 +345,38 @@ async def submit_feedback(feedback: FeedbackSubmit):
             "submitted_at": now,
         }
 
-        # Save feedback
-        db.collection("session_feedback").document(feedback_id).set(feedback_doc)
-
-        # Mark request as submitted
-        request_doc.reference.update({"submitted": True})
+        # Older requests don't carry the mentor id; read it from the session
+        mentor_id = request_data.get("mentor_id")
+        if not mentor_id:
+            session_doc = await async_db.collection("sessions").document(request_data["session_id"]).get(
+                field_paths=["mentor_id"]
+            )
+            mentor_id = session_doc.get("mentor_id") if session_doc.exists else None
+
+        # Save feedback, mark the request as submitted and update the mentor's
+        # rating aggregate together. The precondition makes a concurrent
+        # second submission fail instead of being counted twice.
+        batch = async_db.batch()
+        batch.set(async_db.collection("session_feedback").document(feedback_id), feedback_doc)
+        batch.update(
+            request_doc.reference,
+            {"submitted": True},
+            option=async_db.write_option(last_update_time=request_doc.update_time),
+        )
+        add_feedback_to_ratings(
+            batch,
+            mentor_id,
+            request_data["recipient_type"],
+            feedback_doc["rating"],
+            feedback.meeting_status,
+        )
+        try:
+            await batch.commit()
+        except FailedPrecondition:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Feedback já foi enviado para esta solicitação",
+            )
 
         # Track analytics
         track_event(
@@ -300,7 +411,7 @@ async def send_feedback_emails(
     """
     try:
         # Get session data
-        session_doc = db.collection("sessions").document(request.session_id).get()
+        session_doc = await async_db.collection("sessions").document(request.session_id).get()
         if not session_doc.exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -347,79 +458,329 @@ async def send_feedback_emails(
         )
 
 
-@router.post("/process-pending", response_model=ProcessPendingResponse)
-async def process_pending_feedback_requests():
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+async def _prepare_feedback_messages(
+    session_data: dict,
+    feedback_docs: dict[str, Optional[dict]],
+) -> list[tuple[str, dict, int]]:
     """
-    Process sessions from 5 days ago and send feedback requests.
-    This endpoint is called by Cloud Scheduler.
+    Build the feedback emails a session still needs, creating its feedback
+    requests first if they don't exist.
+
+    Returns:
+        List of (feedback request id, email message, failed attempts so far)
+        for recipients whose email hasn't been sent or given up on.
     """
-    try:
-        # Calculate date 5 days ago
-        target_date = datetime.utcnow() - timedelta(days=5)
-        target_date_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        target_date_end = target_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-        # Query sessions created 5 days ago
-        sessions_ref = db.collection("sessions")
-        query = (
-            sessions_ref
-            .where(filter=FieldFilter("created_at", ">=", target_date_start))
-            .where(filter=FieldFilter("created_at", "<=", target_date_end))
-        )
-        sessions = list(query.stream())
+    session_id = session_data["id"]
+    student_data = feedback_docs.get("student_request")
+    mentor_data = feedback_docs.get("mentor_request")
 
-        sessions_processed = 0
-        emails_sent = 0
-        errors = []
+    if not student_data or not mentor_data:
+        student_token, mentor_token = await create_feedback_requests_for_session(session_data)
+        student_data = {"token": student_token, "email_sent": False}
+        mentor_data = {"token": mentor_token, "email_sent": False}
+
+    messages = []
+    if not student_data.get("email_sent") and not student_data.get("email_failed"):
+        messages.append((
+            feedback_doc_id(session_id, "student"),
+            email_service.build_feedback_request_to_student(
+                student_name=session_data["student_name"],
+                student_email=session_data["student_email"],
+                mentor_name=session_data["mentor_name"],
+                feedback_url=get_feedback_url(student_data["token"]),
+            ),
+            student_data.get("email_attempts", 0),
+        ))
+    if not mentor_data.get("email_sent") and not mentor_data.get("email_failed"):
+        messages.append((
+            feedback_doc_id(session_id, "mentor"),
+            email_service.build_feedback_request_to_mentor(
+                mentor_name=session_data["mentor_name"],
+                mentor_email=session_data["mentor_email"],
+                student_name=session_data["student_name"],
+                feedback_url=get_feedback_url(mentor_data["token"]),
+            ),
+            mentor_data.get("email_attempts", 0),
+        ))
+    return messages
+
+
+async def _send_message_batch(messages: list[dict]) -> list[dict]:
+    """Send one Resend batch, waiting for a slot under the provider rate limit."""
+    await resend_rate_limiter.acquire()
+    return await asyncio.to_thread(email_service.send_batch, messages)
+
+
+async def _send_isolating_permanent_failures(messages: list[dict]) -> list[dict]:
+    """
+    Send a batch; if it fails permanently, split it to find the messages at fault.
 
-        for session_doc in sessions:
-            session_data = session_doc.to_dict()
-            session_id = session_data["id"]
+    Resend rejects a whole batch for one invalid recipient, so halves are
+    resent until the failure is narrowed down to single messages.
+    """
+    results = await _send_message_batch(messages)
+    if len(messages) == 1 or results[0].get("success") or not results[0].get("permanent"):
+        return results
+    middle = len(messages) // 2
+    first, second = await asyncio.gather(
+        _send_isolating_permanent_failures(messages[:middle]),
+        _send_isolating_permanent_failures(messages[middle:]),
+    )
+    return first + second
 
-            try:
-                # Check if feedback requests already exist
-                student_request = db.collection("feedback_requests").document(f"{session_id}_student").get()
-                mentor_request = db.collection("feedback_requests").document(f"{session_id}_mentor").get()
 
-                # Skip if both already sent
-                if student_request.exists and mentor_request.exists:
-                    student_data = student_request.to_dict()
-                    mentor_data = mentor_request.to_dict()
-                    if student_data.get("email_sent") and mentor_data.get("email_sent"):
-                        continue
+def _add_timing(timings_ms: dict[str, float], stage: str, start: float) -> None:
+    timings_ms[stage] = round(timings_ms.get(stage, 0.0) + _elapsed_ms(start), 2)
 
-                # Send feedback emails
-                student_sent, mentor_sent = await send_feedback_emails_for_session(session_data)
 
-                sessions_processed += 1
-                if student_sent:
-                    emails_sent += 1
-                if mentor_sent:
-                    emails_sent += 1
+async def _process_session_page(sessions: list[dict], timings_ms: dict[str, float]) -> dict:
+    """
+    Send the pending feedback emails for a page of sessions.
 
-            except Exception as e:
-                errors.append(f"Session {session_id}: {str(e)}")
+    Sessions are prepared concurrently (up to FEEDBACK_PROCESS_CONCURRENCY at a
+    time), the emails go out through Resend's batch endpoint under the provider
+    rate limit, and the sent flags are written in batches.
 
-        # Track analytics
-        track_event(
-            user_id="system",
-            event_name="System: Feedback Batch Processed",
-            properties={
-                "sessions_processed": sessions_processed,
-                "emails_sent": emails_sent,
-                "errors_count": len(errors),
-            },
-        )
+    A failed send increments the request's `email_attempts` and records
+    `last_error`. Permanent errors and requests out of attempts are marked
+    `email_failed` and not retried.
 
-        return ProcessPendingResponse(
-            success=True,
-            sessions_processed=sessions_processed,
-            emails_sent=emails_sent,
-            errors=errors,
+    A session that fails to prepare (e.g. a Firestore timeout while creating
+    its feedback requests) is retried too. Only sessions missing the fields
+    the emails need are skipped, and each one is logged.
+
+    Returns:
+        Dict with sessions_processed, emails_sent, emails_failed,
+        emails_abandoned, errors and the ids of sessions to retry
+        (`retry_session_ids`: a failed preparation or send).
+    """
+    # Fetch every session's feedback requests in batched reads
+    stage_start = time.perf_counter()
+    feedback_docs = await get_feedback_documents(
+        [session_data["id"] for session_data in sessions],
+        include_responses=False,
+    )
+    _add_timing(timings_ms, "lookup", stage_start)
+
+    errors = []
+
+    # Create missing feedback requests and build the pending emails
+    stage_start = time.perf_counter()
+    semaphore = asyncio.Semaphore(settings.FEEDBACK_PROCESS_CONCURRENCY)
+
+    async def prepare(session_data: dict) -> list[tuple[str, dict, int]]:
+        async with semaphore:
+            return await _prepare_feedback_messages(
+                session_data, feedback_docs[session_data["id"]]
+            )
+
+    prepared = await asyncio.gather(
+        *(prepare(session_data) for session_data in sessions),
+        return_exceptions=True,
+    )
+
+    pending: list[tuple[str, str, dict, int]] = []
+    sessions_processed = 0
+    retry_session_ids = set()
+    for session_data, result in zip(sessions, prepared):
+        if isinstance(result, (KeyError, ValidationError)):
+            # Missing or invalid session fields won't fix themselves on a retry
+            logger.error(
+                f"Skipping feedback emails for session {session_data['id']}: invalid session data ({result!r})",
+                extra={"extra_fields": {"session_id": session_data["id"]}},
+            )
+            errors.append(f"Session {session_data['id']} (not retried): invalid session data {result!r}")
+        elif isinstance(result, Exception):
+            retry_session_ids.add(session_data["id"])
+            errors.append(f"Session {session_data['id']}: {str(result)}")
+        elif result:
+            sessions_processed += 1
+            pending.extend((session_data["id"], *request) for request in result)
+    _add_timing(timings_ms, "prepare", stage_start)
+
+    # Send in provider-sized batches
+    stage_start = time.perf_counter()
+    chunks = [
+        pending[i:i + RESEND_BATCH_MAX_SIZE]
+        for i in range(0, len(pending), RESEND_BATCH_MAX_SIZE)
+    ]
+    chunk_results = await asyncio.gather(
+        *(_send_isolating_permanent_failures([message for _, _, message, _ in chunk]) for chunk in chunks)
+    )
+
+    now = datetime.utcnow()
+    updates: list[tuple[str, dict]] = []
+    emails_sent = 0
+    emails_abandoned = 0
+    for chunk, results in zip(chunks, chunk_results):
+        for (session_id, request_id, _, attempts), result in zip(chunk, results):
+            if result.get("success"):
+                emails_sent += 1
+                updates.append((request_id, {"email_sent": True, "sent_at": now}))
+                continue
+
+            error = result.get("error", "Unknown error")
+            update = {"email_attempts": Increment(1), "last_error": error, "last_error_at": now}
+            if result.get("permanent") or attempts + 1 >= FEEDBACK_EMAIL_MAX_ATTEMPTS:
+                update["email_failed"] = True
+                emails_abandoned += 1
+                errors.append(f"Request {request_id} (not retried): {error}")
+            else:
+                retry_session_ids.add(session_id)
+                errors.append(f"Request {request_id}: {error}")
+            updates.append((request_id, update))
+    _add_timing(timings_ms, "send", stage_start)
+
+    # Record what was sent and what failed
+    stage_start = time.perf_counter()
+    feedback_requests_ref = async_db.collection("feedback_requests")
+    for i in range(0, len(updates), FIRESTORE_MAX_BATCH_WRITES):
+        batch = async_db.batch()
+        for request_id, update in updates[i:i + FIRESTORE_MAX_BATCH_WRITES]:
+            batch.update(feedback_requests_ref.document(request_id), update)
+        await batch.commit()
+    _add_timing(timings_ms, "update", stage_start)
+
+    return {
+        "sessions_processed": sessions_processed,
+        "emails_sent": emails_sent,
+        "emails_failed": len(pending) - emails_sent,
+        "emails_abandoned": emails_abandoned,
+        "errors": errors,
+        "retry_session_ids": retry_session_ids,
+    }
+
+
+@router.post("/process-pending", response_model=ProcessPendingResponse)
+async def process_pending_feedback_requests():
+    """
+    Send feedback requests for every session created at least 5 days ago
+    that hasn't had them yet.
+    This endpoint is called by Cloud Scheduler.
+
+    Sessions are swept in pages from the checkpoint left by the previous run
+    (see services/feedback_sweep.py). The checkpoint only moves past sessions
+    whose emails were sent or given up on (permanent error, or
+    FEEDBACK_EMAIL_MAX_ATTEMPTS failures), so a transient failure is retried
+    by the next run, and a run that runs out of time resumes where it stopped.
+    """
+    checkpoint = await claim_feedback_sweep()
+    if checkpoint is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Outra execução do processamento de feedback está em andamento",
         )
 
+    total_start = time.perf_counter()
+    timings_ms: dict[str, float] = {}
+    waited_before = resend_rate_limiter.waited_seconds
+    cutoff = feedback_cutoff()
+
+    sessions_scanned = 0
+    sessions_processed = 0
+    emails_sent = 0
+    emails_failed = 0
+    emails_abandoned = 0
+    pages = 0
+    errors = []
+    complete = False
+
+    try:
+        while time.perf_counter() - total_start < SWEEP_TIME_BUDGET_SECONDS:
+            stage_start = time.perf_counter()
+            sessions = await fetch_sweep_page(checkpoint, cutoff)
+            _add_timing(timings_ms, "query", stage_start)
+            if not sessions:
+                complete = True
+                break
+
+            pages += 1
+            sessions_scanned += len(sessions)
+            result = await _process_session_page(sessions, timings_ms)
+            sessions_processed += result["sessions_processed"]
+            emails_sent += result["emails_sent"]
+            emails_failed += result["emails_failed"]
+            emails_abandoned += result["emails_abandoned"]
+            errors.extend(result["errors"])
+
+            # Advance up to the first session to retry, then stop: Firestore or
+            # the provider is likely failing and the next run retries from there
+            failed = result["retry_session_ids"]
+            handled = sessions
+            if failed:
+                first_failed = next(i for i, s in enumerate(sessions) if s["id"] in failed)
+                handled = sessions[:first_failed]
+
+            stage_start = time.perf_counter()
+            if handled:
+                await advance_feedback_sweep(checkpoint, handled[-1])
+            _add_timing(timings_ms, "checkpoint", stage_start)
+
+            if failed:
+                break
+            if len(sessions) < SWEEP_PAGE_SIZE:
+                complete = True
+                break
+
     except Exception as e:
+        await release_feedback_sweep({"error": str(e), "sessions_scanned": sessions_scanned})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao processar sessões pendentes: {str(e)}",
         )
+
+    timings_ms["total"] = _elapsed_ms(total_start)
+    run_stats = {
+        "sessions_scanned": sessions_scanned,
+        "sessions_processed": sessions_processed,
+        "emails_sent": emails_sent,
+        "emails_failed": emails_failed,
+        "emails_abandoned": emails_abandoned,
+        "pages": pages,
+        "complete": complete,
+    }
+    await release_feedback_sweep(run_stats)
+
+    logger.info(
+        f"Processed feedback for {sessions_processed} sessions: {emails_sent} emails sent",
+        extra={
+            "extra_fields": {
+                **run_stats,
+                "checkpoint_created_at": str(checkpoint["last_created_at"]),
+                "checkpoint_session_id": checkpoint["last_session_id"],
+                "rate_limit_wait_ms": round(
+                    (resend_rate_limiter.waited_seconds - waited_before) * 1000, 2
+                ),
+                **{f"{stage}_ms": ms for stage, ms in timings_ms.items()},
+            }
+        },
+    )
+
+    # Track analytics
+    track_event(
+        user_id="system",
+        event_name="System: Feedback Batch Processed",
+        properties={
+            "sessions_processed": sessions_processed,
+            "emails_sent": emails_sent,
+            "errors_count": len(errors),
+            "duration_ms": timings_ms["total"],
+            "complete": complete,
+        },
+    )
+
+    return ProcessPendingResponse(
+        success=True,
+        sessions_processed=sessions_processed,
+        emails_sent=emails_sent,
+        emails_failed=emails_failed,
+        emails_abandoned=emails_abandoned,
+        errors=errors,
+        sessions_scanned=sessions_scanned,
+        complete=complete,
+        timings_ms=timings_ms,
+    )
@@ -0,0 +1,59 @@
+"""Background job endpoints, called by Cloud Scheduler.
+
+With request-based CPU allocation Cloud Run throttles instances between
+requests, so in-process workers can't be relied on to make progress on
+their own. These endpoints run the same work while a request holds the CPU.
+"""
+
+import logging
+
+from fastapi import APIRouter, HTTPException, status
+
+from ...services.email_outbox import email_outbox_worker
+from ...services.export_jobs import export_job_worker
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("/email-outbox", response_model=dict)
+async def drain_email_outbox():
+    """
+    Deliver every due outbox email (new messages and retries).
+    This endpoint is called by Cloud Scheduler every minute.
+    """
+    try:
+        result = await email_outbox_worker.drain()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao processar emails pendentes: {str(e)}",
+        )
+
+    logger.info(
+        f"Email outbox drained: {result['delivered']} delivered",
+        extra={"extra_fields": result},
+    )
+    return {"success": True, **result}
+
+
+@router.post("/exports", response_model=dict)
+async def drain_export_jobs():
+    """
+    Build the files of queued export jobs (new jobs and retries).
+    This endpoint is called by Cloud Scheduler every five minutes.
+    """
+    try:
+        result = await export_job_worker.drain()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao processar exportações pendentes: {str(e)}",
+        )
+
+    logger.info(
+        f"Export jobs drained: {result['completed']} completed",
+        extra={"extra_fields": result},
+    )
+    return {"success": True, **result}
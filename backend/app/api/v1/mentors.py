@@ -1,26 +1,28 @@
 """Mentors API endpoints."""
 
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from typing import List, Literal, Optional
 from datetime import datetime
-import uuid
+import hashlib
 
-from firebase_admin import storage
-
-from ...core.firebase import db
+from ...core.firebase import async_db
 from ...core.analytics import track_event, Events
+from ...core.user_cache import user_cache
 from ...models.mentor import (
     MentorProfile,
     MentorProfileUpdate,
     MentorPublicResponse,
     MentorListResponse,
 )
+from ...services.mentor_catalog import mentor_catalog, mentor_public_response, etag_matches
+from ...services.mentor_recommendations import mentor_recommender
+from ...services.mentor_search import mentor_search_index
+from ...services.photo_upload import PhotoUploadError, stream_photo_upload
 from ..deps import get_current_user
 
 
 router = APIRouter(prefix="/mentors", tags=["mentors"])
 
-
 def _check_profile_completeness(profile: dict) -> bool:
     """Check if mentor profile has all required fields filled."""
     required_fields = ["title", "company", "bio", "tags", "expertise"]
@@ -80,8 +82,8 @@ async def update_my_profile(
         )
 
     # Get current mentor profile
-    user_ref = db.collection("users").document(current_user.uid)
-    user_doc = user_ref.get()
+    user_ref = async_db.collection("users").document(current_user.uid)
+    user_doc = await user_ref.get()
 
     if not user_doc.exists:
         raise HTTPException(status_code=404, detail="User not found")
@@ -103,10 +105,12 @@ async def update_my_profile(
         merged_profile["isActive"] = True
 
     # Update Firestore
-    user_ref.update({
+    await user_ref.update({
         "mentorProfile": merged_profile,
         "updatedAt": datetime.utcnow(),
     })
+    user_cache.invalidate(current_user.uid)
+    mentor_catalog.invalidate()
 
     # Track analytics
     track_event(
@@ -124,14 +128,31 @@ async def update_my_profile(
     }
 
 
-@router.post("/me/photo")
+@router.post(
+    "/me/photo",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"],
+                    }
+                }
+            },
+        }
+    },
+)
 async def upload_profile_photo(
-    file: UploadFile = File(...),
+    request: Request,
     current_user: dict = Depends(get_current_user),
 ):
     """
     Upload a profile photo for the current mentor.
-    Stores in Firebase Storage and updates Firestore.
+    The multipart body is streamed into Firebase Storage (see
+    services/photo_upload.py) and the URL saved in Firestore.
     """
     if current_user.role != "mentor":
         raise HTTPException(
@@ -139,60 +160,45 @@ async def upload_profile_photo(
             detail="Only mentors can access this endpoint",
         )
 
-    # Validate file type
-    allowed_types = ["image/jpeg", "image/png", "image/webp"]
-    if file.content_type not in allowed_types:
+    try:
+        # Size, type and magic bytes are checked while streaming
+        photo = await stream_photo_upload(request, current_user.uid)
+    except PhotoUploadError as e:
         raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}",
+            status_code=e.status_code,
+            detail=str(e),
         )
-
-    # Validate file size (max 5MB)
-    contents = await file.read()
-    if len(contents) > 5 * 1024 * 1024:
+    except Exception as e:
         raise HTTPException(
-            status_code=400,
-            detail="File too large. Maximum size is 5MB.",
+            status_code=500,
+            detail=f"Failed to upload photo: {str(e)}",
         )
 
     try:
-        # Generate unique filename
-        ext = file.filename.split(".")[-1] if "." in file.filename else "jpg"
-        filename = f"{uuid.uuid4()}.{ext}"
-        blob_path = f"mentor-photos/{current_user.uid}/{filename}"
-
-        # Upload to Firebase Storage
-        bucket = storage.bucket()
-        blob = bucket.blob(blob_path)
-        blob.upload_from_string(
-            contents,
-            content_type=file.content_type,
-        )
-
-        # Make the blob publicly accessible
-        blob.make_public()
-        photo_url = blob.public_url
+        photo_url = photo.public_url
 
         # Update Firestore with new photo URL
-        user_ref = db.collection("users").document(current_user.uid)
-        user_doc = user_ref.get()
+        user_ref = async_db.collection("users").document(current_user.uid)
+        user_doc = await user_ref.get()
         current_profile = user_doc.to_dict().get("mentorProfile", {}) or {}
 
         current_profile["photoURL"] = photo_url
         current_profile["isProfileComplete"] = _check_profile_completeness(current_profile)
 
-        user_ref.update({
+        await user_ref.update({
             "mentorProfile": current_profile,
             "updatedAt": datetime.utcnow(),
         })
+        user_cache.invalidate(current_user.uid)
+        mentor_catalog.invalidate()
 
         # Track analytics
         track_event(
             user_id=current_user.uid,
             event_name=Events.MENTOR_PHOTO_UPLOADED,
             properties={
-                "file_size": len(contents),
-                "file_type": file.content_type,
+                "file_size": photo.size,
+                "file_type": photo.content_type,
             },
         )
 
@@ -210,58 +216,148 @@ async def upload_profile_photo(
 
 @router.get("", response_model=MentorListResponse)
 async def list_mentors(
+    request: Request,
+    tags: Optional[List[str]] = Query(None, description="Filter by tag (repeatable)"),
+    expertise: Optional[List[str]] = Query(None, description="Filter by expertise (repeatable)"),
+    course: Optional[List[str]] = Query(None, description="Filter by course (repeatable)"),
+    company: Optional[List[str]] = Query(None, description="Filter by company (repeatable)"),
+    match: Literal["all", "any"] = Query("all", description="Require all filter values (AND) or any (OR)"),
+    sort_by: Optional[Literal["pending_sessions", "completed_sessions", "sessions_last_30_days"]] = Query(
+        None, description="Order by a session count (e.g. least pending first)"
+    ),
+    descending: bool = Query(False, description="Largest counts first"),
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Get list of all active mentors from Firestore.
+    Get list of all active mentors, optionally filtered and sorted.
+    Served from the in-process catalog; supports If-None-Match (304).
+    Filter values are matched case-insensitively against the catalog's
+    inverted index.
     Requires authentication.
     """
     try:
-        # Query Firestore for active mentors
-        users_ref = db.collection("users")
-        query = users_ref.where("role", "==", "mentor").where("status", "==", "active")
-
-        mentors = []
-        for doc in query.stream():
-            user_data = doc.to_dict()
-            mentor_profile = user_data.get("mentorProfile", {}) or {}
-
-            # Skip mentors who are not active or don't have a profile
-            if not mentor_profile.get("isActive", True):
-                continue
-
-            mentors.append(MentorPublicResponse(
-                id=doc.id,
-                name=user_data.get("displayName", ""),
-                email=user_data.get("email", ""),
-                title=mentor_profile.get("title", ""),
-                company=mentor_profile.get("company", ""),
-                bio=mentor_profile.get("bio", ""),
-                photoURL=mentor_profile.get("photoURL"),
-                tags=mentor_profile.get("tags", []),
-                expertise=mentor_profile.get("expertise", []),
-                linkedin=mentor_profile.get("linkedin", ""),
-                course=mentor_profile.get("course", ""),
-                schedulingLink=mentor_profile.get("schedulingLink", ""),
-            ))
-
-        # Track analytics
-        track_event(
-            user_id=current_user.uid,
-            event_name=Events.MENTORS_FETCHED,
-            properties={"results_count": len(mentors)},
+        catalog = await mentor_catalog.get()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch mentors: {str(e)}",
         )
 
-        return MentorListResponse(
-            mentors=mentors,
-            total=len(mentors),
-        )
+    filters = {
+        field: values
+        for field, values in (("tags", tags), ("expertise", expertise), ("course", course), ("company", company))
+        if values
+    }
+    counts = None
+    if filters or sort_by:
+        if filters:
+            positions = catalog.select(filters, match_all=match == "all")
+        else:
+            positions = range(len(catalog.mentors))
+        if sort_by:
+            # Counts are only part of the response (and its ETag) when sorting
+            counts = await mentor_catalog.session_counts()
+            positions = catalog.sort(positions, sort_by, counts, descending)
+        results_count = len(positions)
+        # Same catalog version, counts, filters and order -> same body
+        filter_key = repr((sorted(filters.items()), match, sort_by, descending)).encode("utf-8")
+        counts_key = counts.digest.encode() if counts is not None else b""
+        etag = f'"{hashlib.sha256(catalog.etag.encode() + counts_key + filter_key).hexdigest()[:32]}"'
+    else:
+        positions = None
+        results_count = len(catalog.mentors)
+        etag = catalog.etag
+
+    # Track analytics
+    track_event(
+        user_id=current_user.uid,
+        event_name=Events.MENTORS_FETCHED,
+        properties={
+            "results_count": results_count,
+            "filters": sorted(filters),
+            "match": match,
+            "sort_by": sort_by,
+        },
+    )
+
+    # private: the list is only served to authenticated users;
+    # no-cache: clients revalidate with the ETag on every use
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = catalog.body if positions is None else catalog.response_body(positions, counts)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/search", response_model=MentorListResponse)
+async def search_mentors(
+    q: str = Query(..., min_length=1, max_length=200, description="Free-text query"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Search active mentors by name, title, company, bio, tags and expertise.
+    Accent- and case-insensitive; results are ranked by relevance (BM25).
+    `total` is the number of matching mentors, `mentors` the top `limit`.
+    Requires authentication.
+    """
+    try:
+        catalog = await mentor_catalog.get()
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch mentors: {str(e)}",
         )
 
+    mentor_search_index.sync(catalog)
+    mentors, total = mentor_search_index.search(q, limit)
+
+    # Track analytics
+    track_event(
+        user_id=current_user.uid,
+        event_name=Events.MENTORS_SEARCHED,
+        properties={"query": q, "results_count": total},
+    )
+
+    return MentorListResponse(mentors=mentors, total=total)
+
+
+@router.get("/recommended", response_model=MentorListResponse)
+async def recommended_mentors(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Get all active mentors, best match for the current user first.
+    Ranked by the overlap between the user's course and interests and the
+    mentor's tags, expertise and course; supports If-None-Match (304).
+    Requires authentication.
+    """
+    try:
+        catalog = await mentor_catalog.get()
+        positions, profile_key = mentor_recommender.rank(catalog, current_user.profile)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to recommend mentors: {str(e)}",
+        )
+
+    # Track analytics
+    track_event(
+        user_id=current_user.uid,
+        event_name=Events.MENTORS_FETCHED,
+        properties={"results_count": len(positions), "recommended": True},
+    )
+
+    # Same catalog version and profile -> same ranking
+    etag = f'"{hashlib.sha256((catalog.etag + profile_key).encode()).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=catalog.response_body(positions), media_type="application/json", headers=headers)
+
 
 @router.get("/{mentor_id}", response_model=MentorPublicResponse)
 async def get_mentor(
@@ -270,22 +366,28 @@ async def get_mentor(
 ):
     """
     Get a single mentor by ID (Firestore user ID).
+    Listed mentors are served from the catalog; others (hidden or
+    inactive) are read from Firestore.
     Requires authentication.
     """
     try:
-        user_ref = db.collection("users").document(mentor_id)
-        user_doc = user_ref.get()
+        catalog = await mentor_catalog.get()
+        mentor = catalog.by_id.get(mentor_id)
 
-        if not user_doc.exists:
-            raise HTTPException(status_code=404, detail="Mentor not found")
+        if mentor is None:
+            user_ref = async_db.collection("users").document(mentor_id)
+            user_doc = await user_ref.get()
 
-        user_data = user_doc.to_dict()
+            if not user_doc.exists:
+                raise HTTPException(status_code=404, detail="Mentor not found")
 
-        # Verify it's a mentor
-        if user_data.get("role") != "mentor":
-            raise HTTPException(status_code=404, detail="Mentor not found")
+            user_data = user_doc.to_dict()
 
-        mentor_profile = user_data.get("mentorProfile", {}) or {}
+            # Verify it's a mentor
+            if user_data.get("role") != "mentor":
+                raise HTTPException(status_code=404, detail="Mentor not found")
+
+            mentor = mentor_public_response(user_doc.id, user_data)
 
         # Track analytics
         track_event(
@@ -293,24 +395,11 @@ async def get_mentor(
             event_name=Events.MENTOR_DETAIL_FETCHED,
             properties={
                 "mentor_id": mentor_id,
-                "mentor_name": user_data.get("displayName"),
+                "mentor_name": mentor.name,
             },
         )
 
-        return MentorPublicResponse(
-            id=user_doc.id,
-            name=user_data.get("displayName", ""),
-            email=user_data.get("email", ""),
-            title=mentor_profile.get("title", ""),
-            company=mentor_profile.get("company", ""),
-            bio=mentor_profile.get("bio", ""),
-            photoURL=mentor_profile.get("photoURL"),
-            tags=mentor_profile.get("tags", []),
-            expertise=mentor_profile.get("expertise", []),
-            linkedin=mentor_profile.get("linkedin", ""),
-            course=mentor_profile.get("course", ""),
-            schedulingLink=mentor_profile.get("schedulingLink", ""),
-        )
+        return mentor
     except HTTPException:
         raise
     except Exception as e:
@@ -8,6 +8,7 @@ from .mentors import router as mentors_router
 from .admin import router as admin_router
 from .sessions import router as sessions_router
 from .feedback import router as feedback_router
+from .jobs import router as jobs_router
 
 api_router = APIRouter()
 
@@ -18,3 +19,4 @@ api_router.include_router(mentors_router)
 api_router.include_router(admin_router)
 api_router.include_router(sessions_router)
 api_router.include_router(feedback_router)
+api_router.include_router(jobs_router)
@@ -5,10 +5,10 @@ from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional
 from firebase_admin import firestore
+from google.api_core.exceptions import FailedPrecondition
 from google.cloud.firestore_v1.base_query import FieldFilter
 
-from ...core.firebase import db
-from ...core.email import email_service
+from ...core.firebase import async_db
 from ...core.analytics import track_event, Events
 from ...models.session import (
     SessionCreate,
@@ -20,12 +20,20 @@ from ...models.session import (
     SessionCompleteWithFeedback,
 )
 from ...core.config import settings
+from ...core.pagination import encode_cursor, decode_cursor
 from ...models.user import UserInDB
+from ...services.email_outbox import add_email_to_batch, email_outbox_worker
+from ...services.mentor_counters import add_session_counter_updates, add_status_change_counter_updates
+from ...services.mentor_ratings import add_feedback_to_ratings
 from ..deps import get_current_user, get_current_estudante
 
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
+# Page sizes for GET /sessions
+SESSIONS_PAGE_SIZE = 50
+SESSIONS_MAX_PAGE_SIZE = 100
+
 
 def generate_session_id() -> str:
     """Generate a unique 8-character session ID."""
@@ -76,16 +84,18 @@ async def create_session(
             "student_email_sent": False,
         }
 
-        # Save to Firestore
-        sessions_ref = db.collection("sessions")
-        sessions_ref.document(session_id).set(session_doc)
+        # Save the session and queue its emails in one write
+        session_ref = async_db.collection("sessions").document(session_id)
+        batch = async_db.batch()
+        batch.set(session_ref, session_doc)
+        add_session_counter_updates(batch, session_data.mentor_id, pending=1, created_on=now)
 
-        mentor_email_sent = False
-        student_email_sent = False
+        emails_queued = booking_method != "scheduling_link"
 
-        if booking_method == "scheduling_link":
+        if not emails_queued:
             # Student books directly on the mentor's external scheduling link —
             # no emails are sent, we only record the session for both dashboards.
+            await batch.commit()
             track_event(
                 user_id=current_user.uid,
                 event_name=Events.SESSION_SCHEDULING_LINK_BOOKED,
@@ -97,74 +107,55 @@ async def create_session(
                 },
             )
         else:
-            # Send emails (default email flow)
-            mentor_email_result = email_service.send_session_request_to_mentor(
-                mentor_name=session_data.mentor_name,
-                mentor_email=session_data.mentor_email,
-                student_name=current_user.displayName,
-                student_email=current_user.email,
-                message=message,
-            )
-
-            # Track mentor email result
-            if mentor_email_result.get("success", False):
-                track_event(
-                    user_id=current_user.uid,
-                    event_name=Events.EMAIL_MENTOR_REQUEST_SENT,
-                    properties={
+            # Default email flow: delivered by the outbox worker, which sets
+            # mentor_email_sent / student_email_sent once each email is sent
+            add_email_to_batch(
+                batch,
+                "send_session_request_to_mentor",
+                {
+                    "mentor_name": session_data.mentor_name,
+                    "mentor_email": session_data.mentor_email,
+                    "student_name": current_user.displayName,
+                    "student_email": current_user.email,
+                    "message": message,
+                },
+                key=f"session_{session_id}_mentor_request",
+                on_sent={"path": session_ref.path, "field": "mentor_email_sent"},
+                analytics={
+                    "user_id": current_user.uid,
+                    "sent_event": Events.EMAIL_MENTOR_REQUEST_SENT,
+                    "failed_event": Events.EMAIL_MENTOR_REQUEST_FAILED,
+                    "properties": {
                         "session_id": session_id,
                         "mentor_email": session_data.mentor_email,
                         "mentor_name": session_data.mentor_name,
                     },
-                )
-            else:
-                track_event(
-                    user_id=current_user.uid,
-                    event_name=Events.EMAIL_MENTOR_REQUEST_FAILED,
-                    properties={
-                        "session_id": session_id,
-                        "mentor_email": session_data.mentor_email,
-                        "error": mentor_email_result.get("error", "Unknown error"),
-                    },
-                )
-
-            student_email_result = email_service.send_session_confirmation_to_student(
-                student_name=current_user.displayName,
-                student_email=current_user.email,
-                mentor_name=session_data.mentor_name,
-                mentor_company=session_data.mentor_company,
-                message=message,
+                },
             )
-
-            # Track student email result
-            if student_email_result.get("success", False):
-                track_event(
-                    user_id=current_user.uid,
-                    event_name=Events.EMAIL_STUDENT_CONFIRMATION_SENT,
-                    properties={
-                        "session_id": session_id,
-                        "student_email": current_user.email,
-                    },
-                )
-            else:
-                track_event(
-                    user_id=current_user.uid,
-                    event_name=Events.EMAIL_STUDENT_CONFIRMATION_FAILED,
-                    properties={
+            add_email_to_batch(
+                batch,
+                "send_session_confirmation_to_student",
+                {
+                    "student_name": current_user.displayName,
+                    "student_email": current_user.email,
+                    "mentor_name": session_data.mentor_name,
+                    "mentor_company": session_data.mentor_company,
+                    "message": message,
+                },
+                key=f"session_{session_id}_student_confirmation",
+                on_sent={"path": session_ref.path, "field": "student_email_sent"},
+                analytics={
+                    "user_id": current_user.uid,
+                    "sent_event": Events.EMAIL_STUDENT_CONFIRMATION_SENT,
+                    "failed_event": Events.EMAIL_STUDENT_CONFIRMATION_FAILED,
+                    "properties": {
                         "session_id": session_id,
                         "student_email": current_user.email,
-                        "error": student_email_result.get("error", "Unknown error"),
                     },
-                )
-
-            mentor_email_sent = mentor_email_result.get("success", False)
-            student_email_sent = student_email_result.get("success", False)
-
-            # Update email status in Firestore
-            sessions_ref.document(session_id).update({
-                "mentor_email_sent": mentor_email_sent,
-                "student_email_sent": student_email_sent,
-            })
+                },
+            )
+            await batch.commit()
+            email_outbox_worker.wake()
 
         # Track session created
         track_event(
@@ -176,8 +167,7 @@ async def create_session(
                 "mentor_name": session_data.mentor_name,
                 "mentor_company": session_data.mentor_company,
                 "booking_method": booking_method,
-                "mentor_email_sent": mentor_email_sent,
-                "student_email_sent": student_email_sent,
+                "emails_queued": emails_queued,
             },
         )
 
@@ -210,15 +200,20 @@ async def create_session(
 @router.get("", response_model=SessionListResponse)
 async def list_sessions(
     status: Optional[str] = Query(None, description="Filter by status"),
+    limit: int = Query(
+        SESSIONS_PAGE_SIZE, ge=1, le=SESSIONS_MAX_PAGE_SIZE, description="Page size"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: UserInDB = Depends(get_current_user),
 ):
     """
-    Get list of sessions for the current user.
+    Get a page of sessions for the current user, most recent first.
     Students see their own session requests.
     Mentors see sessions requested to them.
+    Pass the returned `next_cursor` to fetch the following page.
     """
     try:
-        sessions_ref = db.collection("sessions")
+        sessions_ref = async_db.collection("sessions")
 
         # Filter by user role using new filter syntax
         if current_user.role == "estudante":
@@ -230,11 +225,28 @@ async def list_sessions(
         if status:
             query = query.where(filter=FieldFilter("status", "==", status))
 
-        # Order by creation date (most recent first)
-        query = query.order_by("created_at", direction=firestore.Query.DESCENDING)
+        # Order by creation date (most recent first), document id as tie-breaker.
+        # Served by the (student_uid|mentor_email, [status,] created_at DESC)
+        # composite indexes, whose implicit __name__ ordering follows created_at.
+        query = (
+            query
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+            .order_by("__name__", direction=firestore.Query.DESCENDING)
+        )
+
+        if cursor:
+            try:
+                query = query.start_after(decode_cursor(cursor, {"created_at": datetime, "__name__": str}))
+            except ValueError:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid cursor",
+                )
 
-        # Execute query
-        docs = query.stream()
+        # Fetch one extra document to know whether there is a next page
+        docs = [doc async for doc in query.limit(limit + 1).stream()]
+        has_more = len(docs) > limit
+        docs = docs[:limit]
 
         sessions = []
         for doc in docs:
@@ -256,6 +268,14 @@ async def list_sessions(
                 mentor_feedback_submitted=data.get("mentor_feedback_submitted", False),
             ))
 
+        next_cursor = None
+        if has_more:
+            last = docs[-1]
+            next_cursor = encode_cursor({
+                "created_at": last.get("created_at"),
+                "__name__": last.id,
+            })
+
         # Track analytics
         track_event(
             user_id=current_user.uid,
@@ -264,14 +284,18 @@ async def list_sessions(
                 "role": current_user.role,
                 "status_filter": status,
                 "result_count": len(sessions),
+                "is_first_page": cursor is None,
             },
         )
 
         return SessionListResponse(
             sessions=sessions,
             total=len(sessions),
+            next_cursor=next_cursor,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -289,8 +313,8 @@ async def get_session(
     Users can only access their own sessions.
     """
     try:
-        doc_ref = db.collection("sessions").document(session_id)
-        doc = doc_ref.get()
+        doc_ref = async_db.collection("sessions").document(session_id)
+        doc = await doc_ref.get()
 
         if not doc.exists:
             raise HTTPException(
@@ -360,8 +384,8 @@ async def update_session_status(
     Both students and mentors can update status.
     """
     try:
-        doc_ref = db.collection("sessions").document(session_id)
-        doc = doc_ref.get()
+        doc_ref = async_db.collection("sessions").document(session_id)
+        doc = await doc_ref.get()
 
         if not doc.exists:
             raise HTTPException(
@@ -388,13 +412,23 @@ async def update_session_status(
                 detail="Sessões concluídas não podem voltar para pendente",
             )
 
-        # Update status and timestamp
+        # Update status and timestamp, with the mentor's session counters.
+        # The precondition keeps a concurrent change from being counted twice.
         now = datetime.utcnow()
         update_data = {
             "status": status_update.status,
             "updated_at": now,
         }
-        doc_ref.update(update_data)
+        batch = async_db.batch()
+        batch.update(doc_ref, update_data, option=async_db.write_option(last_update_time=doc.update_time))
+        add_status_change_counter_updates(batch, data.get("mentor_id"), data["status"], status_update.status)
+        try:
+            await batch.commit()
+        except FailedPrecondition:
+            raise HTTPException(
+                status_code=409,
+                detail="Session was updated concurrently, please retry",
+            )
 
         # Track analytics
         track_event(
@@ -451,8 +485,8 @@ async def resend_session_email(
     Only students can resend emails.
     """
     try:
-        doc_ref = db.collection("sessions").document(session_id)
-        doc = doc_ref.get()
+        doc_ref = async_db.collection("sessions").document(session_id)
+        doc = await doc_ref.get()
 
         if not doc.exists:
             raise HTTPException(
@@ -469,21 +503,27 @@ async def resend_session_email(
                 detail="Only the student who created this session can resend emails",
             )
 
-        # Update message in Firestore
+        # Update message in Firestore and queue the email to the mentor
         now = datetime.utcnow()
-        doc_ref.update({
+        batch = async_db.batch()
+        batch.update(doc_ref, {
             "message": resend_data.message,
             "updated_at": now,
         })
-
-        # Resend email to mentor
-        email_result = email_service.send_session_request_to_mentor(
-            mentor_name=data["mentor_name"],
-            mentor_email=data["mentor_email"],
-            student_name=current_user.displayName,
-            student_email=current_user.email,
-            message=resend_data.message,
+        add_email_to_batch(
+            batch,
+            "send_session_request_to_mentor",
+            {
+                "mentor_name": data["mentor_name"],
+                "mentor_email": data["mentor_email"],
+                "student_name": current_user.displayName,
+                "student_email": current_user.email,
+                "message": resend_data.message,
+            },
+            on_sent={"path": doc_ref.path, "field": "mentor_email_sent"},
         )
+        await batch.commit()
+        email_outbox_worker.wake()
 
         # Track analytics
         track_event(
@@ -492,13 +532,12 @@ async def resend_session_email(
             properties={
                 "session_id": session_id,
                 "mentor_email": data["mentor_email"],
-                "email_sent": email_result.get("success", False),
             },
         )
 
         return {
-            "success": email_result.get("success", False),
-            "message": "Email reenviado com sucesso" if email_result.get("success") else "Falha ao reenviar email",
+            "success": True,
+            "message": "Email reenviado com sucesso",
         }
 
     except HTTPException:
@@ -521,8 +560,8 @@ async def submit_session_feedback(
     Both students and mentors can submit feedback individually.
     """
     try:
-        doc_ref = db.collection("sessions").document(session_id)
-        doc = doc_ref.get()
+        doc_ref = async_db.collection("sessions").document(session_id)
+        doc = await doc_ref.get()
 
         if not doc.exists:
             raise HTTPException(
@@ -549,7 +588,7 @@ async def submit_session_feedback(
                 detail="Rating must be between 1 and 5",
             )
 
-        # Store feedback in session_feedback collection
+        # Feedback document for the session_feedback collection
         now = datetime.utcnow()
         feedback_doc = {
             "session_id": session_id,
@@ -561,15 +600,17 @@ async def submit_session_feedback(
             "created_at": now,
         }
 
-        feedback_ref = db.collection("session_feedback")
-        feedback_ref.add(feedback_doc)
-
-        # Update feedback submitted flag in session document
+        # Store the feedback, set the submitted flag in the session document
+        # and update the mentor's rating aggregate in one write
         feedback_field = "student_feedback_submitted" if is_student else "mentor_feedback_submitted"
-        doc_ref.update({
+        batch = async_db.batch()
+        batch.set(async_db.collection("session_feedback").document(), feedback_doc)
+        batch.update(doc_ref, {
             feedback_field: True,
             "updated_at": now,
         })
+        add_feedback_to_ratings(batch, data.get("mentor_id"), "student" if is_student else "mentor", feedback.rating)
+        await batch.commit()
 
         # Track analytics
         track_event(
@@ -613,8 +654,8 @@ async def complete_session_with_feedback(
     - Sends email notification to the other party prompting feedback
     """
     try:
-        doc_ref = db.collection("sessions").document(session_id)
-        doc = doc_ref.get()
+        doc_ref = async_db.collection("sessions").document(session_id)
+        doc = await doc_ref.get()
 
         if not doc.exists:
             raise HTTPException(
@@ -653,9 +694,6 @@ async def complete_session_with_feedback(
             "created_at": now,
         }
 
-        feedback_ref = db.collection("session_feedback")
-        feedback_ref.add(feedback_doc)
-
         # Determine which feedback flag to set
         feedback_field = "student_feedback_submitted" if is_student else "mentor_feedback_submitted"
 
@@ -667,50 +705,63 @@ async def complete_session_with_feedback(
             "completed_by": "student" if is_student else "mentor",
             "completed_at": now,
         }
-        doc_ref.update(update_data)
 
-        # Send email notification to the OTHER party
+        # The precondition keeps two concurrent completions from both applying
+        batch = async_db.batch()
+        batch.set(async_db.collection("session_feedback").document(), feedback_doc)
+        batch.update(doc_ref, update_data, option=async_db.write_option(last_update_time=doc.update_time))
+        add_status_change_counter_updates(batch, session_data.get("mentor_id"), "pending", "completed")
+        add_feedback_to_ratings(
+            batch, session_data.get("mentor_id"), "student" if is_student else "mentor", data.rating
+        )
+
+        # Queue email notification to the OTHER party
         feedback_url = f"{settings.FRONTEND_URL}/minhas-sessoes"
 
         if is_student:
             # Student completed - notify mentor
-            email_result = email_service.send_completion_feedback_request_to_mentor(
-                mentor_name=session_data["mentor_name"],
-                mentor_email=session_data["mentor_email"],
-                student_name=session_data["student_name"],
-                feedback_url=feedback_url,
-            )
+            template = "send_completion_feedback_request_to_mentor"
+            email_params = {
+                "mentor_name": session_data["mentor_name"],
+                "mentor_email": session_data["mentor_email"],
+                "student_name": session_data["student_name"],
+                "feedback_url": feedback_url,
+            }
             email_recipient = "mentor"
         else:
             # Mentor completed - notify student
-            email_result = email_service.send_completion_feedback_request_to_student(
-                student_name=session_data["student_name"],
-                student_email=session_data["student_email"],
-                mentor_name=session_data["mentor_name"],
-                feedback_url=feedback_url,
-            )
+            template = "send_completion_feedback_request_to_student"
+            email_params = {
+                "student_name": session_data["student_name"],
+                "student_email": session_data["student_email"],
+                "mentor_name": session_data["mentor_name"],
+                "feedback_url": feedback_url,
+            }
             email_recipient = "student"
 
-        # Track email result
-        if email_result.get("success", False):
-            track_event(
-                user_id=current_user.uid,
-                event_name=Events.EMAIL_FEEDBACK_PROMPT_SENT,
-                properties={
-                    "session_id": session_id,
-                    "recipient": email_recipient,
-                },
-            )
-        else:
-            track_event(
-                user_id=current_user.uid,
-                event_name=Events.EMAIL_FEEDBACK_PROMPT_FAILED,
-                properties={
+        add_email_to_batch(
+            batch,
+            template,
+            email_params,
+            key=f"session_{session_id}_completion_{email_recipient}",
+            analytics={
+                "user_id": current_user.uid,
+                "sent_event": Events.EMAIL_FEEDBACK_PROMPT_SENT,
+                "failed_event": Events.EMAIL_FEEDBACK_PROMPT_FAILED,
+                "properties": {
                     "session_id": session_id,
                     "recipient": email_recipient,
-                    "error": email_result.get("error", "Unknown error"),
                 },
+            },
+        )
+        try:
+            await batch.commit()
+        except FailedPrecondition:
+            raise HTTPException(
+                status_code=409,
+                detail="Session was updated concurrently, please retry",
             )
+        email_outbox_worker.wake()
 
         # Track session completion
         track_event(
@@ -5,7 +5,9 @@ from google.cloud.firestore import SERVER_TIMESTAMP
 
 from ..deps import get_current_user
 from ...models.user import UserInDB, UserResponse, UserUpdate
-from ...core.firebase import db
+from ...core.firebase import async_db
+from ...core.pagination import sort_name
+from ...core.user_cache import user_cache
 from ...core.analytics import track_event, Events
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -49,15 +51,20 @@ async def update_current_user_profile(
             if value is not None:
                 update_data[f"profile.{key}"] = value
 
+    # Keep the stored sort key in sync with the name
+    if "displayName" in update_data:
+        update_data["displayNameLower"] = sort_name(update_data["displayName"])
+
     # Add timestamp
     update_data["updatedAt"] = SERVER_TIMESTAMP
 
     # Update in Firestore
-    user_ref = db.collection("users").document(current_user.uid)
-    user_ref.update(update_data)
+    user_ref = async_db.collection("users").document(current_user.uid)
+    await user_ref.update(update_data)
+    user_cache.invalidate(current_user.uid)
 
     # Fetch updated user
-    updated_doc = user_ref.get()
+    updated_doc = await user_ref.get()
     updated_data = updated_doc.to_dict()
 
     # Track analytics
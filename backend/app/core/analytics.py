@@ -2,9 +2,19 @@
 Mixpanel Analytics Module for Centro de Carreiras API.
 
 Provides server-side event tracking for API endpoints.
+
+Events are not sent from the request handler: `track_event` only serializes
+the message and puts it on a bounded in-process queue. A background thread
+drains the queue and posts messages to Mixpanel in batches, so analytics
+latency never shows up in API response times. When the queue is full new
+messages are dropped (and counted) rather than blocking the caller.
 """
 
+import atexit
 import logging
+import queue
+import threading
+import time
 from datetime import datetime
 from typing import Any, Optional
 
@@ -14,12 +24,21 @@ logger = logging.getLogger(__name__)
 
 # Try to import mixpanel, gracefully handle if not available
 try:
-    from mixpanel import Mixpanel
+    from mixpanel import Consumer, Mixpanel
     MIXPANEL_AVAILABLE = True
 except ImportError:
     MIXPANEL_AVAILABLE = False
     logger.warning("Mixpanel package not installed. Analytics will be disabled.")
 
+# Messages waiting to be sent; new messages are dropped once this is reached
+ANALYTICS_QUEUE_MAX_SIZE = 10000
+
+# Messages per Mixpanel request (the API accepts at most 50)
+ANALYTICS_BATCH_SIZE = 50
+
+# Longest a message waits in the queue before its batch is sent, in seconds
+ANALYTICS_FLUSH_INTERVAL_SECONDS = 2.0
+
 
 # Event name constants
 class Events:
@@ -40,6 +59,7 @@ class Events:
     # ============================================
     MENTORS_FETCHED = "API: Mentors Fetched"
     MENTOR_DETAIL_FETCHED = "API: Mentor Detail Fetched"
+    MENTORS_SEARCHED = "API: Mentors Searched"
     MENTOR_PROFILE_VIEWED = "API: Mentor Profile Viewed"
     MENTOR_PROFILE_UPDATED = "API: Mentor Profile Updated"
     MENTOR_PHOTO_UPLOADED = "API: Mentor Photo Uploaded"
@@ -87,12 +107,134 @@ class Events:
     AUTH_USER_STATUS_BLOCKED = "API: Auth User Status Blocked"
 
 
+class AnalyticsPipeline:
+    """
+    Bounded queue of serialized Mixpanel messages and the thread that sends them.
+
+    Implements the Mixpanel consumer interface (`send(endpoint, message)`), so
+    a `Mixpanel` client built with it enqueues instead of posting.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        max_size: int = ANALYTICS_QUEUE_MAX_SIZE,
+        batch_size: int = ANALYTICS_BATCH_SIZE,
+        flush_interval: float = ANALYTICS_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._buffers: dict[str, list[str]] = {}
+        self._sender = None
+        self._thread: Optional[threading.Thread] = None
+        # Counters are updated from request threads and the flusher thread
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+
+    def start(self, sender) -> None:
+        """Start the background flusher. `sender` posts a batch to an endpoint."""
+        self._sender = sender
+        self._thread = threading.Thread(target=self._run, name="analytics-flusher", daemon=True)
+        self._thread.start()
+
+    def send(self, endpoint: str, json_message: str, api_key=None, api_secret=None) -> None:
+        """Consumer interface used by `Mixpanel`; never blocks."""
+        try:
+            self._queue.put_nowait((endpoint, json_message))
+            with self._lock:
+                self.enqueued += 1
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(
+                    "Analytics queue full, dropping events",
+                    extra={"extra_fields": {"dropped": dropped}},
+                )
+
+    def _run(self) -> None:
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, next_flush - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._flush()
+                return
+
+            if item is not None:
+                endpoint, message = item
+                buffer = self._buffers.setdefault(endpoint, [])
+                buffer.append(message)
+                if len(buffer) >= self.batch_size:
+                    self._flush_endpoint(endpoint)
+
+            if time.monotonic() >= next_flush:
+                self._flush()
+                next_flush = time.monotonic() + self.flush_interval
+
+    def _flush(self) -> None:
+        for endpoint in list(self._buffers):
+            self._flush_endpoint(endpoint)
+
+    def _flush_endpoint(self, endpoint: str) -> None:
+        messages = self._buffers.pop(endpoint, [])
+        for i in range(0, len(messages), self.batch_size):
+            batch = messages[i:i + self.batch_size]
+            try:
+                self._sender(endpoint, "[" + ",".join(batch) + "]")
+                with self._lock:
+                    self.sent += len(batch)
+                    self.batches += 1
+            except Exception as e:
+                # Failed batches are dropped; analytics must not back up the queue
+                with self._lock:
+                    self.failed += len(batch)
+                logger.error(f"Failed to send {len(batch)} analytics messages to {endpoint}: {e}")
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Send everything still queued and stop the flusher."""
+        if not self._thread or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Analytics queue full at shutdown; pending events may be lost")
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        """Queue depth and delivery counters for logging and the health check."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "sent": self.sent,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+
 # Initialize Mixpanel client
 _mp: Optional[Any] = None
+_pipeline = AnalyticsPipeline()
 
 if MIXPANEL_AVAILABLE and settings.MIXPANEL_TOKEN:
     try:
-        _mp = Mixpanel(settings.MIXPANEL_TOKEN)
+        _mp = Mixpanel(settings.MIXPANEL_TOKEN, consumer=_pipeline)
+        _pipeline.start(Consumer().send)
+        atexit.register(_pipeline.shutdown)
         logger.info("Mixpanel analytics initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize Mixpanel: {e}")
@@ -111,6 +253,9 @@ def track_event(
     """
     Track an event in Mixpanel.
 
+    The event is queued and sent in the background; this never waits on
+    the network.
+
     Args:
         user_id: The user's unique identifier (Firebase UID)
         event_name: Name of the event (use Events constants)
@@ -157,6 +302,16 @@ def set_user_properties(
         logger.error(f"Failed to set user properties: {e}")
 
 
+def flush_analytics(timeout: float = 5.0) -> None:
+    """Send queued events and stop the background flusher (call on shutdown)."""
+    _pipeline.shutdown(timeout)
+
+
+def analytics_stats() -> dict:
+    """Queue depth and delivery counters of the analytics pipeline."""
+    return {"enabled": _mp is not None, **_pipeline.stats()}
+
+
 # Convenience instance for importing
 analytics = {
     "track": track_event,
@@ -16,6 +16,24 @@ class Settings(BaseSettings):
     FIREBASE_PROJECT_ID: str = ""
     FIREBASE_SERVICE_ACCOUNT_PATH: str = "firebase-service-account.json"
 
+    # Cache of parsed user profiles used by get_current_user. The TTL is the
+    # longest a status change made outside the API can go unnoticed.
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 2048
+
+    # In-process mentor catalog served by GET /mentors. Writes through the API
+    # invalidate it; the TTL bounds how stale other instances can be.
+    MENTOR_CATALOG_TTL_SECONDS: int = 60
+    # Keep the catalog live with a Firestore snapshot listener on each
+    # instance. Needs CPU outside requests (Cloud Run: CPU always allocated).
+    MENTOR_CATALOG_LISTENER: bool = False
+
+    # Admin export jobs. "firebase" writes to the Storage bucket; "local"
+    # writes to EXPORT_LOCAL_DIR (development and tests).
+    EXPORT_STORAGE_BACKEND: str = "firebase"
+    EXPORT_LOCAL_DIR: str = "exports"
+    EXPORT_DOWNLOAD_URL_MINUTES: int = 15
+
     # Mixpanel Analytics
     MIXPANEL_TOKEN: str = ""
 
@@ -24,6 +42,11 @@ class Settings(BaseSettings):
     EMAIL_FROM_ADDRESS: str = "Centro de Carreiras <noreply@patronos.org>"
     EMAIL_ADMIN_CC: str = "contato@patronos.org"
     EMAIL_ADMIN_BCC: str = "gabriel.aquino@patronos.org"
+    # Resend allows 2 API requests per second per team by default
+    RESEND_RATE_LIMIT_PER_SECOND: float = 2.0
+
+    # Sessions prepared concurrently by the daily feedback job
+    FEEDBACK_PROCESS_CONCURRENCY: int = 10
 
     class Config:
         env_file = ".env"
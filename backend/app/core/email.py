@@ -7,6 +7,8 @@ Provides email sending functionality using Resend.
 import logging
 from typing import Literal, Optional
 from .config import settings
+from .email_templates import approval_role_content, mentor_info, render, role_badge
+from .rate_limit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,21 @@ except ImportError:
     RESEND_AVAILABLE = False
     logger.warning("Resend package not installed. Email sending will be disabled.")
 
+# Maximum number of emails Resend accepts in one batch request
+RESEND_BATCH_MAX_SIZE = 100
+
+# Resend status codes that a retry won't fix (malformed message or invalid
+# recipient). Rate limits, auth errors, 5xx and network errors are transient.
+PERMANENT_EMAIL_ERROR_CODES = frozenset({400, 422})
+
+
+def is_permanent_email_error(error: Exception) -> bool:
+    """Whether a send error will fail again on retry."""
+    try:
+        return int(getattr(error, "code", None)) in PERMANENT_EMAIL_ERROR_CODES
+    except (TypeError, ValueError):
+        return False
+
 
 class EmailService:
     """Email service using Resend."""
@@ -53,35 +70,85 @@ class EmailService:
             reply_to: Optional reply-to address
 
         Returns:
-            dict with 'success' and 'id' or 'error'
+            dict with 'success' and 'id', or 'error' and 'permanent' (see
+            `is_permanent_email_error`)
         """
         if not self.enabled:
             logger.warning("Email service not enabled. Skipping email send.")
             return {"success": False, "error": "Email service not configured"}
 
         try:
-            params = {
-                "from": settings.EMAIL_FROM_ADDRESS,
-                "to": to,
-                "subject": subject,
-                "html": html,
-            }
-
-            if cc:
-                params["cc"] = cc
-
-            if bcc:
-                params["bcc"] = bcc
-
-            if reply_to:
-                params["reply_to"] = reply_to
-
+            params = self._build_params(to, subject, html, cc, bcc, reply_to)
             response = resend.Emails.send(params)
             logger.info(f"Email sent successfully to {to}")
             return {"success": True, "id": response.get("id")}
         except Exception as e:
             logger.error(f"Failed to send email: {e}")
-            return {"success": False, "error": str(e)}
+            return {"success": False, "error": str(e), "permanent": is_permanent_email_error(e)}
+
+    def send_batch(self, messages: list[dict]) -> list[dict]:
+        """
+        Send up to RESEND_BATCH_MAX_SIZE emails in a single Resend API call.
+
+        Args:
+            messages: List of dicts with the keyword arguments of `send_email`
+                (as returned by the `build_*` methods)
+
+        Returns:
+            One dict with 'success' and 'id', or 'error' and 'permanent', per
+            message, in order. The batch endpoint is all-or-nothing, so on
+            error every message reports the same failure.
+        """
+        if not messages:
+            return []
+
+        if len(messages) > RESEND_BATCH_MAX_SIZE:
+            raise ValueError(f"Batch too large: {len(messages)} > {RESEND_BATCH_MAX_SIZE}")
+
+        if not self.enabled:
+            logger.warning("Email service not enabled. Skipping batch send.")
+            return [{"success": False, "error": "Email service not configured"}] * len(messages)
+
+        try:
+            response = resend.Batch.send([self._build_params(**message) for message in messages])
+            # The API wraps the ids in {"data": [...]}
+            sent = response.get("data", []) if isinstance(response, dict) else response
+            logger.info(f"Batch of {len(messages)} emails sent successfully")
+            return [
+                {"success": True, "id": sent[i].get("id") if i < len(sent) else None}
+                for i in range(len(messages))
+            ]
+        except Exception as e:
+            logger.error(f"Failed to send batch of {len(messages)} emails: {e}")
+            failure = {"success": False, "error": str(e), "permanent": is_permanent_email_error(e)}
+            return [failure] * len(messages)
+
+    @staticmethod
+    def _build_params(
+        to: list[str],
+        subject: str,
+        html: str,
+        cc: Optional[list[str]] = None,
+        bcc: Optional[list[str]] = None,
+        reply_to: Optional[str] = None,
+    ) -> dict:
+        params = {
+            "from": settings.EMAIL_FROM_ADDRESS,
+            "to": to,
+            "subject": subject,
+            "html": html,
+        }
+
+        if cc:
+            params["cc"] = cc
+
+        if bcc:
+            params["bcc"] = bcc
+
+        if reply_to:
+            params["reply_to"] = reply_to
+
+        return params
 
     def send_session_request_to_mentor(
         self,
@@ -106,54 +173,13 @@ class EmailService:
         """
         subject = f"Centro de Carreiras - Nova solicitação de mentoria de {student_name}"
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {mentor_name}!</h2>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Você recebeu uma nova solicitação de mentoria de um estudante da Unicamp.
-            </p>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 20px; margin: 24px 0;">
-                <p style="color: #6a6a6a; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin: 0 0 8px 0;">Estudante</p>
-                <p style="color: #1a1a1a; font-weight: 600; margin: 0 0 4px 0; font-size: 16px;">{student_name}</p>
-                <p style="color: #4a4a4a; margin: 0;">
-                    <a href="mailto:{student_email}" style="color: #9B5DE5; text-decoration: none;">{student_email}</a>
-                </p>
-            </div>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 20px; margin: 24px 0;">
-                <p style="color: #6a6a6a; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin: 0 0 12px 0;">Mensagem</p>
-                <p style="color: #1a1a1a; line-height: 1.7; margin: 0; white-space: pre-line;">{message}</p>
-            </div>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 24px 0 0 0;">
-                Responda diretamente a este email para entrar em contato com {student_name} e agendar sua sessão de mentoria.
-            </p>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        html = render(
+            "session_request_to_mentor",
+            mentor_name=mentor_name,
+            student_name=student_name,
+            student_email=student_email,
+            message=message,
+        )
 
         return self.send_email(
             to=[mentor_email],
@@ -187,54 +213,14 @@ class EmailService:
         """
         subject = f"Centro de Carreiras - Solicitação enviada para {mentor_name}"
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {student_name}!</h2>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Sua solicitação de mentoria foi enviada com sucesso! O mentor receberá seu email e entrará em contato em breve.
-            </p>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 20px; margin: 24px 0;">
-                <p style="color: #6a6a6a; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin: 0 0 8px 0;">Mentor</p>
-                <p style="color: #1a1a1a; font-weight: 600; margin: 0 0 4px 0; font-size: 16px;">{mentor_name}</p>
-                <p style="color: #4a4a4a; margin: 0;">{mentor_company}</p>
-            </div>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 20px; margin: 24px 0;">
-                <p style="color: #6a6a6a; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin: 0 0 12px 0;">Sua mensagem</p>
-                <p style="color: #1a1a1a; line-height: 1.7; margin: 0; white-space: pre-line;">{message}</p>
-            </div>
-
-            <div style="background: linear-gradient(135deg, rgba(255,107,53,0.1) 0%, rgba(155,93,229,0.1) 100%); border-radius: 12px; padding: 16px; margin: 24px 0;">
-                <p style="color: #4a4a4a; font-size: 14px; margin: 0; line-height: 1.6;">
-                    <strong>Dica:</strong> Fique atento ao seu email! O mentor responderá diretamente para <strong>{student_email}</strong>.
-                </p>
-            </div>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        html = render(
+            "session_confirmation_to_student",
+            student_name=student_name,
+            student_email=student_email,
+            mentor_name=mentor_name,
+            mentor_company=mentor_company,
+            message=message,
+        )
 
         return self.send_email(
             to=[student_email],
@@ -263,56 +249,11 @@ class EmailService:
         """
         subject = "Centro de Carreiras - Verifique seu email"
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {user_name}!</h2>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Obrigado por se cadastrar no Centro de Carreiras. Para ativar sua conta, clique no botão abaixo para verificar seu email.
-            </p>
-
-            <div style="text-align: center; margin: 32px 0;">
-                <a href="{verification_url}" style="display: inline-block; background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                    Verificar Email
-                </a>
-            </div>
-
-            <p style="color: #6a6a6a; line-height: 1.6; margin: 24px 0 0 0; font-size: 14px;">
-                Se você não conseguir clicar no botão, copie e cole o link abaixo no seu navegador:
-            </p>
-            <p style="color: #9B5DE5; line-height: 1.6; margin: 8px 0 0 0; font-size: 13px; word-break: break-all;">
-                {verification_url}
-            </p>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 16px; margin: 24px 0 0 0;">
-                <p style="color: #6a6a6a; font-size: 13px; margin: 0; line-height: 1.6;">
-                    <strong>Importante:</strong> Este link expira em 24 horas. Se você não solicitou esta verificação, pode ignorar este email com segurança.
-                </p>
-            </div>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        html = render(
+            "verification_email",
+            user_name=user_name,
+            verification_url=verification_url,
+        )
 
         return self.send_email(
             to=[user_email],
@@ -339,62 +280,29 @@ class EmailService:
         Returns:
             dict with 'success' and 'id' or 'error'
         """
-        subject = f"Centro de Carreiras - Como foi sua mentoria com {mentor_name}?"
+        return self.send_email(**self.build_feedback_request_to_student(
+            student_name, student_email, mentor_name, feedback_url
+        ))
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {student_name}!</h2>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Há alguns dias você solicitou uma mentoria com <strong>{mentor_name}</strong>. Gostaríamos de saber como foi sua experiência!
-            </p>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 24px 0;">
-                Seu feedback é muito importante para melhorarmos o programa de mentorias do Centro de Carreiras.
-            </p>
-
-            <div style="text-align: center; margin: 32px 0;">
-                <a href="{feedback_url}" style="display: inline-block; background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                    Responder Feedback
-                </a>
-            </div>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 16px; margin: 24px 0 0 0;">
-                <p style="color: #6a6a6a; font-size: 13px; margin: 0; line-height: 1.6;">
-                    O formulário leva menos de 1 minuto para responder e suas respostas são confidenciais - apenas a equipe Patronos terá acesso.
-                </p>
-            </div>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    def build_feedback_request_to_student(
+        self,
+        student_name: str,
+        student_email: str,
+        mentor_name: str,
+        feedback_url: str,
+    ) -> dict:
+        """Build the student feedback request email without sending it (see `send_batch`)."""
+        subject = f"Centro de Carreiras - Como foi sua mentoria com {mentor_name}?"
 
-        return self.send_email(
-            to=[student_email],
-            subject=subject,
-            html=html,
+        html = render(
+            "feedback_request_to_student",
+            student_name=student_name,
+            mentor_name=mentor_name,
+            feedback_url=feedback_url,
         )
 
+        return {"to": [student_email], "subject": subject, "html": html}
+
     def send_welcome_import_email(
         self,
         user_name: str,
@@ -418,64 +326,11 @@ class EmailService:
         """
         subject = "Centro de Carreiras - Bem-vindo! Configure sua senha"
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {user_name}!</h2>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                O <strong>Centro de Carreiras</strong> foi atualizado! Estamos com uma nova plataforma, mais moderna e com novos recursos para conectar você a mentores incríveis.
-            </p>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Sua conta foi migrada automaticamente. Para acessar a nova plataforma, você precisa configurar uma nova senha clicando no botão abaixo:
-            </p>
-
-            <div style="text-align: center; margin: 32px 0;">
-                <a href="{password_reset_url}" style="display: inline-block; background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                    Configurar Senha
-                </a>
-            </div>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 20px; margin: 24px 0;">
-                <p style="color: #6a6a6a; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin: 0 0 12px 0;">O que há de novo?</p>
-                <ul style="color: #4a4a4a; line-height: 1.8; margin: 0; padding-left: 20px;">
-                    <li>Interface completamente redesenhada</li>
-                    <li>Novos perfis de mentores</li>
-                    <li>Sistema de agendamento simplificado</li>
-                    <li>Melhor experiência em dispositivos móveis</li>
-                </ul>
-            </div>
-
-            <p style="color: #6a6a6a; line-height: 1.6; margin: 24px 0 0 0; font-size: 14px;">
-                Se você não conseguir clicar no botão, copie e cole o link abaixo no seu navegador:
-            </p>
-            <p style="color: #9B5DE5; line-height: 1.6; margin: 8px 0 0 0; font-size: 13px; word-break: break-all;">
-                {password_reset_url}
-            </p>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        html = render(
+            "welcome_import_email",
+            user_name=user_name,
+            password_reset_url=password_reset_url,
+        )
 
         return self.send_email(
             to=[user_email],
@@ -504,62 +359,29 @@ class EmailService:
         Returns:
             dict with 'success' and 'id' or 'error'
         """
-        subject = f"Centro de Carreiras - Como foi sua mentoria com {student_name}?"
+        return self.send_email(**self.build_feedback_request_to_mentor(
+            mentor_name, mentor_email, student_name, feedback_url
+        ))
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {mentor_name}!</h2>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Há alguns dias você recebeu uma solicitação de mentoria de <strong>{student_name}</strong>. Gostaríamos de saber como foi!
-            </p>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 24px 0;">
-                Seu feedback é muito importante para acompanharmos o progresso do programa e apoiar nossos estudantes.
-            </p>
-
-            <div style="text-align: center; margin: 32px 0;">
-                <a href="{feedback_url}" style="display: inline-block; background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                    Responder Feedback
-                </a>
-            </div>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 16px; margin: 24px 0 0 0;">
-                <p style="color: #6a6a6a; font-size: 13px; margin: 0; line-height: 1.6;">
-                    O formulário leva menos de 1 minuto para responder e suas respostas são confidenciais - apenas a equipe Patronos terá acesso.
-                </p>
-            </div>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    def build_feedback_request_to_mentor(
+        self,
+        mentor_name: str,
+        mentor_email: str,
+        student_name: str,
+        feedback_url: str,
+    ) -> dict:
+        """Build the mentor feedback request email without sending it (see `send_batch`)."""
+        subject = f"Centro de Carreiras - Como foi sua mentoria com {student_name}?"
 
-        return self.send_email(
-            to=[mentor_email],
-            subject=subject,
-            html=html,
+        html = render(
+            "feedback_request_to_mentor",
+            mentor_name=mentor_name,
+            student_name=student_name,
+            feedback_url=feedback_url,
         )
 
+        return {"to": [mentor_email], "subject": subject, "html": html}
+
     def send_password_reset_email(
         self,
         user_name: str,
@@ -579,56 +401,11 @@ class EmailService:
         """
         subject = "Fundo Patronos - Redefina sua senha do Centro de Carreiras"
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {user_name}!</h2>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Você solicitou a redefinição de senha da sua conta no Centro de Carreiras. Clique no botão abaixo para criar uma nova senha:
-            </p>
-
-            <div style="text-align: center; margin: 32px 0;">
-                <a href="{reset_url}" style="display: inline-block; background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                    Redefinir Senha
-                </a>
-            </div>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 16px; margin: 24px 0;">
-                <p style="color: #6a6a6a; font-size: 13px; margin: 0; line-height: 1.6;">
-                    <strong>Importante:</strong> Este link expira em 1 hora. Se você não solicitou esta redefinição, pode ignorar este email com segurança - sua senha permanecerá inalterada.
-                </p>
-            </div>
-
-            <p style="color: #6a6a6a; line-height: 1.6; margin: 24px 0 0 0; font-size: 14px;">
-                Se você não conseguir clicar no botão, copie e cole o link abaixo no seu navegador:
-            </p>
-            <p style="color: #9B5DE5; line-height: 1.6; margin: 8px 0 0 0; font-size: 13px; word-break: break-all;">
-                {reset_url}
-            </p>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        html = render(
+            "password_reset_email",
+            user_name=user_name,
+            reset_url=reset_url,
+        )
 
         return self.send_email(
             to=[user_email],
@@ -657,96 +434,13 @@ class EmailService:
         """
         subject = "Centro de Carreiras - Sua conta foi aprovada!"
 
-        # Role-specific content
-        if role == "estudante":
-            role_message = "Como estudante, você agora pode explorar mentores, agendar sessões de mentoria e acessar recursos de carreira exclusivos."
-            features = [
-                "Explorar perfis de mentores experientes",
-                "Solicitar sessões de mentoria",
-                "Acessar recursos de desenvolvimento de carreira",
-            ]
-            extra_message = ""
-        else:  # mentor
-            role_message = "Como mentor, você agora pode gerenciar seu perfil e receber solicitações de mentoria de estudantes da Unicamp."
-            features = [
-                "Completar seu perfil de mentor",
-                "Receber solicitações de mentoria de estudantes",
-                "Contribuir para o desenvolvimento de futuros profissionais",
-            ]
-            extra_message = """
-            <div style="background: #FFF3E0; border-left: 4px solid #FF6B35; border-radius: 8px; padding: 16px; margin: 24px 0;">
-                <p style="color: #1a1a1a; font-weight: 600; margin: 0 0 8px 0;">Próximo passo importante</p>
-                <p style="color: #4a4a4a; font-size: 14px; margin: 0; line-height: 1.6;">
-                    Para aparecer na lista de mentores e receber solicitações de estudantes, complete seu perfil com sua biografia, áreas de expertise e foto. Acesse "Meu Perfil" no menu lateral após fazer login.
-                </p>
-            </div>
-            """
-
-        features_html = "".join(
-            f'<li style="color: #4a4a4a; margin: 8px 0;">{feature}</li>'
-            for feature in features
+        html = render(
+            "approval_confirmation_email",
+            user_name=user_name,
+            role_content=approval_role_content(role),
+            login_url=login_url,
         )
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {user_name}!</h2>
-
-            <div style="background: linear-gradient(135deg, rgba(255,107,53,0.1) 0%, rgba(155,93,229,0.1) 100%); border-radius: 12px; padding: 20px; margin: 0 0 24px 0; text-align: center;">
-                <p style="color: #1a1a1a; font-size: 18px; font-weight: 600; margin: 0;">
-                    🎉 Parabéns! Sua conta foi aprovada
-                </p>
-            </div>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                {role_message}
-            </p>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 20px; margin: 24px 0;">
-                <p style="color: #6a6a6a; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin: 0 0 12px 0;">O que você pode fazer agora</p>
-                <ul style="margin: 0; padding-left: 20px; line-height: 1.8;">
-                    {features_html}
-                </ul>
-            </div>
-
-            {extra_message}
-
-            <div style="text-align: center; margin: 32px 0;">
-                <a href="{login_url}" style="display: inline-block; background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                    Acessar o Centro de Carreiras
-                </a>
-            </div>
-
-            <p style="color: #6a6a6a; line-height: 1.6; margin: 24px 0 0 0; font-size: 14px;">
-                Se você não conseguir clicar no botão, copie e cole o link abaixo no seu navegador:
-            </p>
-            <p style="color: #9B5DE5; line-height: 1.6; margin: 8px 0 0 0; font-size: 13px; word-break: break-all;">
-                {login_url}
-            </p>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-
         return self.send_email(
             to=[user_email],
             subject=subject,
@@ -776,55 +470,12 @@ class EmailService:
         """
         subject = f"Centro de Carreiras - {mentor_name} marcou a sessão como concluída"
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {student_name}!</h2>
-
-            <div style="background: linear-gradient(135deg, rgba(255,107,53,0.1) 0%, rgba(155,93,229,0.1) 100%); border-radius: 12px; padding: 20px; margin: 0 0 24px 0; text-align: center;">
-                <p style="color: #1a1a1a; font-size: 16px; font-weight: 600; margin: 0;">
-                    ✅ <strong>{mentor_name}</strong> marcou a sessão de mentoria como concluída
-                </p>
-            </div>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Por favor, avalie sua experiência com a sessão de mentoria. Seu feedback é muito importante para melhorarmos o programa!
-            </p>
-
-            <div style="text-align: center; margin: 32px 0;">
-                <a href="{feedback_url}" style="display: inline-block; background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                    Avaliar Sessão
-                </a>
-            </div>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 16px; margin: 24px 0 0 0;">
-                <p style="color: #6a6a6a; font-size: 13px; margin: 0; line-height: 1.6;">
-                    O formulário leva menos de 1 minuto para responder. Acesse sua conta no Centro de Carreiras para avaliar a sessão.
-                </p>
-            </div>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        html = render(
+            "completion_feedback_request_to_student",
+            student_name=student_name,
+            mentor_name=mentor_name,
+            feedback_url=feedback_url,
+        )
 
         return self.send_email(
             to=[student_email],
@@ -853,55 +504,12 @@ class EmailService:
         """
         subject = f"Centro de Carreiras - {student_name} marcou a sessão como concluída"
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {mentor_name}!</h2>
-
-            <div style="background: linear-gradient(135deg, rgba(255,107,53,0.1) 0%, rgba(155,93,229,0.1) 100%); border-radius: 12px; padding: 20px; margin: 0 0 24px 0; text-align: center;">
-                <p style="color: #1a1a1a; font-size: 16px; font-weight: 600; margin: 0;">
-                    ✅ O estudante <strong>{student_name}</strong> marcou a sessão de mentoria como concluída
-                </p>
-            </div>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Por favor, avalie sua experiência com a sessão de mentoria. Seu feedback é muito importante para acompanharmos o progresso do programa!
-            </p>
-
-            <div style="text-align: center; margin: 32px 0;">
-                <a href="{feedback_url}" style="display: inline-block; background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                    Avaliar Sessão
-                </a>
-            </div>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 16px; margin: 24px 0 0 0;">
-                <p style="color: #6a6a6a; font-size: 13px; margin: 0; line-height: 1.6;">
-                    O formulário leva menos de 1 minuto para responder. Acesse sua conta no Centro de Carreiras para avaliar a sessão.
-                </p>
-            </div>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        html = render(
+            "completion_feedback_request_to_mentor",
+            mentor_name=mentor_name,
+            student_name=student_name,
+            feedback_url=feedback_url,
+        )
 
         return self.send_email(
             to=[mentor_email],
@@ -936,79 +544,14 @@ class EmailService:
         role_display = "Estudante" if role == "estudante" else "Mentor"
         subject = f"Centro de Carreiras - Novo {role_display.lower()} aguardando aprovação"
 
-        # Build mentor info section if applicable
-        mentor_info = ""
-        if role == "mentor" and (company or title):
-            mentor_info = f"""
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 20px; margin: 16px 0;">
-                <p style="color: #6a6a6a; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin: 0 0 8px 0;">Informações Profissionais</p>
-                <p style="color: #1a1a1a; margin: 0;">
-                    {f'<strong>Cargo:</strong> {title}<br/>' if title else ''}
-                    {f'<strong>Empresa:</strong> {company}' if company else ''}
-                </p>
-            </div>
-            """
-
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
-    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
-        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
-            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
-        </div>
-
-        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <div style="background: #FFF3E0; border-left: 4px solid #FF6B35; border-radius: 8px; padding: 16px; margin: 0 0 24px 0;">
-                <p style="color: #1a1a1a; font-weight: 600; margin: 0;">
-                    🔔 Novo cadastro aguardando aprovação
-                </p>
-            </div>
-
-            <p style="color: #4a4a4a; line-height: 1.6; margin: 0 0 20px 0;">
-                Um novo usuário se cadastrou no Centro de Carreiras e precisa de aprovação manual.
-            </p>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 20px; margin: 16px 0;">
-                <p style="color: #6a6a6a; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin: 0 0 8px 0;">Novo Usuário</p>
-                <p style="color: #1a1a1a; font-weight: 600; margin: 0 0 4px 0; font-size: 16px;">{user_name}</p>
-                <p style="color: #4a4a4a; margin: 0 0 8px 0;">
-                    <a href="mailto:{user_email}" style="color: #9B5DE5; text-decoration: none;">{user_email}</a>
-                </p>
-                <span style="display: inline-block; background: {'#E3F2FD' if role == 'estudante' else '#E8F5E9'}; color: {'#1976D2' if role == 'estudante' else '#388E3C'}; padding: 4px 12px; border-radius: 12px; font-size: 13px; font-weight: 500;">
-                    {role_display}
-                </span>
-            </div>
-
-            {mentor_info}
-
-            <div style="text-align: center; margin: 32px 0;">
-                <a href="{admin_url}" style="display: inline-block; background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                    Revisar Cadastro
-                </a>
-            </div>
-
-            <div style="background: #f8f8f8; border-radius: 12px; padding: 16px; margin: 24px 0 0 0;">
-                <p style="color: #6a6a6a; font-size: 13px; margin: 0; line-height: 1.6;">
-                    Acesse o painel administrativo para aprovar ou rejeitar este cadastro.
-                </p>
-            </div>
-        </div>
-
-        <div style="text-align: center; padding: 24px 0;">
-            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
-                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        html = render(
+            "admin_pending_user_notification",
+            user_name=user_name,
+            user_email=user_email,
+            role_badge=role_badge(role),
+            mentor_info=mentor_info(title, company) if role == "mentor" else "",
+            admin_url=admin_url,
+        )
 
         # Send to all admin emails
         admin_emails = [
@@ -1026,3 +569,6 @@ class EmailService:
 
 # Singleton instance
 email_service = EmailService()
+
+# Shared by every caller of the Resend API in this process
+resend_rate_limiter = RateLimiter(settings.RESEND_RATE_LIMIT_PER_SECOND)
@@ -0,0 +1,438 @@
+"""
+HTML templates for the emails sent by EmailService.
+
+Every email shares one layout (gradient header, white card, footer) assembled
+from the partials below. Templates are compiled once at import time into
+alternating literal chunks and `{{ slot }}` names, so rendering an email only
+escapes the values and joins strings. Fragments that depend on a small set of
+inputs (e.g. the role-specific part of the approval email) are rendered once
+and cached.
+
+All values are HTML-escaped on render. Wrap already-rendered HTML in `Markup`
+to insert it as-is; never use it for user input.
+"""
+
+import html
+import re
+from functools import lru_cache
+from typing import Any, Literal, Optional
+
+
+class Markup(str):
+    """HTML that is already safe and must not be escaped again."""
+
+
+def escape(value: Any) -> Markup:
+    """Escape a value for use in HTML text or a quoted attribute."""
+    if isinstance(value, Markup):
+        return value
+    return Markup(html.escape("" if value is None else str(value), quote=True))
+
+
+_SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Template:
+    """A template compiled into literal chunks and slot names."""
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        parts = _SLOT_PATTERN.split(source)
+        self._literals = parts[0::2]
+        self._slots = parts[1::2]
+        self.slots = frozenset(self._slots)
+
+    def render(self, **values: Any) -> Markup:
+        missing = self.slots - values.keys()
+        if missing:
+            raise KeyError(f"Template {self.name} is missing values for: {', '.join(sorted(missing))}")
+
+        literals = self._literals
+        out = [literals[0]]
+        for slot, literal in zip(self._slots, literals[1:]):
+            out.append(escape(values[slot]))
+            out.append(literal)
+        return Markup("".join(out))
+
+
+# ============================================
+# LAYOUT PARTIALS
+# ============================================
+
+_GRADIENT = "linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%)"
+
+_LAYOUT = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f5f5;">
+    <div style="max-width: 600px; margin: 0 auto; padding: 40px 20px;">
+        <div style="background: linear-gradient(135deg, #FF6B35 0%, #9B5DE5 100%); padding: 30px; border-radius: 16px 16px 0 0; text-align: center;">
+            <h1 style="color: white; margin: 0; font-size: 24px; font-weight: 600;">Centro de Carreiras</h1>
+            <p style="color: rgba(255,255,255,0.9); margin: 8px 0 0 0; font-size: 14px;">Fundo Patronos da Unicamp</p>
+        </div>
+
+        <div style="background: white; padding: 32px; border-radius: 0 0 16px 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
+{content}
+        </div>
+
+        <div style="text-align: center; padding: 24px 0;">
+            <p style="color: #9a9a9a; font-size: 12px; margin: 0;">
+                Este email foi enviado pelo Centro de Carreiras do Fundo Patronos da Unicamp.
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def _greeting(slot: str) -> str:
+    return f'<h2 style="color: #1a1a1a; margin: 0 0 20px 0; font-size: 20px;">Olá, {{{{ {slot} }}}}!</h2>'
+
+
+def _paragraph(text: str, margin: str = "0 0 20px 0") -> str:
+    return f"""<p style="color: #4a4a4a; line-height: 1.6; margin: {margin};">
+    {text}
+</p>"""
+
+
+def _card(label: str, content: str, label_margin: str = "0 0 8px 0", margin: str = "24px 0") -> str:
+    return f"""<div style="background: #f8f8f8; border-radius: 12px; padding: 20px; margin: {margin};">
+    <p style="color: #6a6a6a; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin: {label_margin};">{label}</p>
+    {content}
+</div>"""
+
+
+def _person(name_slot: str, detail: str, detail_margin: str = "0") -> str:
+    return f"""<p style="color: #1a1a1a; font-weight: 600; margin: 0 0 4px 0; font-size: 16px;">{{{{ {name_slot} }}}}</p>
+    <p style="color: #4a4a4a; margin: {detail_margin};">{detail}</p>"""
+
+
+def _mailto(slot: str) -> str:
+    return f'<a href="mailto:{{{{ {slot} }}}}" style="color: #9B5DE5; text-decoration: none;">{{{{ {slot} }}}}</a>'
+
+
+def _message(slot: str) -> str:
+    return f'<p style="color: #1a1a1a; line-height: 1.7; margin: 0; white-space: pre-line;">{{{{ {slot} }}}}</p>'
+
+
+def _highlight(text: str, font_size: str = "16px") -> str:
+    return f"""<div style="background: linear-gradient(135deg, rgba(255,107,53,0.1) 0%, rgba(155,93,229,0.1) 100%); border-radius: 12px; padding: 20px; margin: 0 0 24px 0; text-align: center;">
+    <p style="color: #1a1a1a; font-size: {font_size}; font-weight: 600; margin: 0;">
+        {text}
+    </p>
+</div>"""
+
+
+def _alert(title: str, text: Optional[str] = None, margin: str = "24px 0") -> str:
+    body = (
+        f'<p style="color: #1a1a1a; font-weight: 600; margin: 0 0 8px 0;">{title}</p>\n'
+        f'    <p style="color: #4a4a4a; font-size: 14px; margin: 0; line-height: 1.6;">\n        {text}\n    </p>'
+        if text
+        else f'<p style="color: #1a1a1a; font-weight: 600; margin: 0;">\n        {title}\n    </p>'
+    )
+    return f"""<div style="background: #FFF3E0; border-left: 4px solid #FF6B35; border-radius: 8px; padding: 16px; margin: {margin};">
+    {body}
+</div>"""
+
+
+def _button(url_slot: str, label: str) -> str:
+    return f"""<div style="text-align: center; margin: 32px 0;">
+    <a href="{{{{ {url_slot} }}}}" style="display: inline-block; background: {_GRADIENT}; color: white; text-decoration: none; padding: 14px 32px; border-radius: 8px; font-weight: 600; font-size: 16px;">
+        {label}
+    </a>
+</div>"""
+
+
+def _link_fallback(url_slot: str) -> str:
+    return f"""<p style="color: #6a6a6a; line-height: 1.6; margin: 24px 0 0 0; font-size: 14px;">
+    Se você não conseguir clicar no botão, copie e cole o link abaixo no seu navegador:
+</p>
+<p style="color: #9B5DE5; line-height: 1.6; margin: 8px 0 0 0; font-size: 13px; word-break: break-all;">
+    {{{{ {url_slot} }}}}
+</p>"""
+
+
+def _note(text: str, margin: str = "24px 0 0 0") -> str:
+    return f"""<div style="background: #f8f8f8; border-radius: 12px; padding: 16px; margin: {margin};">
+    <p style="color: #6a6a6a; font-size: 13px; margin: 0; line-height: 1.6;">
+        {text}
+    </p>
+</div>"""
+
+
+def _email(*blocks: str) -> str:
+    content = "\n\n".join(blocks)
+    indented = "\n".join(("            " + line) if line else line for line in content.splitlines())
+    return _LAYOUT.replace("{content}", indented)
+
+
+_FEEDBACK_FORM_NOTE = _note(
+    "O formulário leva menos de 1 minuto para responder e suas respostas são "
+    "confidenciais - apenas a equipe Patronos terá acesso."
+)
+
+_COMPLETION_NOTE = _note(
+    "O formulário leva menos de 1 minuto para responder. Acesse sua conta no "
+    "Centro de Carreiras para avaliar a sessão."
+)
+
+
+# ============================================
+# EMAIL TEMPLATES
+# ============================================
+
+_SOURCES = {
+    "session_request_to_mentor": _email(
+        _greeting("mentor_name"),
+        _paragraph("Você recebeu uma nova solicitação de mentoria de um estudante da Unicamp."),
+        _card("Estudante", _person("student_name", _mailto("student_email"))),
+        _card("Mensagem", _message("message"), label_margin="0 0 12px 0"),
+        _paragraph(
+            "Responda diretamente a este email para entrar em contato com {{ student_name }} "
+            "e agendar sua sessão de mentoria.",
+            margin="24px 0 0 0",
+        ),
+    ),
+    "session_confirmation_to_student": _email(
+        _greeting("student_name"),
+        _paragraph(
+            "Sua solicitação de mentoria foi enviada com sucesso! O mentor receberá seu "
+            "email e entrará em contato em breve."
+        ),
+        _card("Mentor", _person("mentor_name", "{{ mentor_company }}")),
+        _card("Sua mensagem", _message("message"), label_margin="0 0 12px 0"),
+        """<div style="background: linear-gradient(135deg, rgba(255,107,53,0.1) 0%, rgba(155,93,229,0.1) 100%); border-radius: 12px; padding: 16px; margin: 24px 0;">
+    <p style="color: #4a4a4a; font-size: 14px; margin: 0; line-height: 1.6;">
+        <strong>Dica:</strong> Fique atento ao seu email! O mentor responderá diretamente para <strong>{{ student_email }}</strong>.
+    </p>
+</div>""",
+    ),
+    "verification_email": _email(
+        _greeting("user_name"),
+        _paragraph(
+            "Obrigado por se cadastrar no Centro de Carreiras. Para ativar sua conta, "
+            "clique no botão abaixo para verificar seu email."
+        ),
+        _button("verification_url", "Verificar Email"),
+        _link_fallback("verification_url"),
+        _note(
+            "<strong>Importante:</strong> Este link expira em 24 horas. Se você não "
+            "solicitou esta verificação, pode ignorar este email com segurança."
+        ),
+    ),
+    "feedback_request_to_student": _email(
+        _greeting("student_name"),
+        _paragraph(
+            "Há alguns dias você solicitou uma mentoria com <strong>{{ mentor_name }}</strong>. "
+            "Gostaríamos de saber como foi sua experiência!"
+        ),
+        _paragraph(
+            "Seu feedback é muito importante para melhorarmos o programa de mentorias do "
+            "Centro de Carreiras.",
+            margin="0 0 24px 0",
+        ),
+        _button("feedback_url", "Responder Feedback"),
+        _FEEDBACK_FORM_NOTE,
+    ),
+    "feedback_request_to_mentor": _email(
+        _greeting("mentor_name"),
+        _paragraph(
+            "Há alguns dias você recebeu uma solicitação de mentoria de "
+            "<strong>{{ student_name }}</strong>. Gostaríamos de saber como foi!"
+        ),
+        _paragraph(
+            "Seu feedback é muito importante para acompanharmos o progresso do programa e "
+            "apoiar nossos estudantes.",
+            margin="0 0 24px 0",
+        ),
+        _button("feedback_url", "Responder Feedback"),
+        _FEEDBACK_FORM_NOTE,
+    ),
+    "welcome_import_email": _email(
+        _greeting("user_name"),
+        _paragraph(
+            "O <strong>Centro de Carreiras</strong> foi atualizado! Estamos com uma nova "
+            "plataforma, mais moderna e com novos recursos para conectar você a mentores incríveis."
+        ),
+        _paragraph(
+            "Sua conta foi migrada automaticamente. Para acessar a nova plataforma, você "
+            "precisa configurar uma nova senha clicando no botão abaixo:"
+        ),
+        _button("password_reset_url", "Configurar Senha"),
+        _card(
+            "O que há de novo?",
+            """<ul style="color: #4a4a4a; line-height: 1.8; margin: 0; padding-left: 20px;">
+        <li>Interface completamente redesenhada</li>
+        <li>Novos perfis de mentores</li>
+        <li>Sistema de agendamento simplificado</li>
+        <li>Melhor experiência em dispositivos móveis</li>
+    </ul>""",
+            label_margin="0 0 12px 0",
+        ),
+        _link_fallback("password_reset_url"),
+    ),
+    "password_reset_email": _email(
+        _greeting("user_name"),
+        _paragraph(
+            "Você solicitou a redefinição de senha da sua conta no Centro de Carreiras. "
+            "Clique no botão abaixo para criar uma nova senha:"
+        ),
+        _button("reset_url", "Redefinir Senha"),
+        _note(
+            "<strong>Importante:</strong> Este link expira em 1 hora. Se você não solicitou "
+            "esta redefinição, pode ignorar este email com segurança - sua senha "
+            "permanecerá inalterada.",
+            margin="24px 0",
+        ),
+        _link_fallback("reset_url"),
+    ),
+    "approval_confirmation_email": _email(
+        _greeting("user_name"),
+        _highlight("🎉 Parabéns! Sua conta foi aprovada", font_size="18px"),
+        "{{ role_content }}",
+        _button("login_url", "Acessar o Centro de Carreiras"),
+        _link_fallback("login_url"),
+    ),
+    "completion_feedback_request_to_student": _email(
+        _greeting("student_name"),
+        _highlight("✅ <strong>{{ mentor_name }}</strong> marcou a sessão de mentoria como concluída"),
+        _paragraph(
+            "Por favor, avalie sua experiência com a sessão de mentoria. Seu feedback é "
+            "muito importante para melhorarmos o programa!"
+        ),
+        _button("feedback_url", "Avaliar Sessão"),
+        _COMPLETION_NOTE,
+    ),
+    "completion_feedback_request_to_mentor": _email(
+        _greeting("mentor_name"),
+        _highlight(
+            "✅ O estudante <strong>{{ student_name }}</strong> marcou a sessão de mentoria como concluída"
+        ),
+        _paragraph(
+            "Por favor, avalie sua experiência com a sessão de mentoria. Seu feedback é "
+            "muito importante para acompanharmos o progresso do programa!"
+        ),
+        _button("feedback_url", "Avaliar Sessão"),
+        _COMPLETION_NOTE,
+    ),
+    "admin_pending_user_notification": _email(
+        _alert("🔔 Novo cadastro aguardando aprovação", margin="0 0 24px 0"),
+        _paragraph(
+            "Um novo usuário se cadastrou no Centro de Carreiras e precisa de aprovação manual."
+        ),
+        _card(
+            "Novo Usuário",
+            _person("user_name", _mailto("user_email"), detail_margin="0 0 8px 0")
+            + "\n    {{ role_badge }}",
+            margin="16px 0",
+        ),
+        "{{ mentor_info }}",
+        _button("admin_url", "Revisar Cadastro"),
+        _note("Acesse o painel administrativo para aprovar ou rejeitar este cadastro."),
+    ),
+}
+
+TEMPLATES: dict[str, Template] = {
+    name: Template(name, source) for name, source in _SOURCES.items()
+}
+
+_FEATURE_ITEM = Template(
+    "feature_item", '<li style="color: #4a4a4a; margin: 8px 0;">{{ feature }}</li>'
+)
+
+_MENTOR_INFO = Template(
+    "mentor_info",
+    _card(
+        "Informações Profissionais",
+        '<p style="color: #1a1a1a; margin: 0;">{{ details }}</p>',
+        margin="16px 0",
+    ),
+)
+
+_ROLE_BADGE = Template(
+    "role_badge",
+    '<span style="display: inline-block; background: {{ background }}; color: {{ color }}; '
+    'padding: 4px 12px; border-radius: 12px; font-size: 13px; font-weight: 500;">{{ label }}</span>',
+)
+
+
+# ============================================
+# CACHED FRAGMENTS
+# ============================================
+
+_APPROVAL_CONTENT = {
+    "estudante": (
+        "Como estudante, você agora pode explorar mentores, agendar sessões de mentoria "
+        "e acessar recursos de carreira exclusivos.",
+        [
+            "Explorar perfis de mentores experientes",
+            "Solicitar sessões de mentoria",
+            "Acessar recursos de desenvolvimento de carreira",
+        ],
+    ),
+    "mentor": (
+        "Como mentor, você agora pode gerenciar seu perfil e receber solicitações de "
+        "mentoria de estudantes da Unicamp.",
+        [
+            "Completar seu perfil de mentor",
+            "Receber solicitações de mentoria de estudantes",
+            "Contribuir para o desenvolvimento de futuros profissionais",
+        ],
+    ),
+}
+
+_MENTOR_NEXT_STEP = _alert(
+    "Próximo passo importante",
+    "Para aparecer na lista de mentores e receber solicitações de estudantes, complete "
+    "seu perfil com sua biografia, áreas de expertise e foto. Acesse \"Meu Perfil\" no "
+    "menu lateral após fazer login.",
+)
+
+
+@lru_cache(maxsize=None)
+def approval_role_content(role: Literal["estudante", "mentor"]) -> Markup:
+    """Role-specific message, feature list and next step of the approval email."""
+    role_message, features = _APPROVAL_CONTENT[role]
+    features_html = "\n        ".join(_FEATURE_ITEM.render(feature=feature) for feature in features)
+    blocks = [
+        _paragraph(html.escape(role_message)),
+        _card(
+            "O que você pode fazer agora",
+            f"""<ul style="margin: 0; padding-left: 20px; line-height: 1.8;">
+        {features_html}
+    </ul>""",
+            label_margin="0 0 12px 0",
+        ),
+    ]
+    if role == "mentor":
+        blocks.append(_MENTOR_NEXT_STEP)
+    return Markup("\n\n".join(blocks))
+
+
+@lru_cache(maxsize=None)
+def role_badge(role: Literal["estudante", "mentor"]) -> Markup:
+    """Colored role label used in the admin notification."""
+    if role == "estudante":
+        return _ROLE_BADGE.render(background="#E3F2FD", color="#1976D2", label="Estudante")
+    return _ROLE_BADGE.render(background="#E8F5E9", color="#388E3C", label="Mentor")
+
+
+def mentor_info(title: Optional[str], company: Optional[str]) -> Markup:
+    """Professional info card of the admin notification (empty without data)."""
+    if not (title or company):
+        return Markup("")
+    lines = []
+    if title:
+        lines.append(Markup("<strong>Cargo:</strong> ") + escape(title))
+    if company:
+        lines.append(Markup("<strong>Empresa:</strong> ") + escape(company))
+    return _MENTOR_INFO.render(details=Markup("<br/>".join(lines)))
+
+
+def render(template: str, **values: Any) -> str:
+    """Render a compiled email template by name."""
+    return TEMPLATES[template].render(**values)
@@ -3,7 +3,7 @@
 import json
 import os
 import firebase_admin
-from firebase_admin import credentials, auth, firestore
+from firebase_admin import credentials, auth, firestore, firestore_async
 from .config import get_settings
 
 settings = get_settings()
@@ -44,8 +44,10 @@ _app = firebase_admin.initialize_app(_cred, {
     "storageBucket": f"{settings.FIREBASE_PROJECT_ID}.firebasestorage.app",
 })
 
-# Firestore client
+# Firestore clients. `db` is synchronous and meant for scripts; request
+# handlers use `async_db` so Firestore round trips don't block the event loop.
 db = firestore.client()
+async_db = firestore_async.client()
 
 
 def verify_id_token(token: str) -> dict:
@@ -0,0 +1,93 @@
+"""
+Opaque cursors for keyset pagination over Firestore queries.
+
+A cursor holds the values of the last returned document for each field in
+the query's `order_by` clause (plus its document id), serialized as
+URL-safe base64 JSON so clients can pass it back without interpreting it.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+# Marker used to round-trip datetimes through JSON
+_DATETIME_KEY = "$dt"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_KEY: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and _DATETIME_KEY in value:
+        return datetime.fromisoformat(value[_DATETIME_KEY])
+    return value
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    """
+    Encode the order-by values of the last document of a page.
+
+    Args:
+        values: Field path -> value, including `__name__` for the document id
+
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    payload = {key: _encode_value(value) for key, value in values.items()}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_fields: Optional[dict[str, type]] = None) -> dict[str, Any]:
+    """
+    Decode a cursor created by `encode_cursor`.
+
+    Args:
+        cursor: The client's cursor string
+        order_fields: The query's order-by fields -> expected value type
+            (`__name__` must be a str). When given, the cursor must hold
+            exactly these fields, each of its type or null; Firestore would
+            otherwise only reject it once the query is streamed.
+
+    Raises:
+        ValueError: If the cursor is malformed or doesn't match the query.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, dict):
+            raise ValueError("not an object")
+        values = {key: _decode_value(value) for key, value in payload.items()}
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+    if order_fields is not None:
+        _check_order_fields(values, order_fields)
+    return values
+
+
+def _check_order_fields(values: dict[str, Any], order_fields: dict[str, type]) -> None:
+    if set(values) != set(order_fields):
+        raise ValueError("Invalid cursor: fields don't match the query")
+    for key, expected in order_fields.items():
+        value = values[key]
+        if key == "__name__":
+            # A document id, not a path
+            if not isinstance(value, str) or not value or "/" in value:
+                raise ValueError("Invalid cursor: bad document id")
+        elif value is not None and not isinstance(value, expected):
+            raise ValueError(f"Invalid cursor: bad value for {key}")
+
+
+def sort_name(display_name: str | None) -> str:
+    """
+    Normalized name stored as `displayNameLower` for name-sorted listings.
+
+    Must stay in sync with the frontend's userService, which writes the same
+    field when creating profiles.
+    """
+    return (display_name or "").strip().lower()
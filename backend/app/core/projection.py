@@ -0,0 +1,148 @@
+"""
+Projection (field mask) helpers for Firestore list queries.
+
+List endpoints declare the document fields they actually use and fetch only
+those through `Query.select()`, so large maps such as `profile` or
+`mentorProfile.bio` are not downloaded when they aren't needed. Each fetch
+logs its document count, estimated payload size and duration.
+
+`stream_selected` does the same for whole-collection reads (exports), one
+bounded page at a time, so memory doesn't grow with the collection.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_value_size(value: Any) -> int:
+    """
+    Estimate the stored size of a Firestore value, in bytes.
+
+    Follows Firestore's storage size rules closely enough to compare
+    payloads with and without a field mask.
+    """
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, datetime)):
+        return 8
+    if isinstance(value, str):
+        return len(value.encode("utf-8")) + 1
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(
+            len(str(key).encode("utf-8")) + 1 + estimate_value_size(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_value_size(item) for item in value)
+    return 8
+
+
+async def fetch_selected(query, fields: list[str], label: str) -> list[tuple[str, dict]]:
+    """
+    Run a query with a field mask and return the projected documents.
+
+    Args:
+        query: Async Firestore query (filters, order and limit already applied)
+        fields: Field paths the caller needs (e.g. "mentorProfile.title")
+        label: Name of the caller, used in the instrumentation log
+
+    Returns:
+        List of (document id, projected data) tuples, in query order.
+    """
+    start_time = time.perf_counter()
+    payload_bytes = 0
+    docs = []
+
+    async for doc in query.select(fields).stream():
+        data = doc.to_dict() or {}
+        payload_bytes += len(doc.id) + 1 + estimate_value_size(data)
+        docs.append((doc.id, data))
+
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(
+        f"Projected query {label}: {len(docs)} documents",
+        extra={
+            "extra_fields": {
+                "query": label,
+                "documents": len(docs),
+                "fields": len(fields),
+                "payload_bytes": payload_bytes,
+                "duration_ms": round(duration_ms, 2),
+            }
+        },
+    )
+
+    return docs
+
+
+async def stream_selected(
+    query,
+    fields: list[str],
+    label: str,
+    page_size: int = 500,
+    order_field: Optional[str] = None,
+) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Yield every document of a query with a field mask, page by page.
+
+    Pages are read in document id order with `start_after`, so each Firestore
+    call is short and at most one page is held in memory. The query must not
+    have its own `order_by` or `limit`.
+
+    Queries with a range filter must be ordered by the filtered field first;
+    pass it as `order_field` (a top-level field included in `fields`).
+
+    Yields:
+        (document id, projected data) tuples.
+    """
+    start_time = time.perf_counter()
+    documents = 0
+    pages = 0
+    payload_bytes = 0
+    cursor = None
+
+    ordered = query.select(fields)
+    if order_field:
+        ordered = ordered.order_by(order_field)
+    ordered = ordered.order_by("__name__")
+
+    while True:
+        page_query = ordered.limit(page_size)
+        if cursor is not None:
+            page_query = page_query.start_after(cursor)
+
+        page = []
+        async for doc in page_query.stream():
+            page.append((doc.id, doc.to_dict() or {}))
+        pages += 1
+        for doc_id, data in page:
+            payload_bytes += len(doc_id) + 1 + estimate_value_size(data)
+            documents += 1
+            yield doc_id, data
+
+        if len(page) < page_size:
+            break
+        last_id, last_data = page[-1]
+        cursor = {"__name__": last_id}
+        if order_field:
+            cursor = {order_field: last_data.get(order_field), **cursor}
+
+    logger.info(
+        f"Streamed query {label}: {documents} documents",
+        extra={
+            "extra_fields": {
+                "query": label,
+                "documents": documents,
+                "pages": pages,
+                "fields": len(fields),
+                "payload_bytes": payload_bytes,
+                "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            }
+        },
+    )
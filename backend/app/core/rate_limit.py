@@ -0,0 +1,34 @@
+"""
+Async rate limiter for calls to external providers.
+
+Spaces calls evenly so that no more than `rate` start per second, which keeps
+bursts of concurrent tasks (e.g. the feedback fan-out) under a provider's
+request limit instead of relying on 429 responses.
+"""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Allows at most `rate` acquisitions per second across concurrent tasks."""
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+
+    async def acquire(self) -> None:
+        """Wait until the next call slot is free."""
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            self.waited_seconds += delay
+            await asyncio.sleep(delay)
@@ -0,0 +1,125 @@
+"""
+In-process cache of verified Firebase ID tokens.
+
+The frontend sends the same ID token on every request until it is refreshed
+(about once an hour), so verifying its RSA signature each time is wasted
+work. Verified claims are kept in a bounded LRU keyed by a SHA-256 hash of
+the token and expire at the token's `exp`.
+
+Tokens are verified the same way as before the cache existed (signature and
+expiry, no revocation round-trip to Firebase Auth), in a worker thread so the
+event loop isn't blocked. Access is still enforced by the user's `status`;
+entries live at most `TOKEN_CACHE_MAX_AGE_SECONDS`, and `invalidate_user`
+drops a user's entries immediately (e.g. when an admin suspends them).
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .firebase import verify_id_token
+
+# Maximum number of tokens kept in memory
+TOKEN_CACHE_MAX_SIZE = 2048
+
+# Upper bound on how long a verified token is trusted without being
+# verified again, in seconds
+TOKEN_CACHE_MAX_AGE_SECONDS = 300
+
+
+class TokenCache:
+    """Bounded LRU of verified token claims with per-entry expiry."""
+
+    def __init__(self, max_size: int = TOKEN_CACHE_MAX_SIZE, max_age: float = TOKEN_CACHE_MAX_AGE_SECONDS):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return cached claims for a token, or None if absent or expired."""
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, claims = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        """Cache verified claims until the token's `exp` (capped by max_age)."""
+        now = time.time()
+        expires_at = min(float(claims.get("exp", now)), now + self.max_age)
+        if expires_at <= now:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, uid: str) -> int:
+        """Drop every cached token belonging to a user. Returns entries removed."""
+        with self._lock:
+            keys = [key for key, (_, claims) in self._entries.items() if claims.get("uid") == uid]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for logging and the health check."""
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache()
+
+
+async def verify_id_token_cached(token: str) -> dict:
+    """
+    Verify a Firebase ID token, reusing claims of recently verified tokens.
+
+    Raises the same errors as `core.firebase.verify_id_token`.
+    """
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+
+    claims = await asyncio.to_thread(verify_id_token, token)
+    token_cache.put(token, claims)
+    return claims
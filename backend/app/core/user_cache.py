@@ -0,0 +1,95 @@
+"""
+In-process cache of parsed user profiles for `get_current_user`.
+
+Every authenticated request needs the caller's `users/{uid}` document.
+Parsed `UserInDB` objects are kept in a bounded LRU for up to
+`USER_CACHE_TTL_SECONDS`, so most requests skip the Firestore read and
+Pydantic validation.
+
+Endpoints that modify a user document must call `user_cache.invalidate(uid)`
+after the write. Writes made outside the API (the frontend's Firestore SDK,
+scripts, the console) are picked up once the TTL expires, which bounds how
+stale a status change such as a suspension can be.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .config import settings
+from ..models.user import UserInDB
+
+
+class UserCache:
+    """Bounded LRU of parsed users with a fixed time-to-live."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, UserInDB]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, uid: str) -> Optional[UserInDB]:
+        """Return a copy of the cached user, or None if absent or stale."""
+        if self.ttl_seconds <= 0:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[uid]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(uid)
+            self.hits += 1
+            user = entry[1]
+
+        # Handlers receive their own copy so they can't mutate the cached one
+        return user.model_copy(deep=True)
+
+    def put(self, user: UserInDB) -> None:
+        if self.ttl_seconds <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[user.uid] = (expires_at, user.model_copy(deep=True))
+            self._entries.move_to_end(user.uid)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, uid: str) -> None:
+        """Drop a user after their document was written."""
+        with self._lock:
+            if self._entries.pop(uid, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for logging and the health check."""
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
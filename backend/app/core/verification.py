@@ -10,7 +10,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from google.cloud.firestore_v1 import FieldFilter
-from .firebase import db
+from .firebase import async_db
 from .config import settings
 
 logger = logging.getLogger(__name__)
@@ -49,8 +49,8 @@ async def create_verification_token(uid: str, email: str, role: str) -> str:
     expires_at = now + timedelta(hours=TOKEN_EXPIRY_HOURS)
 
     # Store token in Firestore
-    token_ref = db.collection("email_verifications").document(token)
-    token_ref.set({
+    token_ref = async_db.collection("email_verifications").document(token)
+    await token_ref.set({
         "uid": uid,
         "email": email,
         "role": role,
@@ -73,8 +73,8 @@ async def verify_token(token: str) -> Optional[dict]:
     Returns:
         Dict with uid, email, role if valid, None otherwise
     """
-    token_ref = db.collection("email_verifications").document(token)
-    token_doc = token_ref.get()
+    token_ref = async_db.collection("email_verifications").document(token)
+    token_doc = await token_ref.get()
 
     if not token_doc.exists:
         logger.warning(f"Verification token not found: {token[:8]}...")
@@ -101,7 +101,7 @@ async def verify_token(token: str) -> Optional[dict]:
             return None
 
     # Mark token as used
-    token_ref.update({"used": True})
+    await token_ref.update({"used": True})
     logger.info(f"Verification token validated for user {token_data['uid']}")
 
     return {
@@ -123,14 +123,14 @@ async def invalidate_user_tokens(uid: str) -> int:
     Returns:
         Number of tokens invalidated
     """
-    tokens_ref = db.collection("email_verifications")
+    tokens_ref = async_db.collection("email_verifications")
     query = tokens_ref.where(filter=FieldFilter("uid", "==", uid)).where(
         filter=FieldFilter("used", "==", False)
     )
 
     count = 0
-    for doc in query.stream():
-        doc.reference.update({"used": True})
+    async for doc in query.stream():
+        await doc.reference.update({"used": True})
         count += 1
 
     if count > 0:
@@ -1,14 +1,26 @@
 """Centro de Carreiras FastAPI Application."""
 
+import asyncio
 import logging
 import time
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from .core.analytics import analytics_stats, flush_analytics
 from .core.config import get_settings
 from .core.logging import setup_logging, set_request_context, clear_request_context
+from .core.token_cache import token_cache
+from .core.user_cache import user_cache
 from .api.v1.router import api_router
+from .services.email_outbox import email_outbox_worker
+from .services.export_jobs import export_job_worker
+from .services.mentor_catalog import (
+    LISTENER_READY_TIMEOUT_SECONDS,
+    mentor_catalog,
+    mentor_catalog_listener,
+)
+from .services.mentor_recommendations import mentor_recommender
 
 settings = get_settings()
 
@@ -113,10 +125,58 @@ async def startup_event():
     )
 
 
+@app.on_event("startup")
+async def start_email_outbox_worker():
+    """Start delivering queued emails in the background."""
+    email_outbox_worker.start()
+
+
+@app.on_event("startup")
+async def start_export_job_worker():
+    """Start running queued admin exports in the background."""
+    export_job_worker.start()
+
+
+@app.on_event("startup")
+async def start_mentor_catalog_listener():
+    """Keep the mentor catalog live, waiting briefly for the first snapshot."""
+    if not settings.MENTOR_CATALOG_LISTENER:
+        return
+    mentor_catalog_listener.start()
+    if not await mentor_catalog_listener.wait_ready(LISTENER_READY_TIMEOUT_SECONDS):
+        logger.warning("Mentor catalog listener not ready, serving the TTL cache until it is")
+
+
+@app.on_event("startup")
+async def load_mentor_session_counts():
+    """Load the session counts GET /mentors sorts by, so no request waits for them."""
+    await mentor_catalog.refresh_counts()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers and send queued analytics events."""
+    await email_outbox_worker.stop()
+    await export_job_worker.stop()
+    await mentor_catalog_listener.stop()
+    await asyncio.to_thread(flush_analytics)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "app": settings.APP_NAME}
+    return {
+        "status": "healthy",
+        "app": settings.APP_NAME,
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "analytics": analytics_stats(),
+        "email_outbox": email_outbox_worker.stats(),
+        "export_jobs": export_job_worker.stats(),
+        "mentor_catalog": mentor_catalog.stats(),
+        "mentor_catalog_listener": mentor_catalog_listener.stats(),
+        "mentor_recommendations": mentor_recommender.stats(),
+    }
 
 
 @app.get("/")
@@ -0,0 +1,36 @@
+"""Export job Pydantic models for background admin exports."""
+
+from pydantic import BaseModel
+from typing import Optional, Literal
+from datetime import datetime
+
+
+ExportDatasetName = Literal["users", "mentors", "sessions", "feedback", "feedback_requests"]
+
+
+class ExportJobCreate(BaseModel):
+    """Request to start an export job."""
+
+    dataset: ExportDatasetName
+    format: Literal["csv", "parquet"] = "csv"
+    compress: bool = False  # gzip the CSV (.csv.gz); Parquet is always compressed
+
+
+class ExportJobResponse(BaseModel):
+    """Status of an export job, polled by the admin panel."""
+
+    id: str
+    dataset: ExportDatasetName
+    format: str
+    compress: bool
+    status: Literal["queued", "running", "completed", "failed"]
+    rows_written: int = 0
+    total_estimate: Optional[int] = None  # Document count when the job started
+    progress: Optional[float] = None  # 0.0 - 1.0, None while unknown
+    bytes_written: int = 0
+    filename: Optional[str] = None
+    download_url: Optional[str] = None  # Signed URL, only when completed
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
@@ -17,10 +17,15 @@ class FeedbackRequestInDB(BaseModel):
     recipient_type: Literal["student", "mentor"]
     recipient_email: EmailStr
     recipient_name: str
-    token: str  # 32-char unique token
+    other_party_name: Optional[str] = None  # Denormalized from the session
+    mentor_id: Optional[str] = None  # Denormalized from the session; missing on older requests
+    token: str  # "{id}.{32-char secret}"; older requests hold only the secret
     created_at: Optional[datetime] = None
     sent_at: Optional[datetime] = None
     email_sent: bool = False
+    email_attempts: int = 0  # Failed sends by the scheduler
+    last_error: Optional[str] = None
+    email_failed: bool = False  # Permanent error or out of attempts; not retried
     submitted: bool = False
 
 
@@ -131,4 +136,37 @@ class ProcessPendingResponse(BaseModel):
     success: bool
     sessions_processed: int
     emails_sent: int
+    emails_failed: int = 0
+    # Failed sends that won't be retried (permanent error or out of attempts)
+    emails_abandoned: int = 0
     errors: list[str] = []
+    # Sessions read from the sweep checkpoint onwards
+    sessions_scanned: int = 0
+    # False when the run stopped early (time budget or retryable failed sends); the
+    # next run resumes from the checkpoint
+    complete: bool = True
+    # Duration of each stage summed over pages (query, lookup, prepare, send,
+    # update, checkpoint) and of the whole run (total)
+    timings_ms: dict[str, float] = {}
+
+
+# Mentor rating aggregate models
+
+class MentorRatingBreakdown(BaseModel):
+    """Feedback totals from one kind of respondent."""
+
+    responses: int = 0
+    rating_count: int = 0
+    rating_sum: int = 0
+    average_rating: Optional[float] = None  # None until there is a rating
+    histogram: dict[str, int] = {}  # "1".."5" -> number of ratings
+    not_happened: int = 0
+
+
+class MentorRatingsResponse(BaseModel):
+    """Rating aggregate of a mentor (admin view)."""
+
+    mentor_id: str
+    student: MentorRatingBreakdown  # Students rating their sessions with the mentor
+    mentor: MentorRatingBreakdown  # The mentor's own feedback on those sessions
+    updated_at: Optional[datetime] = None
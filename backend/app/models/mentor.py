@@ -62,6 +62,11 @@ class MentorPublicResponse(BaseModel):
     linkedin: str = ""
     course: str = ""
     schedulingLink: str = ""
+    # Session counts, for spreading demand across mentors; only set when
+    # GET /mentors is sorted by one
+    pending_sessions: Optional[int] = None
+    completed_sessions: Optional[int] = None
+    sessions_last_30_days: Optional[int] = None
 
 
 class MentorListResponse(BaseModel):
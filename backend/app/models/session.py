@@ -64,10 +64,11 @@ class SessionResponse(BaseModel):
 
 
 class SessionListResponse(BaseModel):
-    """Response model for session list."""
+    """Response model for a page of sessions."""
 
     sessions: list[SessionResponse]
-    total: int
+    total: int  # Number of sessions in this page
+    next_cursor: Optional[str] = None  # None when there are no more pages
 
 
 class SessionStatusUpdate(BaseModel):
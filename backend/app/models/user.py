@@ -23,6 +23,7 @@ class UserProfile(BaseModel):
     graduationYear: Optional[Union[int, str]] = None
     ra: Optional[str] = None
     emailAlternativo: Optional[str] = None
+    interests: list[str] = []  # Topics used to recommend mentors
 
     @field_validator('graduationYear', mode='before')
     @classmethod
@@ -0,0 +1,347 @@
+"""
+Transactional email outbox.
+
+Request handlers don't call Resend inline. They write the email intent to the
+`email_outbox` collection, in the same batch as the domain write when there is
+one, and `EmailOutboxWorker` delivers it in the background with retries and
+exponential backoff.
+
+Each outbox document names an `EmailService` method and its keyword arguments:
+
+    {
+        "template": "send_session_request_to_mentor",
+        "params": {...},
+        "status": "pending" | "sending" | "sent" | "failed",
+        "attempts": 0,
+        "next_attempt_at": <when the message is due>,
+        "on_sent": {"path": "sessions/abc", "field": "mentor_email_sent"},
+        "analytics": {"user_id": ..., "sent_event": ..., "failed_event": ..., "properties": {...}},
+    }
+
+Delivery is claimed with a `last_update_time` precondition, so concurrent
+workers (several Cloud Run instances) never send the same message twice at
+the same time; a claim is a lease that expires if the worker dies mid-send.
+
+The in-process worker is only the fast path. With request-based CPU
+allocation, Cloud Run throttles an instance between requests and scales to
+zero, so queued messages and retries would wait for the next request. Cloud
+Scheduler calls POST /jobs/email-outbox every minute, which runs `drain()`
+while the request holds the CPU; see DEPLOYMENT.md.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from google.api_core.exceptions import AlreadyExists, FailedPrecondition, NotFound
+from google.cloud.firestore_v1 import DELETE_FIELD
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from ..core.analytics import track_event
+from ..core.email import email_service, resend_rate_limiter
+from ..core.firebase import async_db
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_COLLECTION = "email_outbox"
+
+# Delivery attempts before a message is marked as failed
+OUTBOX_MAX_ATTEMPTS = 5
+
+# Retry delay is base * 2^(attempt - 1), capped at the maximum, in seconds
+OUTBOX_BASE_BACKOFF_SECONDS = 30
+OUTBOX_MAX_BACKOFF_SECONDS = 3600
+
+# How long a claimed message stays reserved for the worker that claimed it
+OUTBOX_LEASE_SECONDS = 120
+
+# The worker also polls on this interval, to pick up retries and messages
+# written by other instances
+OUTBOX_POLL_INTERVAL_SECONDS = 30
+
+# Messages claimed per poll
+OUTBOX_BATCH_SIZE = 20
+
+# A scheduled drain stops starting new batches after this many seconds, so it
+# ends before the next one-minute run
+OUTBOX_DRAIN_TIME_BUDGET_SECONDS = 45
+
+
+def _now() -> datetime:
+    # Firestore returns timezone-aware datetimes, so compare against one
+    return datetime.now(timezone.utc)
+
+
+def add_email_to_batch(
+    batch,
+    template: str,
+    params: dict,
+    key: Optional[str] = None,
+    on_sent: Optional[dict] = None,
+    analytics: Optional[dict] = None,
+) -> str:
+    """
+    Add an email intent to a Firestore write batch.
+
+    The caller commits the batch together with its own writes and then calls
+    `email_outbox_worker.wake()`.
+
+    Args:
+        batch: Async Firestore WriteBatch
+        template: Name of the EmailService method that builds and sends the email
+        params: Keyword arguments for that method
+        key: Optional document id. Keyed intents are created, not overwritten,
+            so the same email can't be queued twice
+        on_sent: {"path": document path, "field": flag} set to True once sent
+        analytics: Events to track when the email is sent or finally fails
+
+    Returns:
+        The outbox document id.
+    """
+    if not callable(getattr(email_service, template, None)):
+        raise ValueError(f"Unknown email template: {template}")
+
+    outbox_ref = async_db.collection(OUTBOX_COLLECTION)
+    ref = outbox_ref.document(key) if key else outbox_ref.document()
+    now = _now()
+    write = batch.create if key else batch.set
+    write(ref, {
+        "id": ref.id,
+        "template": template,
+        "params": params,
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now,
+        "updated_at": now,
+        "sent_at": None,
+        "provider_id": None,
+        "last_error": None,
+        "on_sent": on_sent,
+        "analytics": analytics,
+    })
+    return ref.id
+
+
+async def enqueue_email(
+    template: str,
+    params: dict,
+    key: Optional[str] = None,
+    on_sent: Optional[dict] = None,
+    analytics: Optional[dict] = None,
+) -> str:
+    """
+    Write a single email intent and wake the worker.
+
+    Returns:
+        The outbox document id. Queuing a keyed email that already exists is
+        a no-op.
+    """
+    batch = async_db.batch()
+    message_id = add_email_to_batch(batch, template, params, key, on_sent, analytics)
+    try:
+        await batch.commit()
+    except AlreadyExists:
+        logger.info(f"Email {template} already queued as {message_id}")
+        return message_id
+    email_outbox_worker.wake()
+    return message_id
+
+
+def _backoff_seconds(attempts: int) -> float:
+    delay = min(OUTBOX_BASE_BACKOFF_SECONDS * 2 ** (attempts - 1), OUTBOX_MAX_BACKOFF_SECONDS)
+    return delay * random.uniform(0.9, 1.1)
+
+
+class EmailOutboxWorker:
+    """Background task that delivers due outbox messages."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wake_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="email-outbox-worker")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self) -> None:
+        """Deliver newly written messages now instead of at the next poll."""
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wake_event.clear()
+            try:
+                # Keep going while full batches come back
+                while await self.process_due() >= OUTBOX_BATCH_SIZE:
+                    pass
+            except Exception as e:
+                logger.error(f"Email outbox poll failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), OUTBOX_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self, time_budget: float = OUTBOX_DRAIN_TIME_BUDGET_SECONDS) -> dict:
+        """
+        Deliver due messages until none are left or the time budget runs out.
+
+        Returns:
+            Counts for this drain (found, delivered, retried, failed) and
+            whether every due message was handled (`complete`).
+        """
+        start = time.perf_counter()
+        before = (self.delivered, self.retried, self.failed)
+        found = 0
+        complete = False
+        while time.perf_counter() - start < time_budget:
+            due = await self.process_due()
+            found += due
+            if due < OUTBOX_BATCH_SIZE:
+                complete = True
+                break
+        return {
+            "found": found,
+            "delivered": self.delivered - before[0],
+            "retried": self.retried - before[1],
+            "failed": self.failed - before[2],
+            "complete": complete,
+        }
+
+    async def process_due(self, limit: int = OUTBOX_BATCH_SIZE) -> int:
+        """
+        Deliver messages whose next attempt is due.
+
+        Returns:
+            Number of due messages found.
+        """
+        query = (
+            async_db.collection(OUTBOX_COLLECTION)
+            .where(filter=FieldFilter("status", "in", ["pending", "sending"]))
+            .where(filter=FieldFilter("next_attempt_at", "<=", _now()))
+            .order_by("next_attempt_at")
+            .limit(limit)
+        )
+        docs = [doc async for doc in query.stream()]
+        for doc in docs:
+            await self._deliver(doc)
+        return len(docs)
+
+    async def _deliver(self, doc) -> None:
+        data = doc.to_dict()
+        attempts = data.get("attempts", 0) + 1
+
+        # Claim the message; fails if another worker changed it since our read
+        try:
+            await doc.reference.update(
+                {
+                    "status": "sending",
+                    "attempts": attempts,
+                    "next_attempt_at": _now() + timedelta(seconds=OUTBOX_LEASE_SECONDS),
+                    "updated_at": _now(),
+                },
+                option=async_db.write_option(last_update_time=doc.update_time),
+            )
+        except (FailedPrecondition, NotFound):
+            return
+
+        send = getattr(email_service, data["template"], None)
+        try:
+            if send is None:
+                raise ValueError(f"Unknown email template: {data['template']}")
+            await resend_rate_limiter.acquire()
+            result = await asyncio.to_thread(send, **data["params"])
+            error = None if result.get("success") else result.get("error", "Unknown error")
+        except Exception as e:
+            result = {}
+            error = str(e)
+
+        analytics = data.get("analytics") or {}
+        now = _now()
+
+        if error is None:
+            batch = async_db.batch()
+            batch.update(doc.reference, {
+                "status": "sent",
+                "sent_at": now,
+                "updated_at": now,
+                "provider_id": result.get("id"),
+                "last_error": None,
+                # Params may hold one-time links (password reset, verification)
+                "params": DELETE_FIELD,
+            })
+            on_sent = data.get("on_sent")
+            if on_sent:
+                batch.set(async_db.document(on_sent["path"]), {on_sent["field"]: True}, merge=True)
+            await batch.commit()
+
+            self.delivered += 1
+            if analytics.get("sent_event"):
+                track_event(
+                    user_id=analytics["user_id"],
+                    event_name=analytics["sent_event"],
+                    properties={**analytics.get("properties", {}), "attempts": attempts},
+                )
+            return
+
+        if attempts >= data.get("max_attempts", OUTBOX_MAX_ATTEMPTS):
+            await doc.reference.update({
+                "status": "failed",
+                "updated_at": now,
+                "last_error": error,
+            })
+            self.failed += 1
+            logger.error(
+                f"Email {data['template']} failed after {attempts} attempts: {error}",
+                extra={"extra_fields": {"outbox_id": doc.id, "template": data["template"]}},
+            )
+            if analytics.get("failed_event"):
+                track_event(
+                    user_id=analytics["user_id"],
+                    event_name=analytics["failed_event"],
+                    properties={**analytics.get("properties", {}), "error": error},
+                )
+            return
+
+        await doc.reference.update({
+            "status": "pending",
+            "next_attempt_at": now + timedelta(seconds=_backoff_seconds(attempts)),
+            "updated_at": now,
+            "last_error": error,
+        })
+        self.retried += 1
+        logger.warning(
+            f"Email {data['template']} attempt {attempts} failed, will retry: {error}",
+            extra={"extra_fields": {"outbox_id": doc.id, "template": data["template"]}},
+        )
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+email_outbox_worker = EmailOutboxWorker()
@@ -0,0 +1,435 @@
+"""
+Background export jobs.
+
+`POST /admin/exports` only records a job in the `export_jobs` collection;
+`ExportJobWorker` builds the file outside the request, streaming rows from
+Firestore into the export storage (services/export_storage.py) as CSV
+(services/exports.py, optionally gzip-compressed) or Parquet
+(services/parquet_exports.py). The job document carries the progress the
+admin panel polls, and a signed download URL is issued once the file is
+complete.
+
+Jobs are claimed with a `last_update_time` precondition and held with a
+lease that is renewed with every progress update, so a job whose instance
+dies is picked up again by another one.
+
+Cloud Run throttles the CPU between requests, so the in-process worker only
+gets a job going while the instance is busy. Cloud Scheduler calls
+POST /jobs/exports every five minutes, which runs `drain()` while the
+request holds the CPU; see DEPLOYMENT.md.
+"""
+
+import asyncio
+import gzip
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from google.api_core.exceptions import FailedPrecondition, NotFound
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from ..core.analytics import track_event
+from ..core.config import settings
+from ..core.firebase import async_db
+from ..models.export import ExportJobResponse
+from .export_storage import EXPORT_PATH_PREFIX, get_export_storage
+from .exports import EXPORT_DATASETS, stream_csv
+from .parquet_exports import write_parquet
+
+logger = logging.getLogger(__name__)
+
+EXPORT_JOBS_COLLECTION = "export_jobs"
+
+# Attempts before a job is marked as failed
+EXPORT_JOB_MAX_ATTEMPTS = 3
+
+# Delay before a failed attempt is retried, in seconds
+EXPORT_JOB_RETRY_SECONDS = 60
+
+# How long a claimed job stays reserved without a progress update
+EXPORT_JOB_LEASE_SECONDS = 300
+
+# Progress (and the lease) is written at most this often, in seconds
+EXPORT_PROGRESS_INTERVAL_SECONDS = 5
+
+# The worker also polls on this interval, for jobs created on other instances
+EXPORT_POLL_INTERVAL_SECONDS = 60
+
+# A scheduled drain claims no new job after this many seconds; the job it is
+# running still finishes within the request timeout (600s, see deploy.sh)
+EXPORT_DRAIN_TIME_BUDGET_SECONDS = 240
+
+
+def _now() -> datetime:
+    # Firestore returns timezone-aware datetimes, so compare against one
+    return datetime.now(timezone.utc)
+
+
+class _CountingWriter:
+    """Wraps a binary writer to count the bytes written through it."""
+
+    def __init__(self, target):
+        self._target = target
+        self.bytes_written = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.bytes_written += len(data)
+        return self._target.write(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+        self._target.close()
+
+
+async def create_export_job(dataset: str, format: str, compress: bool, created_by: str) -> dict:
+    """Record a queued export job and wake the worker."""
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"Unknown export dataset: {dataset}")
+
+    ref = async_db.collection(EXPORT_JOBS_COLLECTION).document()
+    now = _now()
+    job = {
+        "id": ref.id,
+        "dataset": dataset,
+        "format": format,
+        "compress": compress and format == "csv",
+        "status": "queued",
+        "attempts": 0,
+        "lease_until": now,
+        "rows_written": 0,
+        "bytes_written": 0,
+        "total_estimate": None,
+        "storage_path": None,
+        "filename": None,
+        "error": None,
+        "created_by": created_by,
+        "created_at": now,
+        "updated_at": now,
+        "started_at": None,
+        "completed_at": None,
+    }
+    await ref.set(job)
+    export_job_worker.wake()
+    return job
+
+
+async def get_export_job(job_id: str) -> Optional[dict]:
+    doc = await async_db.collection(EXPORT_JOBS_COLLECTION).document(job_id).get()
+    return doc.to_dict() if doc.exists else None
+
+
+async def export_job_response(job: dict) -> ExportJobResponse:
+    """Build the API view of a job, with a fresh signed URL once it's complete."""
+    download_url = None
+    if job["status"] == "completed" and job.get("storage_path"):
+        download_url = await asyncio.to_thread(
+            get_export_storage().download_url,
+            job["storage_path"],
+            timedelta(minutes=settings.EXPORT_DOWNLOAD_URL_MINUTES),
+            job["filename"],
+        )
+
+    total = job.get("total_estimate")
+    progress = None
+    if job["status"] == "completed":
+        progress = 1.0
+    elif total:
+        progress = round(min(job.get("rows_written", 0) / total, 0.99), 3)
+
+    return ExportJobResponse(
+        id=job["id"],
+        dataset=job["dataset"],
+        format=job["format"],
+        compress=job["compress"],
+        status=job["status"],
+        rows_written=job.get("rows_written", 0),
+        total_estimate=total,
+        progress=progress,
+        bytes_written=job.get("bytes_written", 0),
+        filename=job.get("filename"),
+        download_url=download_url,
+        error=job.get("error"),
+        created_at=job.get("created_at"),
+        started_at=job.get("started_at"),
+        completed_at=job.get("completed_at"),
+    )
+
+
+async def _count_documents(dataset: str) -> Optional[int]:
+    """Estimate the number of rows with a count aggregation (for progress only)."""
+    try:
+        query = EXPORT_DATASETS[dataset]["count_query"]()
+        result = await query.count().get()
+        return int(result[0][0].value)
+    except Exception as e:
+        logger.warning(f"Could not count documents for export {dataset}: {e}")
+        return None
+
+
+class ExportJobWorker:
+    """Background task that runs queued export jobs, one at a time."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wake_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="export-job-worker")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self) -> None:
+        """Start a newly created job now instead of at the next poll."""
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wake_event.clear()
+            try:
+                while await self.process_next():
+                    pass
+            except Exception as e:
+                logger.error(f"Export job poll failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), EXPORT_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self, time_budget: float = EXPORT_DRAIN_TIME_BUDGET_SECONDS) -> dict:
+        """
+        Run due jobs until none are left or the time budget runs out.
+
+        Returns:
+            Counts for this drain (found, completed, retried, failed) and
+            whether every due job was handled (`complete`).
+        """
+        start = time.perf_counter()
+        before = (self.completed, self.retried, self.failed)
+        found = 0
+        complete = False
+        while time.perf_counter() - start < time_budget:
+            if not await self.process_next():
+                complete = True
+                break
+            found += 1
+        return {
+            "found": found,
+            "completed": self.completed - before[0],
+            "retried": self.retried - before[1],
+            "failed": self.failed - before[2],
+            "complete": complete,
+        }
+
+    async def process_next(self) -> bool:
+        """
+        Claim and run the next due job.
+
+        Returns:
+            True if a job was found (whether or not this worker claimed it).
+        """
+        query = (
+            async_db.collection(EXPORT_JOBS_COLLECTION)
+            .where(filter=FieldFilter("status", "in", ["queued", "running"]))
+            .where(filter=FieldFilter("lease_until", "<=", _now()))
+            .order_by("lease_until")
+            .limit(1)
+        )
+        docs = [doc async for doc in query.stream()]
+        if not docs:
+            return False
+
+        doc = docs[0]
+        job = doc.to_dict()
+        attempts = job.get("attempts", 0) + 1
+        now = _now()
+
+        # Claim the job; fails if another worker changed it since our read
+        try:
+            await doc.reference.update(
+                {
+                    "status": "running",
+                    "attempts": attempts,
+                    "lease_until": now + timedelta(seconds=EXPORT_JOB_LEASE_SECONDS),
+                    "started_at": now,
+                    "updated_at": now,
+                    "rows_written": 0,
+                    "bytes_written": 0,
+                },
+                option=async_db.write_option(last_update_time=doc.update_time),
+            )
+        except (FailedPrecondition, NotFound):
+            return True
+
+        try:
+            await self._build_file(doc.reference, job)
+        except Exception as e:
+            await self._record_failure(doc.reference, job, attempts, str(e))
+        return True
+
+    async def _build_file(self, ref, job: dict) -> None:
+        dataset = EXPORT_DATASETS[job["dataset"]]
+        start_time = time.perf_counter()
+
+        total_estimate = await _count_documents(job["dataset"])
+        await ref.update({"total_estimate": total_estimate})
+
+        timestamp = _now().strftime("%Y%m%d_%H%M%S")
+        if job["format"] == "parquet":
+            # Parquet compresses its column chunks itself (zstd)
+            filename = f"{dataset['filename']}_{timestamp}.parquet"
+            content_type = "application/vnd.apache.parquet"
+        else:
+            filename = f"{dataset['filename']}_{timestamp}.csv"
+            content_type = "text/csv"
+            if job["compress"]:
+                filename += ".gz"
+                content_type = "application/gzip"
+        storage_path = f"{EXPORT_PATH_PREFIX}/{job['id']}/{filename}"
+
+        progress = {"rows": 0, "bytes": 0, "reported_at": time.monotonic()}
+
+        async def report_progress() -> None:
+            if time.monotonic() - progress["reported_at"] < EXPORT_PROGRESS_INTERVAL_SECONDS:
+                return
+            progress["reported_at"] = time.monotonic()
+            await ref.update({
+                "rows_written": progress["rows"],
+                "bytes_written": progress["bytes"],
+                "lease_until": _now() + timedelta(seconds=EXPORT_JOB_LEASE_SECONDS),
+                "updated_at": _now(),
+            })
+
+        storage = get_export_storage()
+        target = await asyncio.to_thread(storage.open_writer, storage_path, content_type)
+        if job["format"] == "parquet":
+            target = _CountingWriter(target)
+
+            async def on_batch(rows: int, batch_rows: int) -> None:
+                progress["rows"] = rows
+                progress["bytes"] = target.bytes_written
+                await report_progress()
+
+            try:
+                await write_parquet(job["dataset"], target, on_batch, write=asyncio.to_thread)
+            finally:
+                await asyncio.to_thread(target.close)
+            progress["bytes"] = target.bytes_written
+        else:
+            await self._write_csv(job, dataset, target, progress, report_progress)
+
+        now = _now()
+        await ref.update({
+            "status": "completed",
+            "rows_written": progress["rows"],
+            "bytes_written": progress["bytes"],
+            "storage_path": storage_path,
+            "filename": filename,
+            "error": None,
+            "completed_at": now,
+            "updated_at": now,
+        })
+        self.completed += 1
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            f"Export {job['id']} ({job['dataset']}) completed: {progress['rows']} rows",
+            extra={
+                "extra_fields": {
+                    "export_id": job["id"],
+                    "dataset": job["dataset"],
+                    "rows": progress["rows"],
+                    "bytes": progress["bytes"],
+                    "format": job["format"],
+                    "compress": job["compress"],
+                    "duration_ms": round(duration_ms, 2),
+                }
+            },
+        )
+        track_event(
+            job["created_by"],
+            "Admin: Export Completed",
+            {
+                "dataset": job["dataset"],
+                "format": job["format"],
+                "rows": progress["rows"],
+                "compress": job["compress"],
+                "duration_ms": round(duration_ms, 2),
+            },
+        )
+
+    async def _write_csv(self, job: dict, dataset: dict, target, progress: dict, report_progress) -> None:
+        output = gzip.GzipFile(fileobj=target, mode="wb") if job["compress"] else target
+
+        async def counted_rows():
+            async for row in dataset["rows"]():
+                progress["rows"] += 1
+                yield row
+
+        try:
+            async for chunk in stream_csv(counted_rows(), dataset["columns"]):
+                await asyncio.to_thread(output.write, chunk)
+                progress["bytes"] += len(chunk)
+                await report_progress()
+        finally:
+            await asyncio.to_thread(output.close)
+            if output is not target:
+                await asyncio.to_thread(target.close)
+
+    async def _record_failure(self, ref, job: dict, attempts: int, error: str) -> None:
+        now = _now()
+        if attempts >= EXPORT_JOB_MAX_ATTEMPTS:
+            await ref.update({
+                "status": "failed",
+                "error": error,
+                "updated_at": now,
+            })
+            self.failed += 1
+            logger.error(
+                f"Export {job['id']} failed after {attempts} attempts: {error}",
+                extra={"extra_fields": {"export_id": job["id"], "dataset": job["dataset"]}},
+            )
+            return
+
+        await ref.update({
+            "status": "queued",
+            "lease_until": now + timedelta(seconds=EXPORT_JOB_RETRY_SECONDS),
+            "error": error,
+            "updated_at": now,
+        })
+        self.retried += 1
+        logger.warning(
+            f"Export {job['id']} attempt {attempts} failed, will retry: {error}",
+            extra={"extra_fields": {"export_id": job["id"], "dataset": job["dataset"]}},
+        )
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+export_job_worker = ExportJobWorker()
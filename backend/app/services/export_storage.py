@@ -0,0 +1,87 @@
+"""
+Storage for finished export files.
+
+Export jobs write their output through `get_export_storage()`. In production
+that is the Firebase Storage bucket configured in core/firebase.py; setting
+EXPORT_STORAGE_BACKEND=local swaps in a directory on disk, for local
+development and tests.
+
+Both backends expose the same three operations: open a path for streaming
+binary writes, build a time-limited download URL, and delete a path.
+"""
+
+import os
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+from firebase_admin import storage
+
+from ..core.config import settings
+
+# Files under this prefix in the bucket (or the local directory)
+EXPORT_PATH_PREFIX = "exports"
+
+# Upload in chunks of this size (must be a multiple of 256 KiB for GCS)
+EXPORT_UPLOAD_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+class FirebaseExportStorage:
+    """Export files in the Firebase Storage bucket, downloaded via signed URLs."""
+
+    def __init__(self):
+        self.bucket = storage.bucket()
+
+    def open_writer(self, path: str, content_type: str) -> BinaryIO:
+        """Open a resumable upload; data is sent as the buffer fills."""
+        blob = self.bucket.blob(path, chunk_size=EXPORT_UPLOAD_CHUNK_BYTES)
+        # ignore_flush: gzip.GzipFile flushes its target, which a resumable
+        # upload can't do before the next full chunk
+        return blob.open("wb", ignore_flush=True, content_type=content_type)
+
+    def download_url(self, path: str, expires_in: timedelta, filename: str) -> str:
+        blob = self.bucket.blob(path)
+        return blob.generate_signed_url(
+            version="v4",
+            expiration=expires_in,
+            method="GET",
+            response_disposition=f"attachment; filename={filename}",
+        )
+
+    def delete(self, path: str) -> None:
+        self.bucket.blob(path).delete()
+
+
+class LocalExportStorage:
+    """Export files in a local directory, returned as file:// URLs."""
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    def _resolve(self, path: str) -> Path:
+        full_path = (self.root / path).resolve()
+        if self.root not in full_path.parents:
+            raise ValueError(f"Invalid export path: {path}")
+        return full_path
+
+    def open_writer(self, path: str, content_type: str) -> BinaryIO:
+        full_path = self._resolve(path)
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        return open(full_path, "wb")
+
+    def download_url(self, path: str, expires_in: timedelta, filename: str) -> str:
+        return self._resolve(path).as_uri()
+
+    def delete(self, path: str) -> None:
+        full_path = self._resolve(path)
+        if full_path.exists():
+            os.remove(full_path)
+
+
+@lru_cache()
+def get_export_storage():
+    """Return the configured export storage backend."""
+    if settings.EXPORT_STORAGE_BACKEND == "local":
+        return LocalExportStorage(settings.EXPORT_LOCAL_DIR)
+    return FirebaseExportStorage()
@@ -0,0 +1,505 @@
+"""
+Admin data exports.
+
+Exports are streamed: documents are read from Firestore one page at a time
+(`core.projection.stream_selected`), each page is turned into rows, and the
+rows are written to a small CSV buffer that is flushed as a chunk whenever it
+grows past EXPORT_CHUNK_BYTES. Memory stays flat and the first bytes reach
+the client before the collection has been read.
+
+User, mentor and session exports can also be incremental: with `since`, only
+documents whose `updatedAt` / `updated_at` is later are read (an indexed
+range query), followed by tombstone rows for documents deleted since then.
+Deletions are recorded in TOMBSTONES_COLLECTION by `add_tombstone_to_batch`.
+"""
+
+import csv
+import io
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Optional
+
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from ..core.firebase import async_db
+from ..core.projection import stream_selected
+
+# Documents read per Firestore page
+EXPORT_PAGE_SIZE = 500
+
+# Flush the CSV buffer to the client once it holds this many characters
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Deleted documents, reported as tombstones by delta exports
+TOMBSTONES_COLLECTION = "deleted_documents"
+
+# Extra column of delta exports; True marks a tombstone row
+DELETED_COLUMN = "deleted"
+
+# Field masks for export queries (see core.projection)
+USER_EXPORT_FIELDS = [
+    "email",
+    "displayName",
+    "role",
+    "status",
+    "authProvider",
+    "isAdmin",
+    "emailNotifications",
+    "language",
+    "createdAt",
+    "updatedAt",
+    "lastLoginAt",
+    "profile.phone",
+    "profile.linkedIn",
+    "profile.bio",
+    "profile.course",
+    "profile.graduationYear",
+    "profile.company",
+    "profile.position",
+    "profile.expertise",
+]
+
+MENTOR_EXPORT_FIELDS = [
+    "email",
+    "displayName",
+    "status",
+    "authProvider",
+    "isAdmin",
+    "createdAt",
+    "updatedAt",
+    "lastLoginAt",
+    "photoURL",
+    "mentorProfile.title",
+    "mentorProfile.company",
+    "mentorProfile.bio",
+    "mentorProfile.linkedin",
+    "mentorProfile.photoURL",
+    "mentorProfile.tags",
+    "mentorProfile.expertise",
+    "mentorProfile.course",
+    "mentorProfile.graduationYear",
+    "mentorProfile.isUnicampAlumni",
+    "mentorProfile.unicampDegreeLevel",
+    "mentorProfile.alternativeUniversity",
+    "mentorProfile.patronosRelation",
+    "mentorProfile.isActive",
+    "mentorProfile.isProfileComplete",
+]
+
+
+SESSION_EXPORT_FIELDS = [
+    "status",
+    "booking_method",
+    "student_uid",
+    "student_name",
+    "student_email",
+    "mentor_id",
+    "mentor_name",
+    "mentor_email",
+    "mentor_company",
+    "message",
+    "created_at",
+    "updated_at",
+    "completed_at",
+]
+
+# Columns of the feedback export, named after the token form's fields (see
+# normalize_feedback_document for feedback sent from the app)
+FEEDBACK_EXPORT_FIELDS = [
+    "session_id",
+    "respondent_type",
+    "respondent_uid",
+    "respondent_email",
+    "respondent_name",
+    "meeting_status",
+    "no_meeting_reason",
+    "rating",
+    "additional_feedback",
+    "submitted_at",
+]
+
+# Fields read from session_feedback: the token form's plus those of the
+# documents written by the in-app session endpoints
+FEEDBACK_SOURCE_FIELDS = [
+    *FEEDBACK_EXPORT_FIELDS,
+    "user_uid",
+    "user_email",
+    "user_role",
+    "comments",
+    "created_at",
+]
+
+# Respondent type of in-app feedback, by the user's role
+FEEDBACK_ROLE_RESPONDENT_TYPES = {"estudante": "student", "mentor": "mentor"}
+
+
+# The `token` field authorizes the feedback form and is never exported
+FEEDBACK_REQUEST_EXPORT_FIELDS = [
+    "session_id",
+    "recipient_type",
+    "recipient_email",
+    "recipient_name",
+    "email_sent",
+    "submitted",
+    "created_at",
+    "sent_at",
+]
+
+
+USER_EXPORT_COLUMNS = [
+    "uid",
+    "email",
+    "displayName",
+    "role",
+    "status",
+    "authProvider",
+    "isAdmin",
+    "emailNotifications",
+    "language",
+    "createdAt",
+    "updatedAt",
+    "lastLoginAt",
+    # Profile fields
+    "profile_phone",
+    "profile_linkedIn",
+    "profile_bio",
+    "profile_course",
+    "profile_graduationYear",
+    "profile_company",
+    "profile_position",
+    "profile_expertise",
+]
+
+MENTOR_EXPORT_COLUMNS = [
+    "uid",
+    "email",
+    "displayName",
+    "status",
+    "authProvider",
+    "isAdmin",
+    "createdAt",
+    "updatedAt",
+    "lastLoginAt",
+    # Mentor profile fields
+    "title",
+    "company",
+    "bio",
+    "linkedin",
+    "photoURL",
+    "tags",
+    "expertise",
+    "course",
+    "graduationYear",
+    "isUnicampAlumni",
+    "unicampDegreeLevel",
+    "alternativeUniversity",
+    "patronosRelation",
+    "isActive",
+    "isProfileComplete",
+]
+
+SESSION_EXPORT_COLUMNS = ["id", *SESSION_EXPORT_FIELDS]
+
+FEEDBACK_EXPORT_COLUMNS = ["id", *FEEDBACK_EXPORT_FIELDS]
+
+FEEDBACK_REQUEST_EXPORT_COLUMNS = ["id", *FEEDBACK_REQUEST_EXPORT_FIELDS]
+
+# Timestamp fields of sessions and feedback, formatted like the user exports
+_DATETIME_FIELDS = ("created_at", "updated_at", "completed_at", "submitted_at", "sent_at")
+
+
+def format_datetime_for_csv(dt) -> str:
+    """Format datetime for CSV export."""
+    if dt is None:
+        return ""
+    if isinstance(dt, datetime):
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    return str(dt)
+
+
+def list_to_csv_string(items: list) -> str:
+    """Convert a list to a comma-separated string for CSV."""
+    if not items:
+        return ""
+    return "; ".join(str(item) for item in items)
+
+
+def user_export_row(doc_id: str, data: dict) -> dict:
+    """Build the CSV row for a user document."""
+    profile = data.get("profile", {}) or {}
+
+    return {
+        "uid": doc_id,
+        "email": data.get("email", ""),
+        "displayName": data.get("displayName", ""),
+        "role": data.get("role", ""),
+        "status": data.get("status", ""),
+        "authProvider": data.get("authProvider", ""),
+        "isAdmin": data.get("isAdmin", False),
+        "emailNotifications": data.get("emailNotifications", True),
+        "language": data.get("language", "pt-BR"),
+        "createdAt": format_datetime_for_csv(data.get("createdAt")),
+        "updatedAt": format_datetime_for_csv(data.get("updatedAt")),
+        "lastLoginAt": format_datetime_for_csv(data.get("lastLoginAt")),
+        # Profile fields
+        "profile_phone": profile.get("phone", ""),
+        "profile_linkedIn": profile.get("linkedIn", ""),
+        "profile_bio": profile.get("bio", ""),
+        "profile_course": profile.get("course", ""),
+        "profile_graduationYear": profile.get("graduationYear", ""),
+        "profile_company": profile.get("company", ""),
+        "profile_position": profile.get("position", ""),
+        "profile_expertise": list_to_csv_string(profile.get("expertise", [])),
+    }
+
+
+def mentor_export_row(doc_id: str, data: dict) -> dict:
+    """Build the CSV row for a mentor document."""
+    mentor_profile = data.get("mentorProfile", {}) or {}
+
+    return {
+        "uid": doc_id,
+        "email": data.get("email", ""),
+        "displayName": data.get("displayName", ""),
+        "status": data.get("status", ""),
+        "authProvider": data.get("authProvider", ""),
+        "isAdmin": data.get("isAdmin", False),
+        "createdAt": format_datetime_for_csv(data.get("createdAt")),
+        "updatedAt": format_datetime_for_csv(data.get("updatedAt")),
+        "lastLoginAt": format_datetime_for_csv(data.get("lastLoginAt")),
+        # Mentor profile fields
+        "title": mentor_profile.get("title", ""),
+        "company": mentor_profile.get("company", ""),
+        "bio": mentor_profile.get("bio", ""),
+        "linkedin": mentor_profile.get("linkedin", ""),
+        "photoURL": mentor_profile.get("photoURL") or data.get("photoURL", ""),
+        "tags": list_to_csv_string(mentor_profile.get("tags", [])),
+        "expertise": list_to_csv_string(mentor_profile.get("expertise", [])),
+        "course": mentor_profile.get("course", ""),
+        "graduationYear": mentor_profile.get("graduationYear", ""),
+        "isUnicampAlumni": mentor_profile.get("isUnicampAlumni", ""),
+        "unicampDegreeLevel": mentor_profile.get("unicampDegreeLevel", ""),
+        "alternativeUniversity": mentor_profile.get("alternativeUniversity", ""),
+        "patronosRelation": mentor_profile.get("patronosRelation", ""),
+        "isActive": mentor_profile.get("isActive", True),
+        "isProfileComplete": mentor_profile.get("isProfileComplete", False),
+    }
+
+
+def flat_export_row(doc_id: str, data: dict, fields: list[str]) -> dict:
+    """Build the CSV row for a document whose export columns are top-level fields."""
+    row = {"id": doc_id}
+    for field in fields:
+        value = data.get(field)
+        if field in _DATETIME_FIELDS:
+            value = format_datetime_for_csv(value)
+        row[field] = "" if value is None else value
+    return row
+
+
+def normalize_feedback_document(data: dict) -> dict:
+    """
+    Map a session_feedback document onto the token form's fields.
+
+    Feedback sent from the app (submit_session_feedback and
+    complete_session_with_feedback) stores user_uid, user_email, user_role,
+    comments and created_at instead; fields set by the token form win.
+    """
+    return {
+        **data,
+        "respondent_type": data.get("respondent_type") or FEEDBACK_ROLE_RESPONDENT_TYPES.get(data.get("user_role")),
+        "respondent_uid": data.get("respondent_uid") or data.get("user_uid"),
+        "respondent_email": data.get("respondent_email") or data.get("user_email"),
+        "additional_feedback": data.get("additional_feedback") or data.get("comments"),
+        "submitted_at": data.get("submitted_at") or data.get("created_at"),
+    }
+
+
+def delta_columns(columns: list[str]) -> list[str]:
+    """Columns of a delta export: the full export's plus DELETED_COLUMN."""
+    return [*columns, DELETED_COLUMN]
+
+
+def add_tombstone_to_batch(batch, collection: str, doc_id: str, role: Optional[str] = None) -> None:
+    """
+    Record a deletion for delta exports.
+
+    Commit it in the same batch as the delete itself. `role` lets the mentor
+    export tell deleted mentors apart from other users.
+    """
+    ref = async_db.collection(TOMBSTONES_COLLECTION).document(f"{collection}_{doc_id}")
+    batch.set(ref, {
+        "collection": collection,
+        "doc_id": doc_id,
+        "role": role,
+        "deleted_at": datetime.now(timezone.utc),
+    })
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Clients may send naive timestamps; Firestore stores UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def _delta_documents(query, updated_field: str, since: Optional[datetime], fields: list[str], label: str):
+    """Stream a full export query, or only documents changed after `since`."""
+    if since is None:
+        async for item in stream_selected(query, fields, label, EXPORT_PAGE_SIZE):
+            yield item
+        return
+
+    query = query.where(filter=FieldFilter(updated_field, ">", _as_utc(since)))
+    async for item in stream_selected(query, fields, f"{label}.delta", EXPORT_PAGE_SIZE, order_field=updated_field):
+        yield item
+
+
+async def _tombstone_rows(
+    collection: str,
+    id_column: str,
+    since: datetime,
+    role: Optional[str] = None,
+) -> AsyncIterator[dict]:
+    """Yield a tombstone row for every document of a collection deleted after `since`."""
+    query = (
+        async_db.collection(TOMBSTONES_COLLECTION)
+        .where(filter=FieldFilter("collection", "==", collection))
+        .where(filter=FieldFilter("deleted_at", ">", _as_utc(since)))
+    )
+    async for _, data in stream_selected(
+        query, ["doc_id", "role", "deleted_at"], f"exports.tombstones.{collection}",
+        EXPORT_PAGE_SIZE, order_field="deleted_at",
+    ):
+        if role is None or data.get("role") == role:
+            yield {id_column: data["doc_id"], DELETED_COLUMN: True}
+
+
+async def user_export_rows(since: Optional[datetime] = None) -> AsyncIterator[dict]:
+    """Yield the CSV row of every user (changed after `since`, with tombstones, if given)."""
+    query = async_db.collection("users")
+    async for doc_id, data in _delta_documents(query, "updatedAt", since, USER_EXPORT_FIELDS, "exports.users"):
+        row = user_export_row(doc_id, data)
+        if since is not None:
+            row[DELETED_COLUMN] = False
+        yield row
+
+    if since is not None:
+        async for row in _tombstone_rows("users", "uid", since):
+            yield row
+
+
+async def mentor_export_rows(since: Optional[datetime] = None) -> AsyncIterator[dict]:
+    """Yield the CSV row of every mentor (changed after `since`, with tombstones, if given)."""
+    query = async_db.collection("users").where("role", "==", "mentor")
+    async for doc_id, data in _delta_documents(query, "updatedAt", since, MENTOR_EXPORT_FIELDS, "exports.mentors"):
+        row = mentor_export_row(doc_id, data)
+        if since is not None:
+            row[DELETED_COLUMN] = False
+        yield row
+
+    if since is not None:
+        async for row in _tombstone_rows("users", "uid", since, role="mentor"):
+            yield row
+
+
+async def session_export_rows(since: Optional[datetime] = None) -> AsyncIterator[dict]:
+    """Yield the CSV row of every session (changed after `since`, with tombstones, if given)."""
+    query = async_db.collection("sessions")
+    async for doc_id, data in _delta_documents(query, "updated_at", since, SESSION_EXPORT_FIELDS, "exports.sessions"):
+        row = flat_export_row(doc_id, data, SESSION_EXPORT_FIELDS)
+        if since is not None:
+            row[DELETED_COLUMN] = False
+        yield row
+
+    if since is not None:
+        async for row in _tombstone_rows("sessions", "id", since):
+            yield row
+
+
+async def feedback_export_rows() -> AsyncIterator[dict]:
+    """Yield the CSV row of every submitted feedback form."""
+    query = async_db.collection("session_feedback")
+    async for doc_id, data in stream_selected(query, FEEDBACK_SOURCE_FIELDS, "exports.feedback", EXPORT_PAGE_SIZE):
+        yield flat_export_row(doc_id, normalize_feedback_document(data), FEEDBACK_EXPORT_FIELDS)
+
+
+async def feedback_request_export_rows() -> AsyncIterator[dict]:
+    """Yield the CSV row of every feedback request (without its token)."""
+    query = async_db.collection("feedback_requests")
+    async for doc_id, data in stream_selected(
+        query, FEEDBACK_REQUEST_EXPORT_FIELDS, "exports.feedback_requests", EXPORT_PAGE_SIZE
+    ):
+        yield flat_export_row(doc_id, data, FEEDBACK_REQUEST_EXPORT_FIELDS)
+
+
+# Datasets available to export jobs: columns, row source, collection (for the
+# progress estimate) and the download file name prefix
+EXPORT_DATASETS = {
+    "users": {
+        "columns": USER_EXPORT_COLUMNS,
+        "rows": user_export_rows,
+        "count_query": lambda: async_db.collection("users"),
+        "filename": "usuarios",
+    },
+    "mentors": {
+        "columns": MENTOR_EXPORT_COLUMNS,
+        "rows": mentor_export_rows,
+        "count_query": lambda: async_db.collection("users").where("role", "==", "mentor"),
+        "filename": "mentores",
+    },
+    "sessions": {
+        "columns": SESSION_EXPORT_COLUMNS,
+        "rows": session_export_rows,
+        "count_query": lambda: async_db.collection("sessions"),
+        "filename": "sessoes",
+    },
+    "feedback": {
+        "columns": FEEDBACK_EXPORT_COLUMNS,
+        "rows": feedback_export_rows,
+        "count_query": lambda: async_db.collection("session_feedback"),
+        "filename": "feedback",
+    },
+    "feedback_requests": {
+        "columns": FEEDBACK_REQUEST_EXPORT_COLUMNS,
+        "rows": feedback_request_export_rows,
+        "count_query": lambda: async_db.collection("feedback_requests"),
+        "filename": "solicitacoes_feedback",
+    },
+}
+
+
+async def stream_csv(
+    rows: AsyncIterator[dict],
+    columns: list[str],
+    on_complete: Optional[Callable[[int], None]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Encode rows as CSV, yielding UTF-8 chunks of about EXPORT_CHUNK_BYTES.
+
+    The header is yielded before the first row is read, so the response
+    starts immediately. One buffer is reused for the whole export.
+
+    Args:
+        rows: Row dicts keyed by column name
+        columns: CSV header, in order
+        on_complete: Called with the number of rows once every row is written
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    yield buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+
+    count = 0
+    async for row in rows:
+        writer.writerow(row)
+        count += 1
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+    if on_complete is not None:
+        on_complete(count)
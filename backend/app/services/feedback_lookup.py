@@ -0,0 +1,138 @@
+"""
+Batched lookups of feedback requests and responses for sessions.
+
+Feedback documents use deterministic ids (`{session_id}_student` and
+`{session_id}_mentor`) in both `feedback_requests` and `session_feedback`,
+so the documents for many sessions can be fetched with a single `get_all`
+call instead of one `get()` per document.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from ..core.firebase import async_db
+from ..models.feedback import FeedbackResponse, SessionFeedbackSummary
+
+logger = logging.getLogger(__name__)
+
+RECIPIENT_TYPES = ("student", "mentor")
+
+# Sessions resolved per get_all call
+FEEDBACK_BATCH_SIZE = 100
+
+
+def feedback_doc_id(session_id: str, recipient_type: str) -> str:
+    """Build the deterministic feedback document id for a session participant."""
+    return f"{session_id}_{recipient_type}"
+
+
+async def get_feedback_documents(
+    session_ids: list[str],
+    include_responses: bool = True,
+) -> dict[str, dict[str, Optional[dict]]]:
+    """
+    Fetch feedback requests (and optionally responses) for many sessions.
+
+    Args:
+        session_ids: Session IDs to look up
+        include_responses: Also fetch `session_feedback` documents
+
+    Returns:
+        Dict keyed by session ID. Each value maps `student_request`,
+        `mentor_request`, `student_feedback` and `mentor_feedback` to the
+        document data, or None when the document does not exist.
+    """
+    collections = {"feedback_requests": "request"}
+    if include_responses:
+        collections["session_feedback"] = "feedback"
+
+    results: dict[str, dict[str, Optional[dict]]] = {
+        session_id: {
+            f"{recipient_type}_{suffix}": None
+            for suffix in ("request", "feedback")
+            for recipient_type in RECIPIENT_TYPES
+        }
+        for session_id in session_ids
+    }
+    if not session_ids:
+        return results
+
+    # Map each document path back to (session_id, result key)
+    refs = []
+    ref_keys: dict[str, tuple[str, str]] = {}
+    for session_id in session_ids:
+        for collection, suffix in collections.items():
+            for recipient_type in RECIPIENT_TYPES:
+                ref = async_db.collection(collection).document(
+                    feedback_doc_id(session_id, recipient_type)
+                )
+                refs.append(ref)
+                ref_keys[ref.path] = (session_id, f"{recipient_type}_{suffix}")
+
+    batch_size = FEEDBACK_BATCH_SIZE * len(collections) * len(RECIPIENT_TYPES)
+    start_time = time.perf_counter()
+    round_trips = 0
+    for i in range(0, len(refs), batch_size):
+        round_trips += 1
+        async for snapshot in async_db.get_all(refs[i:i + batch_size]):
+            if not snapshot.exists:
+                continue
+            session_id, key = ref_keys[snapshot.reference.path]
+            results[session_id][key] = snapshot.to_dict()
+
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(
+        f"Fetched feedback documents for {len(session_ids)} sessions",
+        extra={
+            "extra_fields": {
+                "sessions": len(session_ids),
+                "document_reads": len(refs),
+                "round_trips": round_trips,
+                # What the per-document lookups used to cost
+                "unbatched_round_trips": len(refs),
+                "duration_ms": round(duration_ms, 2),
+            }
+        },
+    )
+
+    return results
+
+
+def build_feedback_response(data: Optional[dict]) -> Optional[FeedbackResponse]:
+    """Build a FeedbackResponse from a `session_feedback` document."""
+    if not data:
+        return None
+    return FeedbackResponse(
+        id=data["id"],
+        session_id=data["session_id"],
+        respondent_type=data["respondent_type"],
+        respondent_name=data["respondent_name"],
+        meeting_status=data["meeting_status"],
+        no_meeting_reason=data.get("no_meeting_reason"),
+        rating=data.get("rating"),
+        additional_feedback=data.get("additional_feedback"),
+        submitted_at=data.get("submitted_at"),
+    )
+
+
+def build_feedback_summary(
+    session_data: dict,
+    feedback_docs: dict[str, Optional[dict]],
+) -> SessionFeedbackSummary:
+    """Build the admin feedback summary for a session from prefetched documents."""
+    student_request = feedback_docs.get("student_request") or {}
+    mentor_request = feedback_docs.get("mentor_request") or {}
+
+    return SessionFeedbackSummary(
+        session_id=session_data["id"],
+        student_name=session_data["student_name"],
+        student_email=session_data["student_email"],
+        mentor_name=session_data["mentor_name"],
+        mentor_email=session_data["mentor_email"],
+        session_created_at=session_data.get("created_at"),
+        student_feedback_sent=student_request.get("email_sent", False),
+        mentor_feedback_sent=mentor_request.get("email_sent", False),
+        student_feedback=build_feedback_response(feedback_docs.get("student_feedback")),
+        mentor_feedback=build_feedback_response(feedback_docs.get("mentor_feedback")),
+    )
@@ -0,0 +1,159 @@
+"""
+Checkpointed sweep over sessions for the feedback scheduler.
+
+Instead of scanning one calendar day, the daily feedback job walks every
+session old enough to get a feedback request, in `(created_at, id)` order,
+starting after the high-water mark stored in a checkpoint document. The
+checkpoint advances after each page, so a run that times out or fails
+resumes where it stopped, and days missed by the scheduler are caught up by
+the next run.
+
+The checkpoint never moves past a request whose send failed with a transient
+error, so it is retried by the next run. Permanent errors (an invalid
+recipient) and requests that failed FEEDBACK_EMAIL_MAX_ATTEMPTS times are
+marked `email_failed` on the feedback request and skipped, so one bad
+address can't hold back every later session.
+
+The checkpoint document also works as a lease: a run claims it with a
+`last_update_time` precondition, so two overlapping scheduler calls don't
+sweep the same sessions at once.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from google.api_core.exceptions import AlreadyExists, FailedPrecondition
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from ..core.firebase import async_db
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_COLLECTION = "scheduler_checkpoints"
+FEEDBACK_SWEEP_ID = "feedback_requests"
+
+# Sessions become eligible for a feedback request this long after creation
+FEEDBACK_DELAY_DAYS = 5
+
+# Sessions read and processed per page
+SWEEP_PAGE_SIZE = 200
+
+# A run stops starting new pages after this many seconds and leaves the rest
+# to the next run. Kept below the 180s default attempt deadline of Cloud
+# Scheduler HTTP jobs (feedback-requests-daily doesn't set one), leaving time
+# for the page in progress.
+SWEEP_TIME_BUDGET_SECONDS = 120
+
+# Failed sends of one feedback request before the sweep stops retrying it
+FEEDBACK_EMAIL_MAX_ATTEMPTS = 5
+
+# How long a claimed checkpoint stays reserved for the run that claimed it
+SWEEP_LEASE_SECONDS = 600
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def feedback_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Sessions created at or before this moment are due for feedback."""
+    return (now or _now()) - timedelta(days=FEEDBACK_DELAY_DAYS)
+
+
+def _checkpoint_ref():
+    return async_db.collection(CHECKPOINT_COLLECTION).document(FEEDBACK_SWEEP_ID)
+
+
+async def claim_feedback_sweep() -> Optional[dict]:
+    """
+    Claim the sweep checkpoint for this run.
+
+    The first run ever starts at the beginning of the day that is
+    FEEDBACK_DELAY_DAYS ago, like the old single-day job, rather than
+    emailing every historical session.
+
+    Returns:
+        The checkpoint data ({"last_created_at", "last_session_id", ...}),
+        or None if another run holds the lease.
+    """
+    ref = _checkpoint_ref()
+    now = _now()
+    lease = {"running_until": now + timedelta(seconds=SWEEP_LEASE_SECONDS), "updated_at": now}
+
+    snapshot = await ref.get()
+    if not snapshot.exists:
+        start = feedback_cutoff(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        data = {
+            # Start at, not after, the first session of that day
+            "last_created_at": start - timedelta(microseconds=1),
+            "last_session_id": None,
+            "last_run": None,
+            **lease,
+        }
+        try:
+            await ref.create(data)
+        except AlreadyExists:
+            return None
+        return data
+
+    data = snapshot.to_dict()
+    running_until = data.get("running_until")
+    if running_until and running_until > now:
+        return None
+
+    try:
+        await ref.update(lease, option=async_db.write_option(last_update_time=snapshot.update_time))
+    except FailedPrecondition:
+        return None
+    return {**data, **lease}
+
+
+async def fetch_sweep_page(checkpoint: dict, cutoff: datetime, limit: int = SWEEP_PAGE_SIZE) -> list[dict]:
+    """
+    Read the next page of sessions after the checkpoint, oldest first.
+
+    Ordering by `created_at` then document id makes the position unique even
+    when sessions share a timestamp. A range and order on the same field
+    only needs the automatic single-field index.
+    """
+    query = (
+        async_db.collection("sessions")
+        .where(filter=FieldFilter("created_at", "<=", cutoff))
+        .order_by("created_at")
+        .order_by("__name__")
+    )
+    if checkpoint.get("last_session_id"):
+        query = query.start_after({
+            "created_at": checkpoint["last_created_at"],
+            "__name__": checkpoint["last_session_id"],
+        })
+    else:
+        query = query.where(filter=FieldFilter("created_at", ">", checkpoint["last_created_at"]))
+
+    return [doc.to_dict() async for doc in query.limit(limit).stream()]
+
+
+async def advance_feedback_sweep(checkpoint: dict, session_data: dict) -> None:
+    """Move the high-water mark past `session_data` (the last fully handled session)."""
+    checkpoint["last_created_at"] = session_data["created_at"]
+    checkpoint["last_session_id"] = session_data["id"]
+    await _checkpoint_ref().update({
+        "last_created_at": checkpoint["last_created_at"],
+        "last_session_id": checkpoint["last_session_id"],
+        "updated_at": _now(),
+    })
+
+
+async def release_feedback_sweep(run_stats: dict) -> None:
+    """Give up the lease and record a summary of the run."""
+    now = _now()
+    try:
+        await _checkpoint_ref().update({
+            "running_until": None,
+            "updated_at": now,
+            "last_run": {**run_stats, "finished_at": now},
+        })
+    except Exception as e:
+        # The lease expires on its own; the next run just starts a bit later
+        logger.error(f"Failed to release feedback sweep checkpoint: {e}")
@@ -0,0 +1,516 @@
+"""
+In-process cache of the public mentor catalog.
+
+Every student page view used to run the same `role == mentor AND status ==
+active` query and build a `MentorPublicResponse` per document. The catalog
+is now loaded once per instance and kept as an immutable snapshot holding
+the parsed mentors and the `GET /mentors` response already serialized to
+bytes, with a strong ETag derived from those bytes, so clients can
+revalidate with `If-None-Match` and get a 304.
+
+Endpoints that change what students see (mentor profile and photo updates,
+admin visibility changes, approvals) call `mentor_catalog.invalidate()`.
+Changes made elsewhere (other instances, scripts, the console) are picked up
+once the snapshot is older than MENTOR_CATALOG_TTL_SECONDS.
+
+With MENTOR_CATALOG_LISTENER enabled, `MentorCatalogListener` instead keeps a
+live snapshot in sync through a Firestore `on_snapshot` listener, so every
+instance sees every change within about a second. The TTL path is only used
+while the listener is not ready (before its first snapshot, or while it
+reconnects).
+
+Session counts (services/mentor_counters.py) are kept apart from the
+snapshot, in an immutable `SessionCounts`, and merged into the response only
+when GET /mentors is sorted by a count. A booking therefore doesn't change the
+catalog version or ETag, so the serialized body, the search index and the
+recommendation features and rankings built for a version stay valid. The
+counts are loaded at startup and refreshed in the background at most every
+COUNTS_REFRESH_SECONDS, reading only the counter shards that changed.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from typing import Optional
+
+from ..core.config import settings
+from ..core.firebase import async_db, db
+from ..core.projection import fetch_selected
+from ..models.mentor import MentorPublicResponse
+from .mentor_counters import SESSION_COUNTER_FIELDS, SessionCounterCache
+
+logger = logging.getLogger(__name__)
+
+# Fields read for the catalog (skips `profile` and internal mentorProfile data)
+MENTOR_LIST_FIELDS = [
+    "displayName",
+    "email",
+    "mentorProfile.title",
+    "mentorProfile.company",
+    "mentorProfile.bio",
+    "mentorProfile.photoURL",
+    "mentorProfile.tags",
+    "mentorProfile.expertise",
+    "mentorProfile.linkedin",
+    "mentorProfile.course",
+    "mentorProfile.schedulingLink",
+    "mentorProfile.isActive",
+]
+
+
+def mentor_public_response(doc_id: str, user_data: dict) -> MentorPublicResponse:
+    """Build the student-facing view of a mentor's user document."""
+    mentor_profile = user_data.get("mentorProfile", {}) or {}
+
+    return MentorPublicResponse(
+        id=doc_id,
+        name=user_data.get("displayName", ""),
+        email=user_data.get("email", ""),
+        title=mentor_profile.get("title", ""),
+        company=mentor_profile.get("company", ""),
+        bio=mentor_profile.get("bio", ""),
+        photoURL=mentor_profile.get("photoURL"),
+        tags=mentor_profile.get("tags", []),
+        expertise=mentor_profile.get("expertise", []),
+        linkedin=mentor_profile.get("linkedin", ""),
+        course=mentor_profile.get("course", ""),
+        schedulingLink=mentor_profile.get("schedulingLink", ""),
+    )
+
+
+# Fields that GET /mentors can filter on, indexed in every snapshot
+FILTER_FIELDS = ("tags", "expertise", "course", "company")
+
+# Session counts are re-read at most this often, in seconds
+COUNTS_REFRESH_SECONDS = 30
+
+
+def normalize_filter_value(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+class SessionCounts:
+    """One immutable set of per-mentor session counts. Never modified after creation."""
+
+    def __init__(self, counts: dict[str, dict[str, int]]):
+        self.counts = counts
+        self.digest = hashlib.sha256(repr(sorted(counts.items())).encode("utf-8")).hexdigest()[:32]
+        # Each mentor's counts as JSON members, appended to the mentor's object
+        self._json = {mentor_id: self._members(mentor_counts) for mentor_id, mentor_counts in counts.items()}
+        self._no_sessions_json = self._members({})
+        # Sort keys per (catalog version, field), built on first use
+        self._sort_keys: dict[tuple[int, str], list[int]] = {}
+
+    @staticmethod
+    def _members(mentor_counts: dict[str, int]) -> bytes:
+        return "".join(
+            f',"{field}":{int(mentor_counts.get(field, 0))}' for field in SESSION_COUNTER_FIELDS
+        ).encode("utf-8")
+
+    def sort_keys(self, snapshot: "CatalogSnapshot", field: str) -> list[int]:
+        """Values of `field` for the snapshot's mentors, by position."""
+        keys = self._sort_keys.get((snapshot.version, field))
+        if keys is None:
+            keys = [self.counts.get(mentor.id, {}).get(field, 0) for mentor in snapshot.mentors]
+            # Keys for older catalog versions are no longer needed
+            self._sort_keys = {key: value for key, value in self._sort_keys.items() if key[0] == snapshot.version}
+            self._sort_keys[(snapshot.version, field)] = keys
+        return keys
+
+    def merge_json(self, mentor_id: str, mentor_json: bytes) -> bytes:
+        """A serialized mentor (without counts) with its counts added."""
+        return mentor_json[:-1] + self._json.get(mentor_id, self._no_sessions_json) + b"}"
+
+
+class CatalogSnapshot:
+    """One immutable version of the catalog. Never modified after creation."""
+
+    def __init__(self, version: int, mentors: list[MentorPublicResponse]):
+        self.version = version
+        self.mentors = mentors
+        self.by_id = {mentor.id: mentor for mentor in mentors}
+        # Each mentor serialized once, without session counts; filtered
+        # responses are assembled from these
+        self._mentor_json = [
+            mentor.model_dump_json(exclude=set(SESSION_COUNTER_FIELDS)).encode("utf-8") for mentor in mentors
+        ]
+        self.body = self.response_body(range(len(mentors)))
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.index = self._build_index()
+        self.built_at = time.monotonic()
+
+    def _build_index(self) -> dict[str, dict[str, int]]:
+        """
+        Inverted index: field -> normalized value -> bitmap of mentor positions.
+
+        Bitmaps are Python ints (bit i set = self.mentors[i] has the value), so
+        AND/OR across values is a single integer operation.
+        """
+        index: dict[str, dict[str, int]] = {field: {} for field in FILTER_FIELDS}
+        for position, mentor in enumerate(self.mentors):
+            bit = 1 << position
+            for field in FILTER_FIELDS:
+                values = getattr(mentor, field) or []
+                for value in values if isinstance(values, list) else [values]:
+                    key = normalize_filter_value(value)
+                    if key:
+                        index[field][key] = index[field].get(key, 0) | bit
+        return index
+
+    def select(self, filters: dict[str, list[str]], match_all: bool = True) -> list[int]:
+        """
+        Positions of the mentors matching the filters, in catalog order.
+
+        Args:
+            filters: Field (one of FILTER_FIELDS) -> requested values
+            match_all: True to require every value (AND), False for any (OR)
+        """
+        everyone = (1 << len(self.mentors)) - 1
+        bitmap = everyone if match_all else 0
+        for field, values in filters.items():
+            field_index = self.index[field]
+            for value in values:
+                matches = field_index.get(normalize_filter_value(value), 0)
+                bitmap = bitmap & matches if match_all else bitmap | matches
+
+        positions = []
+        while bitmap:
+            lowest = bitmap & -bitmap
+            positions.append(lowest.bit_length() - 1)
+            bitmap ^= lowest
+        return positions
+
+    def sort(self, positions, field: str, counts: SessionCounts, descending: bool = False) -> list[int]:
+        """Positions ordered by a session count; ties keep catalog order."""
+        keys = counts.sort_keys(self, field)
+        return sorted(positions, key=keys.__getitem__, reverse=descending)
+
+    def response_body(self, positions, counts: Optional[SessionCounts] = None) -> bytes:
+        """Serialized MentorListResponse for the mentors at `positions`, with `counts` if given."""
+        if counts is None:
+            parts = [self._mentor_json[position] for position in positions]
+        else:
+            parts = [
+                counts.merge_json(self.mentors[position].id, self._mentor_json[position])
+                for position in positions
+            ]
+        return b'{"mentors":[' + b",".join(parts) + b'],"total":' + str(len(parts)).encode() + b"}"
+
+
+class MentorCatalog:
+    """Process-wide catalog of active mentors, reloaded on invalidation or TTL."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # When self._snapshot was read
+        self._loaded_at = 0.0
+        # Kept up to date by MentorCatalogListener; None while it's not ready
+        self._live: Optional[CatalogSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._counts_lock = asyncio.Lock()
+        # Snapshots are built from the listener's thread too
+        self._build_lock = threading.Lock()
+        self.counters = SessionCounterCache()
+        # None until the first refresh_counts()
+        self._counts: Optional[SessionCounts] = None
+        self._counts_checked_at: Optional[float] = None
+        self._counts_task: Optional[asyncio.Task] = None
+        # Bumped by invalidate(); a load that started before the bump is not kept
+        self._generation = 0
+        self._version = 0
+        self.hits = 0
+        self.loads = 0
+        self.invalidations = 0
+
+    def _is_fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        return snapshot is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def _counts_due(self) -> bool:
+        return (
+            self._counts_checked_at is None
+            or time.monotonic() - self._counts_checked_at >= COUNTS_REFRESH_SECONDS
+        )
+
+    def _build(self, mentors: list[MentorPublicResponse]) -> CatalogSnapshot:
+        """New snapshot of `mentors` (hold _build_lock)."""
+        self._version += 1
+        return CatalogSnapshot(self._version, mentors)
+
+    async def get(self) -> CatalogSnapshot:
+        """Return the current snapshot, loading it from Firestore if needed."""
+        live = self._live
+        if live is not None:
+            self.hits += 1
+            return live
+
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            self.hits += 1
+            return snapshot
+
+        # One load at a time; concurrent requests wait for it instead of
+        # running the same query
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                self.hits += 1
+                return snapshot
+
+            generation = self._generation
+            mentors = await self._load()
+            with self._build_lock:
+                snapshot = self._build(mentors)
+                if generation == self._generation:
+                    self._snapshot = snapshot
+                    self._loaded_at = time.monotonic()
+            logger.info(
+                f"Mentor catalog loaded: {len(mentors)} mentors",
+                extra={
+                    "extra_fields": {
+                        "version": snapshot.version,
+                        "mentors": len(mentors),
+                        "body_bytes": len(snapshot.body),
+                    }
+                },
+            )
+            return snapshot
+
+    async def _load(self) -> list[MentorPublicResponse]:
+        users_ref = async_db.collection("users")
+        query = users_ref.where("role", "==", "mentor").where("status", "==", "active")
+
+        mentors = []
+        for doc_id, user_data in await fetch_selected(query, MENTOR_LIST_FIELDS, "mentor_catalog.load"):
+            mentor_profile = user_data.get("mentorProfile", {}) or {}
+
+            # Skip mentors who are not active or don't have a profile
+            if not mentor_profile.get("isActive", True):
+                continue
+
+            mentors.append(mentor_public_response(doc_id, user_data))
+
+        self.loads += 1
+        return mentors
+
+    async def session_counts(self) -> SessionCounts:
+        """
+        Current session counts, for GET /mentors sorted by a count.
+
+        A due refresh runs in the background and the counts already loaded are
+        returned; only a request arriving before the first load (normally done
+        at startup) waits for it.
+        """
+        if self._counts is None:
+            await self.refresh_counts()
+        elif self._counts_due() and (self._counts_task is None or self._counts_task.done()):
+            self._counts_task = asyncio.create_task(self.refresh_counts(), name="mentor-session-counts")
+        return self._counts
+
+    async def refresh_counts(self) -> None:
+        """Re-read changed counter shards; publish new counts if one moved."""
+        async with self._counts_lock:
+            if not self._counts_due():
+                return
+            try:
+                await self.counters.refresh()
+            except Exception as e:
+                logger.warning(f"Could not refresh mentor session counts: {e}")
+            # Also recomputed without new writes: the 30-day window moves
+            counts = self.counters.totals()
+            self._counts_checked_at = time.monotonic()
+            if self._counts is None or counts != self._counts.counts:
+                self._counts = SessionCounts(counts)
+
+    def set_live(self, mentors: list[MentorPublicResponse]) -> CatalogSnapshot:
+        """Publish a snapshot built by the listener (called from its thread)."""
+        with self._build_lock:
+            snapshot = self._build(mentors)
+            self._live = snapshot
+        return snapshot
+
+    def clear_live(self) -> None:
+        """Fall back to the TTL path, e.g. while the listener reconnects."""
+        with self._build_lock:
+            self._live = None
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next request reloads it."""
+        self._generation += 1
+        self._snapshot = None
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        snapshot = self._live or self._snapshot
+        return {
+            "live": self._live is not None,
+            "version": snapshot.version if snapshot else None,
+            "mentors": len(snapshot.mentors) if snapshot else None,
+            "age_seconds": round(time.monotonic() - snapshot.built_at, 1) if snapshot else None,
+            "hits": self.hits,
+            "loads": self.loads,
+            "invalidations": self.invalidations,
+            "session_counts_checked_seconds_ago": (
+                round(time.monotonic() - self._counts_checked_at, 1) if self._counts_checked_at else None
+            ),
+            "session_counters": self.counters.stats(),
+        }
+
+
+mentor_catalog = MentorCatalog(settings.MENTOR_CATALOG_TTL_SECONDS)
+
+
+# How often the listener's stream is checked, in seconds
+LISTENER_CHECK_INTERVAL_SECONDS = 5
+
+# Backoff between reconnect attempts, in seconds
+LISTENER_RETRY_MIN_SECONDS = 1
+LISTENER_RETRY_MAX_SECONDS = 60
+
+# How long startup waits for the first snapshot before serving anyway
+LISTENER_READY_TIMEOUT_SECONDS = 10
+
+
+class MentorCatalogListener:
+    """
+    Keeps `mentor_catalog` live with a Firestore snapshot listener.
+
+    The Firestore client retries transient stream errors itself; when the
+    stream stops for good, the catalog falls back to the TTL path and the
+    listener is re-subscribed with exponential backoff.
+    """
+
+    def __init__(self, catalog: MentorCatalog):
+        self.catalog = catalog
+        self._task: Optional[asyncio.Task] = None
+        self._watch = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready_event: Optional[asyncio.Event] = None
+        # Parsed mentors by document id, for the current subscription
+        self._mentors: dict[str, MentorPublicResponse] = {}
+        self.snapshots = 0
+        self.reconnects = 0
+        self.last_snapshot_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once the catalog is being served from the listener."""
+        return self._ready_event is not None and self._ready_event.is_set()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._ready_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="mentor-catalog-listener")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Wait for the first snapshot. Returns whether it arrived in time."""
+        if self._ready_event is None:
+            return False
+        try:
+            await asyncio.wait_for(self._ready_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _subscribe(self):
+        self._mentors = {}
+        query = db.collection("users").where("role", "==", "mentor").where("status", "==", "active")
+        return query.on_snapshot(self._on_snapshot)
+
+    def _on_snapshot(self, docs, changes, read_time) -> None:
+        """Apply a batch of changes. Runs on the listener's thread."""
+        try:
+            for change in changes:
+                doc = change.document
+                data = doc.to_dict() or {}
+                mentor_profile = data.get("mentorProfile", {}) or {}
+                if change.type.name == "REMOVED" or not mentor_profile.get("isActive", True):
+                    self._mentors.pop(doc.id, None)
+                else:
+                    self._mentors[doc.id] = mentor_public_response(doc.id, data)
+
+            # `docs` is the full result set, in query order
+            mentors = [self._mentors[doc.id] for doc in docs if doc.id in self._mentors]
+            snapshot = self.catalog.set_live(mentors)
+        except Exception as e:
+            logger.error(f"Mentor catalog listener failed to apply changes: {e}")
+            return
+
+        self.snapshots += 1
+        self.last_snapshot_at = time.monotonic()
+        if not self.ready:
+            logger.info(
+                f"Mentor catalog listener ready: {len(mentors)} mentors",
+                extra={"extra_fields": {"version": snapshot.version, "mentors": len(mentors)}},
+            )
+        self._loop.call_soon_threadsafe(self._ready_event.set)
+
+    def _mark_down(self) -> None:
+        self.catalog.clear_live()
+        self._ready_event.clear()
+
+    async def _run(self) -> None:
+        retry_seconds = LISTENER_RETRY_MIN_SECONDS
+        while True:
+            try:
+                self._watch = await asyncio.to_thread(self._subscribe)
+                while self._watch.is_active:
+                    await asyncio.sleep(LISTENER_CHECK_INTERVAL_SECONDS)
+                logger.warning("Mentor catalog listener stopped, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Mentor catalog listener failed: {e}")
+            finally:
+                # Back off only while subscribing keeps failing
+                if self.ready:
+                    retry_seconds = LISTENER_RETRY_MIN_SECONDS
+                self._mark_down()
+                if self._watch is not None:
+                    watch, self._watch = self._watch, None
+                    try:
+                        await asyncio.to_thread(watch.unsubscribe)
+                    except Exception:
+                        pass
+
+            await asyncio.sleep(retry_seconds)
+            retry_seconds = min(retry_seconds * 2, LISTENER_RETRY_MAX_SECONDS)
+            self.reconnects += 1
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "ready": self.ready,
+            "snapshots": self.snapshots,
+            "reconnects": self.reconnects,
+            "seconds_since_snapshot": (
+                round(time.monotonic() - self.last_snapshot_at, 1) if self.last_snapshot_at else None
+            ),
+        }
+
+
+mentor_catalog_listener = MentorCatalogListener(mentor_catalog)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
@@ -0,0 +1,176 @@
+"""
+Per-mentor session counters (pending, completed, created in the last 30 days).
+
+Counting a mentor's sessions on demand is a scan of `sessions`, so counts
+are maintained incrementally instead: every write that creates a session or
+changes its status adds `Increment` updates to the same batch via
+`add_session_counter_updates`. Each mentor's counts are spread over
+SESSION_COUNTER_SHARDS documents in
+`mentor_session_stats/{mentor_id}/session_counter_shards/{n}`, one picked at
+random per write, so concurrent bookings of a popular mentor don't contend
+on a single document; a mentor's count is the sum over its shards.
+
+Sessions created per day are kept in a `created_days` map ("d20261017": n)
+on each shard; the 30-day count is summed from the days inside the window
+when the counts are read. Days that fall out of the window are deleted the
+next time the shard is read.
+
+`SessionCounterCache` keeps every shard in memory for the mentor catalog.
+After the first full read it only fetches shards whose `updated_at` moved
+(a collection group query), so refreshes cost one read per changed shard.
+"""
+
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from google.cloud.firestore_v1 import DELETE_FIELD, Increment, SERVER_TIMESTAMP
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from ..core.firebase import async_db
+
+logger = logging.getLogger(__name__)
+
+MENTOR_STATS_COLLECTION = "mentor_session_stats"
+COUNTER_SHARDS_COLLECTION = "session_counter_shards"
+
+# Shards per mentor; each absorbs roughly one write per second
+SESSION_COUNTER_SHARDS = 8
+
+# Window of the recent-sessions count, in days
+RECENT_SESSIONS_DAYS = 30
+
+# Counts exposed for each mentor, also the fields GET /mentors can sort by
+SESSION_COUNTER_FIELDS = ("pending_sessions", "completed_sessions", "sessions_last_30_days")
+
+
+def _day_key(day: datetime) -> str:
+    return f"d{day:%Y%m%d}"
+
+
+def counter_shard_ref(mentor_id: str, shard: int):
+    return (
+        async_db.collection(MENTOR_STATS_COLLECTION)
+        .document(mentor_id)
+        .collection(COUNTER_SHARDS_COLLECTION)
+        .document(str(shard))
+    )
+
+
+def add_session_counter_updates(
+    batch,
+    mentor_id: str,
+    pending: int = 0,
+    completed: int = 0,
+    created_on: Optional[datetime] = None,
+) -> None:
+    """
+    Add a mentor's counter changes to a write batch (or transaction).
+
+    Args:
+        batch: Batch that also writes the session, so both apply together
+        mentor_id: The session's `mentor_id`
+        pending: Change in pending sessions (+1 created, -1 completed)
+        completed: Change in completed sessions
+        created_on: Set for a new session, counted on that (UTC) day
+    """
+    if not mentor_id:
+        return
+
+    data = {
+        "mentor_id": mentor_id,
+        "pending": Increment(pending),
+        "completed": Increment(completed),
+        "updated_at": SERVER_TIMESTAMP,
+    }
+    if created_on is not None:
+        data["created_days"] = {_day_key(created_on): Increment(1)}
+
+    shard = random.randrange(SESSION_COUNTER_SHARDS)
+    batch.set(counter_shard_ref(mentor_id, shard), data, merge=True)
+
+
+def add_status_change_counter_updates(batch, mentor_id: str, old_status: str, new_status: str) -> None:
+    """Add the counter changes for a session moving between statuses, if any."""
+    pending = int(new_status == "pending") - int(old_status == "pending")
+    completed = int(new_status == "completed") - int(old_status == "completed")
+    if pending or completed:
+        add_session_counter_updates(batch, mentor_id, pending=pending, completed=completed)
+
+
+class SessionCounterCache:
+    """In-memory copy of every counter shard, refreshed incrementally."""
+
+    def __init__(self):
+        # Shard document path -> shard data
+        self._shards: dict[str, dict] = {}
+        self._last_updated_at: Optional[datetime] = None
+        self.shards_read = 0
+
+    async def refresh(self) -> bool:
+        """
+        Read the shards written since the last refresh.
+
+        Returns:
+            True if any shard changed.
+        """
+        query = async_db.collection_group(COUNTER_SHARDS_COLLECTION)
+        if self._last_updated_at is not None:
+            # >=: shards written in the same instant as the last one seen
+            # may not have been visible yet; re-reading them is harmless
+            query = query.where(filter=FieldFilter("updated_at", ">=", self._last_updated_at))
+
+        window_start = _day_key(datetime.utcnow() - timedelta(days=RECENT_SESSIONS_DAYS + 1))
+        changed = False
+        async for doc in query.stream():
+            data = doc.to_dict() or {}
+            self.shards_read += 1
+            path = doc.reference.path
+            if self._shards.get(path) != data:
+                self._shards[path] = data
+                changed = True
+
+            updated_at = data.get("updated_at")
+            if updated_at is not None and (self._last_updated_at is None or updated_at > self._last_updated_at):
+                self._last_updated_at = updated_at
+
+            await self._prune_days(doc.reference, data, window_start)
+
+        return changed
+
+    async def _prune_days(self, ref, data: dict, window_start: str) -> None:
+        """Delete day buckets that have left the window (without touching updated_at)."""
+        stale = [day for day in (data.get("created_days") or {}) if day < window_start]
+        if not stale:
+            return
+        try:
+            await ref.update({f"created_days.{day}": DELETE_FIELD for day in stale})
+            for day in stale:
+                del data["created_days"][day]
+        except Exception as e:
+            logger.warning(f"Could not prune session counter days on {ref.path}: {e}")
+
+    def totals(self, today: Optional[datetime] = None) -> dict[str, dict[str, int]]:
+        """Counts per mentor id, summed over shards (keys: SESSION_COUNTER_FIELDS)."""
+        today = today or datetime.utcnow()
+        window_start = _day_key(today - timedelta(days=RECENT_SESSIONS_DAYS - 1))
+
+        totals: dict[str, dict[str, int]] = {}
+        for data in self._shards.values():
+            mentor_id = data.get("mentor_id")
+            if not mentor_id:
+                continue
+            counts = totals.setdefault(mentor_id, dict.fromkeys(SESSION_COUNTER_FIELDS, 0))
+            counts["pending_sessions"] += int(data.get("pending") or 0)
+            counts["completed_sessions"] += int(data.get("completed") or 0)
+            counts["sessions_last_30_days"] += sum(
+                int(count or 0) for day, count in (data.get("created_days") or {}).items() if day >= window_start
+            )
+        return totals
+
+    def stats(self) -> dict:
+        return {
+            "shards": len(self._shards),
+            "shards_read": self.shards_read,
+        }
@@ -0,0 +1,100 @@
+"""
+Per-mentor rating aggregates.
+
+Averages and response counts per mentor used to require a scan of
+`session_feedback`. Every endpoint that writes a feedback document now adds
+`Increment` updates to `mentor_ratings/{mentor_id}` in the same batch, so
+the aggregate changes exactly when the feedback does.
+
+Student and mentor responses are kept apart: the students' ratings are the
+ones about the mentor. Each group holds:
+
+    responses       every feedback document written
+    rating_count    responses with a 1-5 rating
+    rating_sum      sum of those ratings
+    histogram       {"1": n, ..., "5": n}
+    not_happened    responses saying the meeting didn't happen
+
+scripts/backfill_mentor_ratings.py rebuilds the documents from scratch.
+"""
+
+from typing import Optional
+
+from google.cloud.firestore_v1 import Increment, SERVER_TIMESTAMP
+
+from ..core.firebase import async_db
+from ..models.feedback import MentorRatingBreakdown, MentorRatingsResponse
+
+MENTOR_RATINGS_COLLECTION = "mentor_ratings"
+
+RESPONDENT_TYPES = ("student", "mentor")
+
+
+def rating_ref(mentor_id: str):
+    return async_db.collection(MENTOR_RATINGS_COLLECTION).document(mentor_id)
+
+
+def add_feedback_to_ratings(
+    batch,
+    mentor_id: Optional[str],
+    respondent_type: str,
+    rating: Optional[int],
+    meeting_status: str = "happened",
+) -> None:
+    """
+    Add one feedback response to a mentor's aggregate, in the batch (or
+    transaction) that writes the feedback document.
+
+    Args:
+        batch: Batch that also writes the feedback
+        mentor_id: The session's `mentor_id`; nothing is written without it
+        respondent_type: "student" or "mentor"
+        rating: 1-5, or None when the response has no rating
+        meeting_status: "happened", "scheduled" or "not_happened"
+    """
+    if not mentor_id or respondent_type not in RESPONDENT_TYPES:
+        return
+
+    group = {"responses": Increment(1)}
+    if rating is not None:
+        group["rating_count"] = Increment(1)
+        group["rating_sum"] = Increment(rating)
+        group["histogram"] = {str(rating): Increment(1)}
+    if meeting_status == "not_happened":
+        group["not_happened"] = Increment(1)
+
+    batch.set(
+        rating_ref(mentor_id),
+        {
+            "mentor_id": mentor_id,
+            respondent_type: group,
+            "updated_at": SERVER_TIMESTAMP,
+        },
+        merge=True,
+    )
+
+
+def _breakdown(group: Optional[dict]) -> MentorRatingBreakdown:
+    group = group or {}
+    histogram = group.get("histogram") or {}
+    rating_count = int(group.get("rating_count") or 0)
+    rating_sum = int(group.get("rating_sum") or 0)
+    return MentorRatingBreakdown(
+        responses=int(group.get("responses") or 0),
+        rating_count=rating_count,
+        rating_sum=rating_sum,
+        average_rating=round(rating_sum / rating_count, 2) if rating_count else None,
+        histogram={str(star): int(histogram.get(str(star)) or 0) for star in range(1, 6)},
+        not_happened=int(group.get("not_happened") or 0),
+    )
+
+
+def ratings_response(mentor_id: str, data: Optional[dict]) -> MentorRatingsResponse:
+    """API view of an aggregate document (all zeros if it doesn't exist yet)."""
+    data = data or {}
+    return MentorRatingsResponse(
+        mentor_id=mentor_id,
+        student=_breakdown(data.get("student")),
+        mentor=_breakdown(data.get("mentor")),
+        updated_at=data.get("updated_at"),
+    )
@@ -0,0 +1,180 @@
+"""
+Mentor recommendations for students (GET /mentors/recommended).
+
+Mentors are ranked by how well a student's course and interests overlap
+with each mentor's tags, expertise and course. Terms go through the same
+normalization as search (services/mentor_search.py), so "Finanças" and
+"financas" are the same feature.
+
+For every catalog version the mentors are turned once into a feature
+matrix (one L2-normalized row of term weights per mentor) plus a vector of
+course ids. A student is a sparse vector over the same terms; scoring the
+whole catalog is one matrix-vector product and a comparison, and the
+ranking is cached under a hash of the student's profile and the catalog
+version.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from ..models.user import UserProfile
+from .mentor_catalog import CatalogSnapshot, normalize_filter_value
+from .mentor_search import analyze
+
+logger = logging.getLogger(__name__)
+
+# Try to import numpy, gracefully handle if not available
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("numpy package not installed. Mentor recommendations will be disabled.")
+
+# Weight of each mentor field in the feature matrix
+MENTOR_FEATURE_WEIGHTS = {"tags": 1.0, "expertise": 1.0, "course": 0.5}
+
+# Weight of each student field in the query vector
+STUDENT_FEATURE_WEIGHTS = {"interests": 1.0, "course": 0.5, "bio": 0.25}
+
+# Added to the score of mentors from the student's own course
+COURSE_MATCH_BONUS = 0.5
+
+# Rankings kept per (catalog version, profile hash)
+RANKING_CACHE_MAX_SIZE = 4096
+
+
+def profile_hash(profile: Optional[UserProfile]) -> str:
+    """Hash of the profile fields that affect the ranking."""
+    profile = profile or UserProfile()
+    key = "\x1f".join([
+        normalize_filter_value(profile.course or ""),
+        "\x1e".join(sorted(normalize_filter_value(interest) for interest in profile.interests)),
+        profile.bio or "",
+    ])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+class MentorFeatures:
+    """Feature matrix for one catalog snapshot."""
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.version = snapshot.version
+        self.terms: dict[str, int] = {}
+        self.courses: dict[str, int] = {}
+
+        rows, columns, values = [], [], []
+        course_ids = []
+        for position, mentor in enumerate(snapshot.mentors):
+            weights: dict[int, float] = {}
+            fields = {
+                "tags": " ".join(mentor.tags),
+                "expertise": " ".join(mentor.expertise),
+                "course": mentor.course,
+            }
+            for field, text in fields.items():
+                for term in analyze(text or ""):
+                    column = self.terms.setdefault(term, len(self.terms))
+                    weights[column] = weights.get(column, 0.0) + MENTOR_FEATURE_WEIGHTS[field]
+            rows.extend([position] * len(weights))
+            columns.extend(weights)
+            values.extend(weights.values())
+
+            course = normalize_filter_value(mentor.course or "")
+            course_ids.append(self.courses.setdefault(course, len(self.courses)) if course else -1)
+
+        self.matrix = np.zeros((len(snapshot.mentors), max(len(self.terms), 1)), dtype=np.float32)
+        self.matrix[rows, columns] = values
+        norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+        np.divide(self.matrix, norms, out=self.matrix, where=norms > 0)
+        self.course_ids = np.array(course_ids, dtype=np.int32)
+
+    def student_vector(self, profile: UserProfile) -> "np.ndarray":
+        vector = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        fields = {
+            "interests": " ".join(profile.interests),
+            "course": profile.course,
+            "bio": profile.bio,
+        }
+        for field, text in fields.items():
+            for term in analyze(text or ""):
+                column = self.terms.get(term)
+                if column is not None:
+                    vector[column] += STUDENT_FEATURE_WEIGHTS[field]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def rank(self, profile: UserProfile) -> list[int]:
+        """Mentor positions, best match first; ties keep catalog order."""
+        scores = self.matrix @ self.student_vector(profile)
+        course = self.courses.get(normalize_filter_value(profile.course or ""))
+        if course is not None:
+            scores += COURSE_MATCH_BONUS * (self.course_ids == course)
+        return np.argsort(-scores, kind="stable").tolist()
+
+
+class MentorRecommender:
+    """Rankings per student profile, on top of the current catalog snapshot."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._features: Optional[MentorFeatures] = None
+        self._rankings: OrderedDict[tuple[int, str], list[int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _features_for(self, snapshot: CatalogSnapshot) -> MentorFeatures:
+        features = self._features
+        if features is None or features.version != snapshot.version:
+            features = MentorFeatures(snapshot)
+            self._features = features
+            # Rankings of older versions can't be served again
+            with self._lock:
+                for key in [key for key in self._rankings if key[0] != snapshot.version]:
+                    del self._rankings[key]
+        return features
+
+    def rank(self, snapshot: CatalogSnapshot, profile: Optional[UserProfile]) -> tuple[list[int], str]:
+        """
+        Rank the snapshot's mentors for a student.
+
+        Returns:
+            Mentor positions in the snapshot, best match first, and the
+            profile hash used as the cache key.
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Mentor recommendations require the numpy package")
+
+        profile = profile or UserProfile()
+        key = (snapshot.version, profile_hash(profile))
+        with self._lock:
+            ranking = self._rankings.get(key)
+            if ranking is not None:
+                self._rankings.move_to_end(key)
+                self.hits += 1
+                return ranking, key[1]
+
+        ranking = self._features_for(snapshot).rank(profile)
+        with self._lock:
+            self.misses += 1
+            self._rankings[key] = ranking
+            self._rankings.move_to_end(key)
+            while len(self._rankings) > self.max_size:
+                self._rankings.popitem(last=False)
+        return ranking, key[1]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._rankings),
+                "hits": self.hits,
+                "misses": self.misses,
+                "features_version": self._features.version if self._features else None,
+            }
+
+
+mentor_recommender = MentorRecommender(RANKING_CACHE_MAX_SIZE)
@@ -0,0 +1,192 @@
+"""
+Full-text mentor search (GET /mentors/search).
+
+An in-memory BM25 index over each mentor's name, title, company, bio, tags
+and expertise. Fields are weighted by multiplying their term frequencies
+(a name or tag match counts more than a word in the bio).
+
+Text is normalized for Portuguese: accents are folded ("computação" ->
+"computacao"), text is lowercased, stopwords are dropped and a light
+stemmer reduces plurals and gender endings ("finanças" -> "financ",
+"engenheiras" -> "engenheir").
+
+The index follows the mentor catalog: when a search sees a new catalog
+version, only mentors that were added, changed or removed are re-indexed.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Optional
+
+from ..models.mentor import MentorPublicResponse
+from .mentor_catalog import CatalogSnapshot
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term frequency multiplier per mentor field
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "title": 2.0,
+    "tags": 2.0,
+    "expertise": 2.0,
+    "company": 1.5,
+    "bio": 1.0,
+}
+
+STOPWORDS = frozenset(
+    "a ao aos as com da das de do dos e em na nas no nos o os ou para pela pelas pelo "
+    "pelos por que se sem sob sobre um uma umas uns".split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Plural endings (after accent folding), longest first
+_PLURAL_SUFFIXES = (
+    ("oes", "ao"),
+    ("aes", "ao"),
+    ("ais", "al"),
+    ("eis", "el"),
+    ("ois", "ol"),
+    ("res", "r"),
+    ("zes", "z"),
+    ("ns", "m"),
+)
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def stem(token: str) -> str:
+    """Light Portuguese stemmer: plural reduction, then the final gender vowel."""
+    if len(token) <= 3:
+        return token
+    for suffix, replacement in _PLURAL_SUFFIXES:
+        if token.endswith(suffix):
+            token = token[: -len(suffix)] + replacement
+            break
+    else:
+        if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+            token = token[:-1]
+    if len(token) > 4 and token[-1] in "aeo":
+        token = token[:-1]
+    return token
+
+
+def analyze(text: str) -> list[str]:
+    """Text -> index terms."""
+    return [stem(token) for token in _TOKEN_RE.findall(fold(text)) if token not in STOPWORDS]
+
+
+def _weighted_terms(mentor: MentorPublicResponse) -> Counter:
+    fields = {
+        "name": mentor.name,
+        "title": mentor.title,
+        "company": mentor.company,
+        "bio": mentor.bio,
+        "tags": " ".join(mentor.tags),
+        "expertise": " ".join(mentor.expertise),
+    }
+    terms = Counter()
+    for field, text in fields.items():
+        if not text:
+            continue
+        weight = FIELD_WEIGHTS[field]
+        for term in analyze(text):
+            terms[term] += weight
+    return terms
+
+
+class MentorSearchIndex:
+    """BM25 inverted index over the mentors of the current catalog snapshot."""
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        # term -> {mentor id: weighted term frequency}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._doc_terms: dict[str, Counter] = {}
+        self._doc_lengths: dict[str, float] = {}
+        # BM25 length normalization per mentor, recomputed on every sync
+        self._norms: dict[str, float] = {}
+        self._mentors: dict[str, MentorPublicResponse] = {}
+        self._total_length = 0.0
+        self.reindexed = 0
+
+    def _add(self, mentor: MentorPublicResponse) -> None:
+        terms = _weighted_terms(mentor)
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[mentor.id] = frequency
+        length = sum(terms.values())
+        self._doc_terms[mentor.id] = terms
+        self._doc_lengths[mentor.id] = length
+        self._mentors[mentor.id] = mentor
+        self._total_length += length
+        self.reindexed += 1
+
+    def _remove(self, mentor_id: str) -> None:
+        for term in self._doc_terms.pop(mentor_id):
+            postings = self._postings[term]
+            del postings[mentor_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(mentor_id)
+        del self._mentors[mentor_id]
+
+    def sync(self, snapshot: CatalogSnapshot) -> None:
+        """Bring the index up to date with a catalog snapshot, re-indexing only what changed."""
+        if self.version == snapshot.version:
+            return
+        for mentor_id in [mentor_id for mentor_id in self._mentors if mentor_id not in snapshot.by_id]:
+            self._remove(mentor_id)
+        for mentor_id, mentor in snapshot.by_id.items():
+            indexed = self._mentors.get(mentor_id)
+            if indexed is mentor or indexed == mentor:
+                # Keep the snapshot's instance so the next comparison is by identity
+                self._mentors[mentor_id] = mentor
+                continue
+            if indexed is not None:
+                self._remove(mentor_id)
+            self._add(mentor)
+
+        average_length = (self._total_length / len(self._doc_lengths)) or 1.0 if self._doc_lengths else 1.0
+        self._norms = {
+            mentor_id: BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+            for mentor_id, length in self._doc_lengths.items()
+        }
+        self.version = snapshot.version
+
+    def search(self, query: str, limit: int) -> tuple[list[MentorPublicResponse], int]:
+        """
+        Rank mentors for a free-text query.
+
+        Returns:
+            The top `limit` mentors by BM25 score, and the number of matches.
+        """
+        terms = set(analyze(query))
+        count = len(self._mentors)
+        if not terms or not count:
+            return [], 0
+
+        norms = self._norms
+        scores: dict[str, float] = defaultdict(float)
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            weight = idf * (BM25_K1 + 1)
+            for mentor_id, frequency in postings.items():
+                scores[mentor_id] += weight * frequency / (frequency + norms[mentor_id])
+
+        top = heapq.nlargest(limit, scores, key=scores.__getitem__)
+        return [self._mentors[mentor_id] for mentor_id in top], len(scores)
+
+
+mentor_search_index = MentorSearchIndex()
@@ -0,0 +1,295 @@
+"""
+Columnar (Parquet) admin exports.
+
+The CSV exports flatten everything to text; these keep the types analysts
+need: native UTC timestamps, booleans and integers, `tags` and `expertise`
+as list columns, and dictionary-encoded low-cardinality columns such as
+`status` and `role`.
+
+Each dataset is a list of column specs `(name, kind, source)`, where
+`source` is the Firestore field path the value comes from (or a tuple of
+paths, first non-empty wins; ID for the document id). The field mask used
+for the Firestore read is derived from the same specs, except for datasets
+in PARQUET_NORMALIZERS, whose documents are normalized before being read.
+
+Documents are streamed page by page and written as record batches of
+PARQUET_BATCH_ROWS rows, each one becoming a row group, so memory is bounded
+by a single batch.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, BinaryIO, Callable, Optional
+
+from ..core.firebase import async_db
+from ..core.projection import stream_selected
+from .exports import EXPORT_PAGE_SIZE, FEEDBACK_SOURCE_FIELDS, normalize_feedback_document
+
+logger = logging.getLogger(__name__)
+
+# Try to import pyarrow, gracefully handle if not available
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("pyarrow package not installed. Parquet exports will be disabled.")
+
+# Rows per record batch (and Parquet row group)
+PARQUET_BATCH_ROWS = 5000
+
+# Marks the document id as a column source
+ID = "__id__"
+
+USER_PARQUET_COLUMNS = [
+    ("uid", "string", ID),
+    ("email", "string", "email"),
+    ("displayName", "string", "displayName"),
+    ("role", "category", "role"),
+    ("status", "category", "status"),
+    ("authProvider", "category", "authProvider"),
+    ("isAdmin", "bool", "isAdmin"),
+    ("emailNotifications", "bool", "emailNotifications"),
+    ("language", "category", "language"),
+    ("createdAt", "timestamp", "createdAt"),
+    ("updatedAt", "timestamp", "updatedAt"),
+    ("lastLoginAt", "timestamp", "lastLoginAt"),
+    ("profile_phone", "string", "profile.phone"),
+    ("profile_linkedIn", "string", "profile.linkedIn"),
+    ("profile_bio", "string", "profile.bio"),
+    ("profile_course", "category", "profile.course"),
+    ("profile_graduationYear", "int", "profile.graduationYear"),
+    ("profile_company", "string", "profile.company"),
+    ("profile_position", "string", "profile.position"),
+    ("profile_expertise", "list", "profile.expertise"),
+]
+
+MENTOR_PARQUET_COLUMNS = [
+    ("uid", "string", ID),
+    ("email", "string", "email"),
+    ("displayName", "string", "displayName"),
+    ("status", "category", "status"),
+    ("authProvider", "category", "authProvider"),
+    ("isAdmin", "bool", "isAdmin"),
+    ("createdAt", "timestamp", "createdAt"),
+    ("updatedAt", "timestamp", "updatedAt"),
+    ("lastLoginAt", "timestamp", "lastLoginAt"),
+    ("title", "string", "mentorProfile.title"),
+    ("company", "string", "mentorProfile.company"),
+    ("bio", "string", "mentorProfile.bio"),
+    ("linkedin", "string", "mentorProfile.linkedin"),
+    ("photoURL", "string", ("mentorProfile.photoURL", "photoURL")),
+    ("tags", "list", "mentorProfile.tags"),
+    ("expertise", "list", "mentorProfile.expertise"),
+    ("course", "category", "mentorProfile.course"),
+    ("graduationYear", "int", "mentorProfile.graduationYear"),
+    ("isUnicampAlumni", "bool", "mentorProfile.isUnicampAlumni"),
+    ("unicampDegreeLevel", "category", "mentorProfile.unicampDegreeLevel"),
+    ("alternativeUniversity", "string", "mentorProfile.alternativeUniversity"),
+    ("patronosRelation", "category", "mentorProfile.patronosRelation"),
+    ("isActive", "bool", "mentorProfile.isActive"),
+    ("isProfileComplete", "bool", "mentorProfile.isProfileComplete"),
+]
+
+SESSION_PARQUET_COLUMNS = [
+    ("id", "string", ID),
+    ("status", "category", "status"),
+    ("booking_method", "category", "booking_method"),
+    ("student_uid", "string", "student_uid"),
+    ("student_name", "string", "student_name"),
+    ("student_email", "string", "student_email"),
+    ("mentor_id", "string", "mentor_id"),
+    ("mentor_name", "string", "mentor_name"),
+    ("mentor_email", "string", "mentor_email"),
+    ("mentor_company", "category", "mentor_company"),
+    ("message", "string", "message"),
+    ("created_at", "timestamp", "created_at"),
+    ("updated_at", "timestamp", "updated_at"),
+    ("completed_at", "timestamp", "completed_at"),
+]
+
+FEEDBACK_PARQUET_COLUMNS = [
+    ("id", "string", ID),
+    ("session_id", "string", "session_id"),
+    ("respondent_type", "category", "respondent_type"),
+    ("respondent_uid", "string", "respondent_uid"),
+    ("respondent_email", "string", "respondent_email"),
+    ("respondent_name", "string", "respondent_name"),
+    ("meeting_status", "category", "meeting_status"),
+    ("no_meeting_reason", "string", "no_meeting_reason"),
+    ("rating", "int", "rating"),
+    ("additional_feedback", "string", "additional_feedback"),
+    ("submitted_at", "timestamp", "submitted_at"),
+]
+
+# The `token` field authorizes the feedback form and is never exported
+FEEDBACK_REQUEST_PARQUET_COLUMNS = [
+    ("id", "string", ID),
+    ("session_id", "string", "session_id"),
+    ("recipient_type", "category", "recipient_type"),
+    ("recipient_email", "string", "recipient_email"),
+    ("recipient_name", "string", "recipient_name"),
+    ("email_sent", "bool", "email_sent"),
+    ("submitted", "bool", "submitted"),
+    ("created_at", "timestamp", "created_at"),
+    ("sent_at", "timestamp", "sent_at"),
+]
+
+# Dataset name (as in services.exports.EXPORT_DATASETS) -> (columns, query)
+PARQUET_DATASETS = {
+    "users": (USER_PARQUET_COLUMNS, lambda: async_db.collection("users")),
+    "mentors": (MENTOR_PARQUET_COLUMNS, lambda: async_db.collection("users").where("role", "==", "mentor")),
+    "sessions": (SESSION_PARQUET_COLUMNS, lambda: async_db.collection("sessions")),
+    "feedback": (FEEDBACK_PARQUET_COLUMNS, lambda: async_db.collection("session_feedback")),
+    "feedback_requests": (FEEDBACK_REQUEST_PARQUET_COLUMNS, lambda: async_db.collection("feedback_requests")),
+}
+
+# Datasets whose documents come in more than one shape -> (field mask covering
+# every shape, function mapping a document onto the column sources)
+PARQUET_NORMALIZERS = {
+    "feedback": (FEEDBACK_SOURCE_FIELDS, normalize_feedback_document),
+}
+
+
+def _arrow_type(kind: str):
+    return {
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "bool": pa.bool_(),
+        "int": pa.int64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "list": pa.list_(pa.string()),
+    }[kind]
+
+
+def parquet_schema(columns: list[tuple]) -> "pa.Schema":
+    return pa.schema([pa.field(name, _arrow_type(kind)) for name, kind, _ in columns])
+
+
+def parquet_fields(columns: list[tuple]) -> list[str]:
+    """Field mask for the Firestore read, derived from the column sources."""
+    fields = []
+    for _, _, source in columns:
+        for path in source if isinstance(source, tuple) else (source,):
+            if path != ID and path not in fields:
+                fields.append(path)
+    return fields
+
+
+def _get_path(data: dict, path: str) -> Any:
+    value = data
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _coerce(kind: str, value: Any) -> Any:
+    """Convert a Firestore value to the column's type; unparseable values become null."""
+    if value is None or value == "":
+        return None
+    if kind in ("string", "category"):
+        return str(value)
+    if kind == "bool":
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            return {"true": True, "sim": True, "false": False, "não": False, "nao": False}.get(value.strip().lower())
+        return None
+    if kind == "int":
+        if isinstance(value, bool):
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if kind == "timestamp":
+        if not isinstance(value, datetime):
+            return None
+        # Firestore timestamps are UTC; naive values come from datetime.utcnow()
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if kind == "list":
+        if isinstance(value, (list, tuple)):
+            return [str(item) for item in value]
+        return [str(value)]
+    return value
+
+
+def _column_value(doc_id: str, data: dict, kind: str, source) -> Any:
+    if source == ID:
+        return doc_id
+    for path in source if isinstance(source, tuple) else (source,):
+        value = _coerce(kind, _get_path(data, path))
+        if value is not None:
+            return value
+    return None
+
+
+async def write_parquet(
+    dataset: str,
+    sink: BinaryIO,
+    on_batch: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    write: Optional[Callable[..., Awaitable[None]]] = None,
+) -> int:
+    """
+    Stream a dataset into a Parquet file.
+
+    Args:
+        dataset: Key of PARQUET_DATASETS
+        sink: Binary file-like object the Parquet file is written to
+        on_batch: Awaited after each record batch with (rows so far, batch rows)
+        write: Runs a blocking call, e.g. `asyncio.to_thread`; by default
+            calls are made inline
+
+    Returns:
+        Number of rows written.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet exports require the pyarrow package")
+
+    async def inline(func, *args):
+        return func(*args)
+
+    run = write or inline
+    columns, query_factory = PARQUET_DATASETS[dataset]
+    fields, normalize = PARQUET_NORMALIZERS.get(dataset, (parquet_fields(columns), None))
+    schema = parquet_schema(columns)
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+
+    def empty_batch() -> list[list]:
+        return [[] for _ in columns]
+
+    rows = 0
+    values = empty_batch()
+
+    async def flush() -> None:
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(values, schema)],
+            schema=schema,
+        )
+        await run(writer.write_batch, batch)
+        if on_batch is not None:
+            await on_batch(rows, batch.num_rows)
+
+    try:
+        async for doc_id, data in stream_selected(
+            query_factory(), fields, f"parquet.{dataset}", EXPORT_PAGE_SIZE
+        ):
+            if normalize is not None:
+                data = normalize(data)
+            for index, (_, kind, source) in enumerate(columns):
+                values[index].append(_column_value(doc_id, data, kind, source))
+            rows += 1
+
+            if len(values[0]) >= PARQUET_BATCH_ROWS:
+                await flush()
+                values = empty_batch()
+
+        if values[0] or rows == 0:
+            await flush()
+    finally:
+        await run(writer.close)
+
+    return rows
@@ -0,0 +1,273 @@
+"""
+Streaming profile photo uploads (POST /mentors/me/photo).
+
+The multipart body is parsed straight from the request stream instead of
+through `UploadFile`, which buffers the whole file (spooled to a temporary
+file, and Cloud Run's filesystem is in memory) before the endpoint runs.
+Each chunk of the photo is checked and forwarded to Storage as it arrives:
+
+- a Content-Length above the limit is rejected before the body is read,
+  and the running byte count cuts off bodies without one;
+- the first bytes of the file must match the magic bytes of its declared
+  content type (JPEG, PNG or WebP);
+- accepted bytes go into a resumable upload that sends one chunk of
+  PHOTO_UPLOAD_CHUNK_BYTES at a time.
+
+Memory per upload is bounded by the upload chunk plus one request chunk.
+A rejected (or disconnected) upload terminates its resumable session
+instead of closing it, so nothing is written to the bucket.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import Request
+from firebase_admin import storage
+from multipart.multipart import MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+# Largest photo accepted
+MAX_PHOTO_BYTES = 5 * 1024 * 1024
+
+# Allowance for boundaries, part headers and other form fields in the body
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Chunk size of the resumable upload (must be a multiple of 256 KiB for GCS)
+PHOTO_UPLOAD_CHUNK_BYTES = 256 * 1024
+
+# Photos are stored under mentor-photos/{uid}/
+PHOTO_PATH_PREFIX = "mentor-photos"
+
+# Accepted content types -> (file extension, leading magic bytes)
+PHOTO_FORMATS = {
+    "image/jpeg": ("jpg", b"\xff\xd8\xff"),
+    "image/png": ("png", b"\x89PNG\r\n\x1a\n"),
+    "image/webp": ("webp", b"RIFF"),
+}
+
+# Bytes needed to identify any accepted format ("RIFF" size "WEBP" for WebP)
+MAGIC_BYTES_LENGTH = 12
+
+
+class PhotoUploadError(ValueError):
+    """An upload rejected for a client error; `status_code` is the HTTP status."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+
+
+@dataclass
+class UploadedPhoto:
+    path: str
+    public_url: str
+    content_type: str
+    size: int
+
+
+def _matches_magic_bytes(content_type: str, head: bytes) -> bool:
+    _, magic = PHOTO_FORMATS[content_type]
+    if not head.startswith(magic):
+        return False
+    return content_type != "image/webp" or head[8:12] == b"WEBP"
+
+
+@dataclass
+class _FilePart:
+    """State of the form's file field while its bytes stream in."""
+
+    content_type: str
+    head: bytearray = field(default_factory=bytearray)
+    size: int = 0
+    writer: Optional[object] = None
+    blob: Optional[object] = None
+    path: str = ""
+    finished: bool = False
+
+
+class _PhotoUploadStream:
+    """Multipart parser callbacks feeding one file field to a resumable upload."""
+
+    def __init__(self, uid: str, field_name: str):
+        self.uid = uid
+        self.field_name = field_name
+        self.file: Optional[_FilePart] = None
+        # The parser calls back synchronously; data is queued here (None marks
+        # the end of the file) and written out after each request chunk
+        self._pending: list[Optional[bytes]] = []
+        self._headers: dict[bytes, bytes] = {}
+        self._header_name = b""
+        self._header_value = b""
+        self._in_file = False
+
+    # Parser callbacks
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._in_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name", b"").decode("latin-1") != self.field_name or b"filename" not in options:
+            # Other form fields are ignored; their size counts toward the body limit
+            return
+        if self.file is not None:
+            raise PhotoUploadError(400, "Only one file can be uploaded.")
+
+        content_type = self._headers.get(b"content-type", b"").decode("latin-1").split(";")[0].strip().lower()
+        if content_type not in PHOTO_FORMATS:
+            raise PhotoUploadError(400, f"Invalid file type. Allowed: {', '.join(PHOTO_FORMATS)}")
+        self.file = _FilePart(content_type=content_type)
+        self._in_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._pending.append(data[start:end])
+
+    def on_part_end(self) -> None:
+        if self._in_file:
+            self.file.finished = True
+            self._pending.append(None)
+            self._in_file = False
+
+    # Forwarding
+
+    async def _open_writer(self, file: _FilePart) -> None:
+        extension, _ = PHOTO_FORMATS[file.content_type]
+        file.path = f"{PHOTO_PATH_PREFIX}/{self.uid}/{uuid.uuid4()}.{extension}"
+
+        def open_blob():
+            blob = storage.bucket().blob(file.path, chunk_size=PHOTO_UPLOAD_CHUNK_BYTES)
+            return blob, blob.open("wb", content_type=file.content_type)
+
+        file.blob, file.writer = await asyncio.to_thread(open_blob)
+
+    async def _start_upload(self, file: _FilePart) -> None:
+        """Check the magic bytes, then open the upload and send the bytes held so far."""
+        if not _matches_magic_bytes(file.content_type, bytes(file.head)):
+            raise PhotoUploadError(400, "File content does not match its type.")
+        await self._open_writer(file)
+        await asyncio.to_thread(file.writer.write, bytes(file.head))
+        file.head.clear()
+
+    async def flush(self) -> None:
+        """Check and forward the file bytes parsed from the last request chunk."""
+        file = self.file
+        for data in self._pending:
+            if data is None:
+                # End of the file part; a file shorter than the magic bytes is checked here
+                if file.writer is None:
+                    await self._start_upload(file)
+                continue
+
+            file.size += len(data)
+            if file.size > MAX_PHOTO_BYTES:
+                raise PhotoUploadError(413, "File too large. Maximum size is 5MB.")
+
+            if file.writer is None:
+                file.head += data
+                if len(file.head) >= MAGIC_BYTES_LENGTH:
+                    await self._start_upload(file)
+                continue
+
+            await asyncio.to_thread(file.writer.write, data)
+        self._pending.clear()
+
+    async def abort(self) -> None:
+        """
+        Cancel the resumable upload, if one was started.
+
+        An abandoned writer would otherwise be closed by its finalizer, which
+        uploads the bytes received so far and finalizes the object.
+        """
+        file = self.file
+        if file is None or file.writer is None:
+            return
+        try:
+            await asyncio.to_thread(file.writer.terminate)
+        except Exception as e:
+            logger.warning(f"Could not cancel photo upload {file.path}: {e}")
+
+
+async def stream_photo_upload(request: Request, uid: str, field_name: str = "file") -> UploadedPhoto:
+    """
+    Stream the photo in a multipart request into Storage.
+
+    Args:
+        request: The multipart/form-data request; its body is consumed here
+        uid: The mentor's uid, used in the Storage path
+        field_name: Form field holding the file
+
+    Returns:
+        The stored (public) photo.
+
+    Raises:
+        PhotoUploadError: The request or file was rejected.
+    """
+    body_limit = MAX_PHOTO_BYTES + MULTIPART_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > body_limit:
+        raise PhotoUploadError(413, "File too large. Maximum size is 5MB.")
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise PhotoUploadError(400, "Expected a multipart/form-data request.")
+
+    upload = _PhotoUploadStream(uid, field_name)
+    parser = MultipartParser(
+        params[b"boundary"],
+        {
+            "on_part_begin": upload.on_part_begin,
+            "on_part_data": upload.on_part_data,
+            "on_part_end": upload.on_part_end,
+            "on_header_field": upload.on_header_field,
+            "on_header_value": upload.on_header_value,
+            "on_header_end": upload.on_header_end,
+            "on_headers_finished": upload.on_headers_finished,
+        },
+    )
+
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise PhotoUploadError(413, "File too large. Maximum size is 5MB.")
+            parser.write(chunk)
+            await upload.flush()
+        parser.finalize()
+        await upload.flush()
+
+        file = upload.file
+        if file is None or not file.finished:
+            raise PhotoUploadError(400, f"Missing file field '{field_name}'.")
+    except BaseException:
+        # Rejected, malformed or disconnected: nothing may reach the bucket
+        await upload.abort()
+        raise
+
+    # Closing the writer sends the last chunk and finalizes the object
+    await asyncio.to_thread(file.writer.close)
+    await asyncio.to_thread(file.blob.make_public)
+
+    return UploadedPhoto(
+        path=file.path,
+        public_url=file.blob.public_url,
+        content_type=file.content_type,
+        size=file.size,
+    )
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""One-time script to backfill users.displayNameLower and users.createdAt.
+
+The admin mentor listing sorts on the stored lowercase name and the pending
+users listing on createdAt. Documents without them are only listed after the
+last page, unsorted, so run this before deploying the paginated listings
+(see DEPLOYMENT.md). A missing createdAt is set to the document's creation
+time. By default runs in dry-run mode and only reports what it would do.
+Pass --apply to write.
+
+Usage (from backend/):
+    python -m scripts.backfill_display_name_lower           # dry-run
+    python -m scripts.backfill_display_name_lower --apply    # write to Firestore
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.firebase import db
+from app.core.pagination import sort_name
+
+# Firestore allows at most 500 writes per batch
+BATCH_SIZE = 400
+
+
+def main(apply: bool) -> None:
+    mode = "APPLY" if apply else "DRY-RUN"
+    print(f"=== backfill_display_name_lower ({mode}) ===\n")
+
+    batch = db.batch()
+    pending, updated, unchanged = 0, 0, 0
+
+    for doc in db.collection("users").select(["displayName", "displayNameLower", "createdAt"]).stream():
+        data = doc.to_dict()
+        expected = sort_name(data.get("displayName"))
+
+        updates = {}
+        if data.get("displayNameLower") != expected:
+            updates["displayNameLower"] = expected
+        if "createdAt" not in data:
+            updates["createdAt"] = doc.create_time
+
+        if not updates:
+            unchanged += 1
+            continue
+
+        print(f"[OK]   {doc.id}: {updates}")
+        updated += 1
+
+        if apply:
+            batch.update(doc.reference, updates)
+            pending += 1
+            if pending >= BATCH_SIZE:
+                batch.commit()
+                batch = db.batch()
+                pending = 0
+
+    if apply and pending:
+        batch.commit()
+
+    print(f"\nSummary: {updated} to update, {unchanged} already up to date.")
+    if not apply:
+        print("Dry-run only. Re-run with --apply to write.")
+
+
+if __name__ == "__main__":
+    main(apply="--apply" in sys.argv)
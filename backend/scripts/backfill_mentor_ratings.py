@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""One-time script to build the per-mentor rating aggregates.
+
+GET /admin/mentors/{uid}/ratings serves `mentor_ratings/{uid}`, which the
+feedback endpoints keep up to date on every write (see
+app/services/mentor_ratings.py). This script rebuilds every aggregate from
+`session_feedback`, covering feedback written before the aggregates
+existed. Documents from both feedback flows are counted: the session
+endpoints (`user_role`, `rating`) and the token form (`respondent_type`,
+`meeting_status`, `rating`).
+
+Aggregates are overwritten, so run it while no feedback is being
+submitted. By default runs in dry-run mode and only reports what it would
+do. Pass --apply to write.
+
+Usage (from backend/):
+    python -m scripts.backfill_mentor_ratings           # dry-run
+    python -m scripts.backfill_mentor_ratings --apply    # write to Firestore
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from firebase_admin import firestore
+
+from app.core.firebase import db
+from app.services.mentor_ratings import MENTOR_RATINGS_COLLECTION, RESPONDENT_TYPES
+
+# Firestore allows at most 500 writes per batch
+BATCH_SIZE = 400
+
+# `user_role` values written by the session endpoints
+ROLE_TO_RESPONDENT = {"estudante": "student", "mentor": "mentor"}
+
+
+def empty_group() -> dict:
+    return {
+        "responses": 0,
+        "rating_count": 0,
+        "rating_sum": 0,
+        "histogram": {str(star): 0 for star in range(1, 6)},
+        "not_happened": 0,
+    }
+
+
+def main(apply: bool) -> None:
+    mode = "APPLY" if apply else "DRY-RUN"
+    print(f"=== backfill_mentor_ratings ({mode}) ===\n")
+
+    session_mentors = {
+        doc.id: doc.get("mentor_id")
+        for doc in db.collection("sessions").select(["mentor_id"]).stream()
+    }
+
+    aggregates: dict[str, dict] = {}
+    counted, skipped = 0, 0
+    fields = ["session_id", "respondent_type", "user_role", "meeting_status", "rating"]
+
+    for doc in db.collection("session_feedback").select(fields).stream():
+        data = doc.to_dict()
+        mentor_id = session_mentors.get(data.get("session_id"))
+        respondent = data.get("respondent_type") or ROLE_TO_RESPONDENT.get(data.get("user_role"))
+        if not mentor_id or respondent not in RESPONDENT_TYPES:
+            print(f"[SKIP] {doc.id}: session={data.get('session_id')!r} respondent={respondent!r}")
+            skipped += 1
+            continue
+
+        aggregate = aggregates.setdefault(
+            mentor_id, {"mentor_id": mentor_id, **{kind: empty_group() for kind in RESPONDENT_TYPES}}
+        )
+        group = aggregate[respondent]
+        group["responses"] += 1
+        rating = data.get("rating")
+        if isinstance(rating, int) and 1 <= rating <= 5:
+            group["rating_count"] += 1
+            group["rating_sum"] += rating
+            group["histogram"][str(rating)] += 1
+        if data.get("meeting_status") == "not_happened":
+            group["not_happened"] += 1
+        counted += 1
+
+    batch = db.batch()
+    pending = 0
+
+    for mentor_id, aggregate in sorted(aggregates.items()):
+        student = aggregate["student"]
+        average = student["rating_sum"] / student["rating_count"] if student["rating_count"] else None
+        print(
+            f"[OK]   {mentor_id}: {student['responses']} student responses, "
+            f"average {average if average is None else round(average, 2)}"
+        )
+
+        if apply:
+            ref = db.collection(MENTOR_RATINGS_COLLECTION).document(mentor_id)
+            batch.set(ref, {**aggregate, "updated_at": firestore.SERVER_TIMESTAMP})
+            pending += 1
+            if pending >= BATCH_SIZE:
+                batch.commit()
+                batch = db.batch()
+                pending = 0
+
+    if apply and pending:
+        batch.commit()
+
+    print(f"\nSummary: {counted} feedback documents for {len(aggregates)} mentors, {skipped} skipped.")
+    if not apply:
+        print("Dry-run only. Re-run with --apply to write.")
+
+
+if __name__ == "__main__":
+    main(apply="--apply" in sys.argv)
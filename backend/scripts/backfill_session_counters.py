@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""One-time script to backfill the per-mentor session counters.
+
+GET /mentors exposes each mentor's pending, completed and last-30-days
+session counts, maintained incrementally by the session endpoints (see
+app/services/mentor_counters.py). Sessions created before the counters
+existed are not included; this script recounts them from `sessions`.
+
+Each mentor's counts are written to shard 0 and the other shards are
+deleted, so run it while no sessions are being created or completed.
+By default runs in dry-run mode and only reports what it would do.
+Pass --apply to write.
+
+Usage (from backend/):
+    python -m scripts.backfill_session_counters           # dry-run
+    python -m scripts.backfill_session_counters --apply    # write to Firestore
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from firebase_admin import firestore
+
+from app.core.firebase import db
+from app.services.mentor_counters import (
+    COUNTER_SHARDS_COLLECTION,
+    MENTOR_STATS_COLLECTION,
+    RECENT_SESSIONS_DAYS,
+    SESSION_COUNTER_SHARDS,
+)
+
+# Firestore allows at most 500 writes per batch (one set + shard deletes per mentor)
+BATCH_SIZE = 400
+
+
+def main(apply: bool) -> None:
+    mode = "APPLY" if apply else "DRY-RUN"
+    print(f"=== backfill_session_counters ({mode}) ===\n")
+
+    window_start = datetime.now(timezone.utc) - timedelta(days=RECENT_SESSIONS_DAYS + 1)
+    counts: dict[str, dict] = {}
+    sessions = 0
+
+    for doc in db.collection("sessions").select(["mentor_id", "status", "created_at"]).stream():
+        data = doc.to_dict()
+        mentor_id = data.get("mentor_id")
+        if not mentor_id:
+            continue
+        sessions += 1
+
+        mentor = counts.setdefault(mentor_id, {"pending": 0, "completed": 0, "created_days": {}})
+        if data.get("status") == "pending":
+            mentor["pending"] += 1
+        elif data.get("status") == "completed":
+            mentor["completed"] += 1
+
+        created_at = data.get("created_at")
+        if isinstance(created_at, datetime):
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            if created_at >= window_start:
+                day = f"d{created_at:%Y%m%d}"
+                mentor["created_days"][day] = mentor["created_days"].get(day, 0) + 1
+
+    batch = db.batch()
+    pending_writes = 0
+
+    for mentor_id, mentor in sorted(counts.items()):
+        recent = sum(mentor["created_days"].values())
+        print(f"[OK]   {mentor_id}: pending={mentor['pending']} completed={mentor['completed']} recent={recent}")
+
+        if apply:
+            shards = db.collection(MENTOR_STATS_COLLECTION).document(mentor_id).collection(COUNTER_SHARDS_COLLECTION)
+            batch.set(shards.document("0"), {
+                "mentor_id": mentor_id,
+                **mentor,
+                "updated_at": firestore.SERVER_TIMESTAMP,
+            })
+            for shard in range(1, SESSION_COUNTER_SHARDS):
+                batch.delete(shards.document(str(shard)))
+            pending_writes += SESSION_COUNTER_SHARDS
+            if pending_writes >= BATCH_SIZE:
+                batch.commit()
+                batch = db.batch()
+                pending_writes = 0
+
+    if apply and pending_writes:
+        batch.commit()
+
+    print(f"\nSummary: {sessions} sessions counted for {len(counts)} mentors.")
+    if not apply:
+        print("Dry-run only. Re-run with --apply to write.")
+
+
+if __name__ == "__main__":
+    main(apply="--apply" in sys.argv)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Microbenchmark for the email templates in app/core/email_templates.py.
+
+Renders every template with representative values and reports the CPU cost
+per render and the size of the resulting HTML, so regressions show up as the
+templates grow. Doesn't touch Firebase or Resend.
+
+Usage (from backend/):
+    python -m scripts.benchmark_email_templates
+    python -m scripts.benchmark_email_templates --iterations 20000
+    python -m scripts.benchmark_email_templates --json   # machine-readable
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.email_templates import (
+    TEMPLATES,
+    approval_role_content,
+    mentor_info,
+    role_badge,
+)
+
+SAMPLE_MESSAGE = (
+    "Olá! Sou estudante de Engenharia de Computação e gostaria de conversar sobre "
+    "a transição da graduação para o mercado de trabalho <e sobre estágios & trainee>.\n"
+) * 5
+
+SAMPLE_VALUES = {
+    "mentor_name": "Maria Souza",
+    "student_name": "João da Silva",
+    "student_email": "joao.silva@dac.unicamp.br",
+    "mentor_company": "Empresa Exemplo S.A.",
+    "message": SAMPLE_MESSAGE,
+    "user_name": "Ana Pereira",
+    "user_email": "ana.pereira@gmail.com",
+    "verification_url": "https://centro.patronos.org/verificar-email?token=" + "a" * 64,
+    "feedback_url": "https://centro.patronos.org/feedback?token=abc_student." + "f" * 32,
+    "password_reset_url": "https://centro.patronos.org/auth/action?mode=resetPassword&oobCode=" + "x" * 80,
+    "reset_url": "https://centro.patronos.org/auth/action?mode=resetPassword&oobCode=" + "x" * 80,
+    "login_url": "https://centro.patronos.org/auth",
+    "admin_url": "https://centro.patronos.org/admin/aprovacoes",
+    "role_content": approval_role_content("mentor"),
+    "role_badge": role_badge("mentor"),
+    "mentor_info": mentor_info("Engenheira de Software", "Empresa Exemplo S.A."),
+}
+
+
+def benchmark(iterations: int) -> list[dict]:
+    results = []
+    for name, template in TEMPLATES.items():
+        values = {slot: SAMPLE_VALUES[slot] for slot in template.slots}
+        html = template.render(**values)
+
+        # Best of 5 runs, to reduce noise from the rest of the machine
+        timer = timeit.Timer(lambda: template.render(**values))
+        best = min(timer.repeat(repeat=5, number=iterations))
+
+        results.append({
+            "template": name,
+            "us_per_render": round(best / iterations * 1e6, 2),
+            "html_bytes": len(html.encode("utf-8")),
+            "slots": len(template.slots),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark email template rendering")
+    parser.add_argument("--iterations", type=int, default=5000, help="Renders per timing run")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = benchmark(args.iterations)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"=== benchmark_email_templates ({args.iterations} renders per run) ===\n")
+    print(f"{'template':<42} {'µs/render':>10} {'HTML bytes':>11}")
+    for row in results:
+        print(f"{row['template']:<42} {row['us_per_render']:>10.2f} {row['html_bytes']:>11}")
+
+    total_us = sum(row["us_per_render"] for row in results)
+    total_bytes = sum(row["html_bytes"] for row in results)
+    print(f"\n{'all templates':<42} {total_us:>10.2f} {total_bytes:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,7 @@ from google.cloud.firestore_v1 import SERVER_TIMESTAMP
 
 from app.core.firebase import db
 from app.core.email import email_service
+from app.core.pagination import sort_name
 from app.core.config import settings
 
 # Batch configuration
@@ -194,6 +195,7 @@ def create_firestore_profile(
         profile_data = {
             "email": email,
             "displayName": name,
+            "displayNameLower": sort_name(name),
             "role": "estudante",
             "status": "active",
             "authProvider": "imported",
@@ -34,6 +34,7 @@ from datetime import datetime, timezone
 from firebase_admin import auth
 from app.core.firebase import db
 from app.core.email import email_service
+from app.core.pagination import sort_name
 
 # CSV file path (relative to script)
 CSV_FILE = os.path.join(
@@ -447,6 +448,7 @@ def migrate_mentors(
                     new_user_data = {
                         "email": email,
                         "displayName": name,
+                        "displayNameLower": sort_name(name),
                         "photoURL": mentor.get("photoURL"),
                         "role": "mentor",
                         "status": "active",
@@ -3,6 +3,7 @@
 
 import sys
 import os
+from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -29,7 +30,7 @@ def set_admin(email: str) -> bool:
     print(f"Current isAdmin: {user_data.get('isAdmin', False)}")
 
     # Update isAdmin field
-    user_doc.reference.update({"isAdmin": True})
+    user_doc.reference.update({"isAdmin": True, "updatedAt": datetime.utcnow()})
 
     print(f"Successfully set isAdmin=True for {email}")
     return True
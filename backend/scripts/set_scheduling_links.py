@@ -11,6 +11,7 @@ Usage (from backend/):
 
 import sys
 import os
+from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
@@ -37,9 +38,14 @@ def main(apply: bool) -> None:
     mode = "APPLY" if apply else "DRY-RUN"
     print(f"=== set_scheduling_links ({mode}) ===\n")
 
-    # Load all mentors once
+    # Load all mentors once, fetching only the fields used below
     mentors = []
-    for doc in db.collection("users").where("role", "==", "mentor").stream():
+    query = (
+        db.collection("users")
+        .where("role", "==", "mentor")
+        .select(["displayName", "email", "mentorProfile.schedulingLink"])
+    )
+    for doc in query.stream():
         data = doc.to_dict()
         mentors.append((doc, data.get("displayName", ""), data))
 
@@ -76,7 +82,10 @@ def main(apply: bool) -> None:
         print(f"        new:     {link!r}")
 
         if apply:
-            doc.reference.update({"mentorProfile.schedulingLink": link})
+            doc.reference.update({
+                "mentorProfile.schedulingLink": link,
+                "updatedAt": datetime.utcnow(),
+            })
             print("        >> updated")
         updated += 1
         print()
@@ -0,0 +1,159 @@
+"""Tests for the streaming profile photo upload (services/photo_upload.py)."""
+
+import asyncio
+import gc
+import io
+
+import pytest
+
+from app.services import photo_upload
+from app.services.photo_upload import MAX_PHOTO_BYTES, PhotoUploadError, stream_photo_upload
+
+BOUNDARY = "photoboundary"
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 8
+
+
+class FakeWriter(io.BufferedIOBase):
+    """Stands in for google.cloud.storage's BlobWriter, including its IOBase finalizer."""
+
+    def __init__(self, events: list):
+        self.events = events
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+    def close(self):
+        # BlobWriter.close() uploads the last chunk and finalizes the object
+        if not self.closed:
+            self.events.append("close")
+        super().close()
+
+    def terminate(self):
+        self.events.append("terminate")
+        super().close()
+
+
+class FakeBlob:
+    def __init__(self, path: str, events: list):
+        self.path = path
+        self.events = events
+        self.public_url = f"https://storage.example/{path}"
+
+    def open(self, mode, content_type=None):
+        return FakeWriter(self.events)
+
+    def make_public(self):
+        self.events.append("make_public")
+
+
+class FakeBucket:
+    def __init__(self):
+        self.events = []
+
+    def blob(self, path, chunk_size=None):
+        return FakeBlob(path, self.events)
+
+
+class FakeRequest:
+    """The parts of a Starlette request stream_photo_upload uses."""
+
+    def __init__(self, body: bytes, chunk_size: int = 64 * 1024, disconnect_after: int = None):
+        self.headers = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+        self._body = body
+        self._chunk_size = chunk_size
+        self._disconnect_after = disconnect_after
+
+    async def stream(self):
+        for start in range(0, len(self._body), self._chunk_size):
+            if self._disconnect_after is not None and start >= self._disconnect_after:
+                raise ConnectionResetError("client disconnected")
+            yield self._body[start:start + self._chunk_size]
+
+
+def file_part(content: bytes, field: str = "file", content_type: str = "image/jpeg") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="photo.jpg"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + content + b"\r\n"
+
+
+def multipart_body(*parts: bytes) -> bytes:
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    bucket = FakeBucket()
+    monkeypatch.setattr(photo_upload.storage, "bucket", lambda: bucket)
+    return bucket
+
+
+def upload(request: FakeRequest):
+    return asyncio.run(stream_photo_upload(request, "mentor-uid"))
+
+
+def assert_never_finalized(bucket: FakeBucket):
+    # Drop every reference to the writer so its finalizer would have run
+    gc.collect()
+    assert bucket.events == ["terminate"]
+
+
+def test_valid_photo_is_finalized(bucket):
+    photo = upload(FakeRequest(multipart_body(file_part(JPEG + b"x" * 300_000))))
+
+    assert photo.size == len(JPEG) + 300_000
+    assert photo.path.startswith("mentor-photos/mentor-uid/")
+    assert bucket.events == ["close", "make_public"]
+
+
+def test_oversized_photo_never_reaches_close(bucket):
+    body = multipart_body(file_part(JPEG + b"x" * (MAX_PHOTO_BYTES + 600_000)))
+
+    with pytest.raises(PhotoUploadError) as error:
+        upload(FakeRequest(body))
+
+    assert error.value.status_code == 413
+    assert_never_finalized(bucket)
+
+
+def test_second_file_part_terminates_upload(bucket):
+    body = multipart_body(file_part(JPEG + b"x" * 1000), file_part(JPEG))
+
+    with pytest.raises(PhotoUploadError) as error:
+        upload(FakeRequest(body, chunk_size=512))
+
+    assert error.value.status_code == 400
+    assert_never_finalized(bucket)
+
+
+def test_disconnect_terminates_upload(bucket):
+    body = multipart_body(file_part(JPEG + b"x" * 500_000))
+
+    with pytest.raises(ConnectionResetError):
+        upload(FakeRequest(body, disconnect_after=128 * 1024))
+
+    assert_never_finalized(bucket)
+
+
+def test_missing_end_of_part_terminates_upload(bucket):
+    body = file_part(JPEG + b"x" * 1000)[:-2]
+
+    with pytest.raises(PhotoUploadError) as error:
+        upload(FakeRequest(body))
+
+    assert error.value.status_code == 400
+    assert_never_finalized(bucket)
+
+
+def test_mismatched_magic_bytes_never_opens_upload(bucket):
+    with pytest.raises(PhotoUploadError) as error:
+        upload(FakeRequest(multipart_body(file_part(b"GIF89a" + b"x" * 100))))
+
+    assert error.value.status_code == 400
+    assert bucket.events == []
@@ -89,6 +89,7 @@ deploy_backend() {
         "--cpu" "1"
         "--min-instances" "1"
         "--max-instances" "10"
+        "--timeout" "600"
     )
 
     # Add environment variables from .env.production if it exists
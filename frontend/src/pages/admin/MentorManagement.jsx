@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import {
   EyeIcon,
   EyeSlashIcon,
@@ -19,22 +19,42 @@ export default function MentorManagement() {
   const [actionLoading, setActionLoading] = useState(null);
   const [toast, setToast] = useState(null);
   const [exportLoading, setExportLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Totals across all pages, for the current search (from the API)
+  const [totals, setTotals] = useState({ total: 0, visible: 0, hidden: 0 });
+  // Ignores responses to searches the admin has since changed
+  const requestId = useRef(0);
 
   useEffect(() => {
     analytics.track('Admin Mentors Viewed');
   }, []);
 
+  // Search and filter run on the server; wait for typing to pause
   useEffect(() => {
-    fetchMentors();
-  }, []);
+    const timeout = setTimeout(fetchMentors, searchQuery ? 300 : 0);
+    return () => clearTimeout(timeout);
+  }, [searchQuery, filter]);
+
+  const applyTotals = (data) => {
+    setTotals({
+      total: data.total,
+      visible: data.visible_total,
+      hidden: data.hidden_total,
+    });
+  };
 
   const fetchMentors = async () => {
+    const id = ++requestId.current;
     try {
-      setLoading(true);
       setError(null);
-      const data = await adminService.getMentors();
+      const data = await adminService.getMentors({ search: searchQuery, visibility: filter });
+      if (id !== requestId.current) return;
       setMentors(data.mentors);
+      setNextCursor(data.next_cursor || null);
+      applyTotals(data);
     } catch (err) {
+      if (id !== requestId.current) return;
       setError('Erro ao carregar mentores');
       console.error(err);
     } finally {
@@ -42,6 +62,28 @@ export default function MentorManagement() {
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    const id = requestId.current;
+    try {
+      setLoadingMore(true);
+      const data = await adminService.getMentors({
+        cursor: nextCursor,
+        search: searchQuery,
+        visibility: filter,
+      });
+      if (id !== requestId.current) return;
+      setMentors((prev) => [...prev, ...data.mentors]);
+      setNextCursor(data.next_cursor || null);
+      applyTotals(data);
+    } catch (err) {
+      showToast('Erro ao carregar mais mentores', 'error');
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const showToast = (message, type = 'success') => {
     setToast({ message, type });
     setTimeout(() => setToast(null), 3000);
@@ -54,11 +96,21 @@ export default function MentorManagement() {
       const newIsActive = !currentlyActive;
       await adminService.updateMentorVisibility(uid, newIsActive);
 
-      setMentors(
-        mentors.map((m) =>
-          m.uid === uid ? { ...m, isActive: newIsActive } : m
-        )
-      );
+      if (filter === 'all') {
+        setMentors(
+          mentors.map((m) =>
+            m.uid === uid ? { ...m, isActive: newIsActive } : m
+          )
+        );
+      } else {
+        // No longer matches the visible/hidden filter
+        setMentors(mentors.filter((m) => m.uid !== uid));
+      }
+      setTotals((prev) => ({
+        total: filter === 'all' ? prev.total : prev.total - 1,
+        visible: prev.visible + (newIsActive ? 1 : -1),
+        hidden: prev.hidden + (newIsActive ? -1 : 1),
+      }));
 
       showToast(
         newIsActive
@@ -79,28 +131,8 @@ export default function MentorManagement() {
     }
   };
 
-  // Filter and search
-  const filteredMentors = mentors.filter((mentor) => {
-    // Filter by visibility
-    if (filter === 'visible' && !mentor.isActive) return false;
-    if (filter === 'hidden' && mentor.isActive) return false;
-
-    // Search by name, email, title, or company
-    if (searchQuery) {
-      const query = searchQuery.toLowerCase();
-      return (
-        mentor.displayName.toLowerCase().includes(query) ||
-        mentor.email.toLowerCase().includes(query) ||
-        mentor.title?.toLowerCase().includes(query) ||
-        mentor.company?.toLowerCase().includes(query)
-      );
-    }
-
-    return true;
-  });
-
-  const visibleCount = mentors.filter((m) => m.isActive).length;
-  const hiddenCount = mentors.filter((m) => !m.isActive).length;
+  const visibleCount = totals.visible;
+  const hiddenCount = totals.hidden;
 
   const handleExportMentors = async () => {
     try {
@@ -172,7 +204,7 @@ export default function MentorManagement() {
           <MagnifyingGlassIcon className="absolute left-3 top-1/2 -translate-y-1/2 h-5 w-5 text-gray-400" />
           <input
             type="text"
-            placeholder="Buscar por nome, email, cargo ou empresa..."
+            placeholder="Buscar pelo início do nome ou do email..."
             value={searchQuery}
             onChange={(e) => setSearchQuery(e.target.value)}
             className="w-full pl-10 pr-4 py-2 rounded-lg border border-gray-300 focus:border-patronos-accent focus:ring-1 focus:ring-patronos-accent"
@@ -185,7 +217,7 @@ export default function MentorManagement() {
           onChange={(e) => setFilter(e.target.value)}
           className="rounded-lg border-gray-300 text-sm focus:border-patronos-accent focus:ring-patronos-accent"
         >
-          <option value="all">Todos ({mentors.length})</option>
+          <option value="all">Todos ({visibleCount + hiddenCount})</option>
           <option value="visible">Visíveis ({visibleCount})</option>
           <option value="hidden">Ocultos ({hiddenCount})</option>
         </select>
@@ -205,7 +237,7 @@ export default function MentorManagement() {
       )}
 
       {/* Empty state */}
-      {!error && filteredMentors.length === 0 && (
+      {!error && mentors.length === 0 && (
         <div className="mt-12 text-center">
           <UserGroupIcon className="mx-auto h-12 w-12 text-gray-400" />
           <h3 className="mt-4 text-lg font-medium text-gray-900">
@@ -220,9 +252,9 @@ export default function MentorManagement() {
       )}
 
       {/* Mentors grid */}
-      {!error && filteredMentors.length > 0 && (
+      {!error && mentors.length > 0 && (
         <div className="mt-6 grid gap-4 sm:grid-cols-2 lg:grid-cols-3">
-          {filteredMentors.map((mentor) => (
+          {mentors.map((mentor) => (
             <div
               key={mentor.uid}
               className={`bg-white rounded-xl shadow-sm p-5 border-2 transition-colors ${
@@ -304,6 +336,24 @@ export default function MentorManagement() {
         </div>
       )}
 
+      {/* Load more */}
+      {!error && mentors.length > 0 && (
+        <p className="mt-6 text-center text-sm text-gray-500">
+          Mostrando {mentors.length} de {totals.total} mentores
+        </p>
+      )}
+      {!error && nextCursor && (
+        <div className="mt-3 text-center">
+          <button
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            className="px-4 py-2 text-sm font-medium rounded-lg bg-gray-100 text-gray-600 hover:bg-gray-200 disabled:opacity-50"
+          >
+            {loadingMore ? 'Carregando...' : 'Carregar mais'}
+          </button>
+        </div>
+      )}
+
       {/* Toast notification */}
       {toast && (
         <div
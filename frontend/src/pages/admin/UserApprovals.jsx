@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import {
   CheckCircleIcon,
   XCircleIcon,
@@ -21,24 +21,40 @@ export default function UserApprovals() {
   const [toast, setToast] = useState(null);
   const [selectedUser, setSelectedUser] = useState(null); // user for drawer
   const [exportLoading, setExportLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [total, setTotal] = useState(0); // Matching users across all pages
+  // Ignores responses to filters the admin has since changed
+  const requestId = useRef(0);
 
   // Track page view on mount
   useEffect(() => {
     analytics.track(EVENTS.ADMIN_APPROVALS_VIEWED);
   }, []);
 
-  // Fetch pending users on mount
+  // Fetch pending users on mount and whenever the filter changes (filtered on the server)
   useEffect(() => {
     fetchPendingUsers();
-  }, []);
+  }, [filter]);
+
+  // The filter is either a role or a status
+  const filterParams = () => {
+    if (filter === 'estudante' || filter === 'mentor') return { role: filter };
+    if (filter === 'pending' || filter === 'pending_verification') return { status: filter };
+    return {};
+  };
 
   const fetchPendingUsers = async () => {
+    const id = ++requestId.current;
     try {
-      setLoading(true);
       setError(null);
-      const data = await adminService.getPendingUsers();
+      const data = await adminService.getPendingUsers(filterParams());
+      if (id !== requestId.current) return;
       setUsers(data.users);
+      setNextCursor(data.next_cursor || null);
+      setTotal(data.total);
     } catch (err) {
+      if (id !== requestId.current) return;
       setError('Erro ao carregar usuários pendentes');
       console.error(err);
     } finally {
@@ -46,6 +62,24 @@ export default function UserApprovals() {
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    const id = requestId.current;
+    try {
+      setLoadingMore(true);
+      const data = await adminService.getPendingUsers({ cursor: nextCursor, ...filterParams() });
+      if (id !== requestId.current) return;
+      setUsers((prev) => [...prev, ...data.users]);
+      setNextCursor(data.next_cursor || null);
+      setTotal(data.total);
+    } catch (err) {
+      showToast('Erro ao carregar mais usuários', 'error');
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const showToast = (message, type = 'success') => {
     setToast({ message, type });
     setTimeout(() => setToast(null), 3000);
@@ -57,6 +91,7 @@ export default function UserApprovals() {
       setActionLoading(uid);
       await adminService.approveUser(uid);
       setUsers(users.filter((u) => u.uid !== uid));
+      setTotal((prev) => prev - 1);
       setSelectedUser(null); // Close drawer after approval
       showToast(`Usuário ${email} aprovado com sucesso`);
       analytics.track(EVENTS.USER_APPROVED, {
@@ -87,6 +122,7 @@ export default function UserApprovals() {
       setActionLoading(uid);
       await adminService.rejectUser(uid);
       setUsers(users.filter((u) => u.uid !== uid));
+      setTotal((prev) => prev - 1);
       setSelectedUser(null); // Close drawer after rejection
       showToast(`Usuário ${email} rejeitado`);
       analytics.track(EVENTS.USER_REJECTED, {
@@ -162,13 +198,6 @@ export default function UserApprovals() {
     }
   };
 
-  const filteredUsers = users.filter((u) => {
-    if (filter === 'all') return true;
-    if (filter === 'estudante' || filter === 'mentor') return u.role === filter;
-    if (filter === 'pending' || filter === 'pending_verification') return u.status === filter;
-    return true;
-  });
-
   const formatDate = (dateStr) => {
     if (!dateStr) return '-';
     const date = new Date(dateStr);
@@ -248,7 +277,7 @@ export default function UserApprovals() {
       )}
 
       {/* Empty state */}
-      {!error && filteredUsers.length === 0 && (
+      {!error && users.length === 0 && (
         <div className="mt-12 text-center">
           <UserGroupIcon className="mx-auto h-12 w-12 text-gray-400" />
           <h3 className="mt-4 text-lg font-medium text-gray-900">
@@ -263,7 +292,7 @@ export default function UserApprovals() {
       )}
 
       {/* Users table */}
-      {!error && filteredUsers.length > 0 && (
+      {!error && users.length > 0 && (
         <div className="mt-6 bg-white shadow rounded-lg overflow-hidden">
           <table className="min-w-full divide-y divide-gray-200">
             <thead className="bg-gray-50">
@@ -283,7 +312,7 @@ export default function UserApprovals() {
               </tr>
             </thead>
             <tbody className="bg-white divide-y divide-gray-200">
-              {filteredUsers.map((user) => (
+              {users.map((user) => (
                 <tr
                   key={user.uid}
                   onClick={() => handleRowClick(user)}
@@ -414,6 +443,24 @@ export default function UserApprovals() {
         </div>
       )}
 
+      {/* Load more */}
+      {!error && users.length > 0 && (
+        <p className="mt-6 text-center text-sm text-gray-500">
+          Mostrando {users.length} de {total} usuários
+        </p>
+      )}
+      {!error && nextCursor && (
+        <div className="mt-3 text-center">
+          <button
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            className="px-4 py-2 text-sm font-medium rounded-lg bg-gray-100 text-gray-600 hover:bg-gray-200 disabled:opacity-50"
+          >
+            {loadingMore ? 'Carregando...' : 'Carregar mais'}
+          </button>
+        </div>
+      )}
+
       {/* Toast notification */}
       {toast && (
         <div
@@ -131,7 +131,7 @@ export default function MentorList() {
     const fetchMentors = async () => {
       try {
         setLoading(true);
-        const data = await mentorService.getMentors();
+        const data = await mentorService.getRecommendedMentors();
         setMentors(data.mentors || []);
         setError(null);
         analytics.track(EVENTS.MENTORS_VIEWED, { results_count: data.mentors?.length || 0 });
@@ -81,6 +81,8 @@ export default function MySessions() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [activeFilter, setActiveFilter] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   // Modal states
   const [resendModalSession, setResendModalSession] = useState(null);
@@ -105,6 +107,7 @@ export default function MySessions() {
         setLoading(true);
         const data = await sessionService.getMySessions();
         setSessions(data.sessions || []);
+        setNextCursor(data.next_cursor || null);
         setError(null);
       } catch (err) {
         console.error('Error fetching sessions:', err);
@@ -118,6 +121,22 @@ export default function MySessions() {
     fetchSessions();
   }, []);
 
+  // Load the next page of sessions
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const data = await sessionService.getMySessions(null, nextCursor);
+      setSessions(prev => [...prev, ...(data.sessions || [])]);
+      setNextCursor(data.next_cursor || null);
+    } catch (err) {
+      console.error('Error fetching more sessions:', err);
+      analytics.trackError('load_more_sessions', { error: err.message });
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Track filter changes
   const handleFilterChange = (filter) => {
     setActiveFilter(filter);
@@ -268,7 +287,7 @@ export default function MySessions() {
             />
           ))}
         </div>
-      ) : (
+      ) : nextCursor ? null : (
         <div className="text-center py-12 bg-white rounded-xl border border-gray-100">
           <UserCircleIcon className="mx-auto h-12 w-12 text-gray-300" />
           <h3 className="mt-4 text-lg font-medium text-gray-900">
@@ -292,6 +311,19 @@ export default function MySessions() {
         </div>
       )}
 
+      {/* Load more */}
+      {nextCursor && (
+        <div className="mt-6 text-center">
+          <button
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            className="px-4 py-2 text-sm font-medium rounded-lg bg-gray-100 text-gray-600 hover:bg-gray-200 disabled:opacity-50"
+          >
+            {loadingMore ? 'Carregando...' : 'Carregar mais sessões'}
+          </button>
+        </div>
+      )}
+
       {/* Resend Email Modal */}
       <ResendEmailModal
         session={resendModalSession}
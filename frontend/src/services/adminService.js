@@ -2,11 +2,20 @@ import api from './api';
 
 export const adminService = {
   /**
-   * Get all pending users awaiting approval
-   * @returns {Promise<{users: Array, total: number}>}
+   * Get a page of pending users awaiting approval (newest first)
+   * @param {Object} [options]
+   * @param {string} [options.cursor] - next_cursor returned by the previous page
+   * @param {string} [options.role] - Only 'estudante' or 'mentor' users
+   * @param {string} [options.status] - Only 'pending' or 'pending_verification' users
+   * @returns {Promise<{users: Array, total: number, next_cursor: string|null}>}
+   *   total counts every matching user, not just this page
    */
-  async getPendingUsers() {
-    const response = await api.get('/admin/users/pending');
+  async getPendingUsers({ cursor = null, role = null, status = null } = {}) {
+    const params = {};
+    if (cursor) params.cursor = cursor;
+    if (role) params.role = role;
+    if (status) params.status = status;
+    const response = await api.get('/admin/users/pending', { params });
     return response.data;
   },
 
@@ -41,11 +50,19 @@ export const adminService = {
   },
 
   /**
-   * Get all mentors for admin management
-   * @returns {Promise<{mentors: Array, total: number}>}
+   * Get a page of mentors for admin management (sorted by name)
+   * @param {Object} [options]
+   * @param {string} [options.cursor] - next_cursor returned by the previous page
+   * @param {string} [options.search] - Name prefix, or email prefix if it contains '@'
+   * @param {string} [options.visibility] - 'all' | 'visible' | 'hidden'
+   * @returns {Promise<{mentors: Array, total: number, visible_total: number, hidden_total: number, next_cursor: string|null}>}
+   *   the totals count every mentor matching the search, not just this page
    */
-  async getMentors() {
-    const response = await api.get('/admin/mentors');
+  async getMentors({ cursor = null, search = '', visibility = 'all' } = {}) {
+    const params = { visibility };
+    if (cursor) params.cursor = cursor;
+    if (search.trim()) params.search = search.trim();
+    const response = await api.get('/admin/mentors', { params });
     return response.data;
   },
 
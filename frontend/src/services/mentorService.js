@@ -10,6 +10,15 @@ export const mentorService = {
     return response.data;
   },
 
+  /**
+   * Get all mentors, best match for the current student first
+   * @returns {Promise<{mentors: Array, total: number}>}
+   */
+  async getRecommendedMentors() {
+    const response = await api.get('/mentors/recommended');
+    return response.data;
+  },
+
   /**
    * Get a single mentor by ID
    * @param {string} mentorId - Firestore user ID
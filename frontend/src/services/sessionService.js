@@ -18,12 +18,15 @@ export const sessionService = {
   },
 
   /**
-   * Get all sessions for the current user
+   * Get a page of sessions for the current user (most recent first)
    * @param {string} [status] - Optional status filter (pending, confirmed, completed, cancelled)
-   * @returns {Promise<{sessions: Array, total: number}>}
+   * @param {string} [cursor] - next_cursor returned by the previous page
+   * @returns {Promise<{sessions: Array, total: number, next_cursor: string|null}>}
    */
-  async getMySessions(status = null) {
-    const params = status ? { status } : {};
+  async getMySessions(status = null, cursor = null) {
+    const params = {};
+    if (status) params.status = status;
+    if (cursor) params.cursor = cursor;
     const response = await api.get('/sessions', { params });
     return response.data;
   },
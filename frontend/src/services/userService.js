@@ -69,6 +69,8 @@ export const userService = {
       uid,
       email: userData.email,
       displayName: userData.displayName,
+      // Sort key for admin listings; keep in sync with backend core.pagination.sort_name
+      displayNameLower: (userData.displayName || '').trim().toLowerCase(),
       photoURL: userData.photoURL || null,
       role: userData.role,
       status,
@@ -170,8 +172,12 @@ export const userService = {
    */
   async updateUserProfile(uid, updates) {
     const userRef = doc(db, 'users', uid);
+    const sortKey = 'displayName' in updates
+      ? { displayNameLower: (updates.displayName || '').trim().toLowerCase() }
+      : {};
     await updateDoc(userRef, {
       ...updates,
+      ...sortKey,
       updatedAt: serverTimestamp(),
     });
   },
@@ -184,6 +190,7 @@ export const userService = {
     const userRef = doc(db, 'users', uid);
     await updateDoc(userRef, {
       lastLoginAt: serverTimestamp(),
+      updatedAt: serverTimestamp(),
     });
   },
 
@@ -95,7 +95,7 @@ export const mockAnalytics = {
 // Mock session service
 export const createMockSessionService = (overrides = {}) => ({
   createSession: vi.fn().mockResolvedValue(mockSessionResponse),
-  getMySessions: vi.fn().mockResolvedValue({ sessions: [], total: 0 }),
+  getMySessions: vi.fn().mockResolvedValue({ sessions: [], total: 0, next_cursor: null }),
   getSession: vi.fn().mockResolvedValue(mockSessionResponse),
   ...overrides,
 })